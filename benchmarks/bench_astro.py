@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Đo và kiểm tra bộ sinh lịch âm thiên văn (calendar_core/astro_np.py).
+
+1. Sinh mọi tháng âm 1000-3000 cho UTC+7 và UTC+8, tiết khí của cả dải năm và
+   đổi từng ngày sang âm lịch; in thời gian mỗi bước.
+2. Kiểm tra cấu trúc: năm 12/13 tháng, tháng 29/30 ngày, số tháng liên tục,
+   Tết trong khoảng 20/1-21/2, khoảng 7 tháng nhuận mỗi 19 năm.
+3. So với lunarcalendar (lịch Trung Quốc, UTC+8) ở phần giao 1899-2100: qua bảng
+   dựng sẵn của calendar_core.lunar và gọi thẳng thư viện cho mọi ngày mùng 1.
+   Chỉ chấp nhận lệch ở tháng có điểm sóc cách nửa đêm dưới BORDERLINE_MINUTES.
+4. So tiết khí với astro.solar_terms (bản vòng lặp) trên vài năm mẫu.
+5. In các năm mà lịch Việt Nam (UTC+7) và Trung Quốc (UTC+8) khác nhau.
+
+Thoát với mã lỗi nếu có kiểm tra sai hoặc sinh một thiên niên kỷ (hai múi giờ,
+kèm tiết khí) lâu hơn MILLENNIUM_BUDGET_S giây.
+
+Chạy: python benchmarks/bench_astro.py [--first 1000 --last 3000]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from calendar_core import astro, astro_np
+from calendar_core.astro_np import CHINA_TZ, VIETNAM_TZ
+
+MILLENNIUM_BUDGET_S = 5.0
+BORDERLINE_MINUTES = 15
+TERM_SAMPLE_YEARS = (1000, 1582, 1900, 1985, 2026, 2100, 2500, 3000)
+OVERLAP = (1900, 2100)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def check_structure(table, errors):
+    label = f"UTC{table.tz:+g}"
+    lengths = np.diff(np.append(table.starts, table.end))
+    if not np.all((lengths == 29) | (lengths == 30)):
+        errors.append(f"{label}: có tháng dài {sorted(set(lengths.tolist()) - {29, 30})} ngày")
+    years, counts = np.unique(table.years, return_counts=True)
+    if not np.all((counts == 12) | (counts == 13)) or not np.all(np.diff(years) == 1):
+        errors.append(f"{label}: có năm không đủ 12/13 tháng hoặc thiếu năm")
+    # Số tháng tăng dần trong năm (tháng nhuận lặp lại số của tháng trước)
+    steps = np.diff(table.months.astype(np.int64))[np.diff(table.years) == 0]
+    repeat = table.leaps[1:][np.diff(table.years) == 0]
+    if not np.all(np.where(repeat, steps == 0, steps == 1)):
+        errors.append(f"{label}: thứ tự tháng trong năm sai")
+    if not np.array_equal(counts == 13, np.bincount(table.years - years[0], weights=table.leaps) == 1):
+        errors.append(f"{label}: năm 13 tháng phải có đúng một tháng nhuận")
+    tet = table.starts[table.months == 1][~table.leaps[table.months == 1]]
+    days = [date.fromordinal(int(o)) for o in tet]
+    if not all(date(d.year, 1, 20) <= d <= date(d.year, 2, 21) for d in days):
+        errors.append(f"{label}: Tết ngoài khoảng 20/1-21/2")
+    per_cycle = counts.size / 19 * 7
+    if abs(int(table.leaps.sum()) - per_cycle) > per_cycle * 0.01 + 2:
+        errors.append(f"{label}: {int(table.leaps.sum())} tháng nhuận, cần khoảng {per_cycle:.0f}")
+
+
+def borderline(mismatched, tz):
+    minutes = astro_np.boundary_minutes(np.array(sorted(mismatched), dtype=np.int64), tz)
+    return np.abs(minutes) < BORDERLINE_MINUTES, minutes
+
+
+def check_against_lunar_table(generated, errors):
+    """Ngày mùng 1 khác với bảng dựng sẵn (dữ liệu lunarcalendar) ở phần giao."""
+    reference = astro_np.table_from_lunar()
+    lo = max(int(generated.starts[0]), int(reference.starts[0]))
+    hi = min(generated.end, reference.end)
+    ours = set(generated.starts[(generated.starts >= lo) & (generated.starts < hi)].tolist())
+    theirs = set(reference.starts[(reference.starts >= lo) & (reference.starts < hi)].tolist())
+    mismatched = ours ^ theirs
+    years = astro_np.differing_years(generated, reference)
+    if mismatched:
+        ok, minutes = borderline(mismatched, generated.tz)
+        for ordinal, near, good in zip(sorted(mismatched), minutes, ok):
+            if not good:
+                errors.append(f"mùng 1 lệch lunarcalendar: {date.fromordinal(ordinal)} (sóc cách nửa đêm {near:+.0f} phút)")
+    print(f"so với bảng lunarcalendar (UTC+8): {len(years)} năm lệch {years}, "
+          f"{len(mismatched)} ngày mùng 1 chỉ có ở một bên")
+    return mismatched
+
+
+def check_against_library(generated, borderline_starts, errors):
+    try:
+        from lunarcalendar import Converter, Solar
+    except ImportError:
+        print("lunarcalendar chưa được cài, bỏ qua phần gọi thẳng thư viện")
+        return
+    first, last = OVERLAP
+    mask = (generated.years >= first) & (generated.years <= last)
+    checked = wrong = 0
+    start = time.perf_counter()
+    for ordinal, month, leap in zip(generated.starts[mask], generated.months[mask], generated.leaps[mask]):
+        if int(ordinal) in borderline_starts:
+            continue
+        d = date.fromordinal(int(ordinal))
+        ref = Converter.Solar2Lunar(Solar(d.year, d.month, d.day))
+        checked += 1
+        if (ref.day, ref.month, bool(ref.isleap)) != (1, int(month), bool(leap)):
+            wrong += 1
+            if wrong <= 5:
+                errors.append(f"lunarcalendar {d}: {ref.day}/{ref.month}{'n' if ref.isleap else ''}, "
+                              f"sinh ra 1/{month}{'n' if leap else ''}")
+    print(f"gọi thẳng lunarcalendar: {checked} ngày mùng 1 {first}-{last}, lệch {wrong} "
+          f"({time.perf_counter() - start:.1f} s)")
+
+
+def first_difference(a, b, year):
+    """Tháng đầu tiên trong năm mà hai bảng khác ngày mùng 1 (hoặc số ngày, nếu là tháng cuối)."""
+    pairs = list(zip(astro_np.year_months(a, year), astro_np.year_months(b, year)))
+    for ours, theirs in pairs:
+        if ours[2] != theirs[2]:
+            return tuple(f"tháng {month}{'n' if leap else ''}: {date.fromordinal(start)}"
+                         for month, leap, start, _ in (ours, theirs))
+    return tuple(f"tháng {month}{'n' if leap else ''}: {length} ngày" for month, leap, _, length in pairs[-1])
+
+
+def check_terms(errors):
+    for year in TERM_SAMPLE_YEARS:
+        ordinals, terms = astro_np.solar_terms(year, year, VIETNAM_TZ)
+        if list(zip(ordinals.tolist(), terms.tolist())) != astro.solar_terms(year, VIETNAM_TZ):
+            errors.append(f"tiết khí {year} khác astro.solar_terms")
+        if len(terms) != 24:
+            errors.append(f"tiết khí {year}: {len(terms)} mục")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--first", type=int, default=1000)
+    parser.add_argument("--last", type=int, default=3000)
+    args = parser.parse_args()
+    errors = []
+
+    vietnam, t_vn = timed(lambda: astro_np.generate_months(args.first, args.last, VIETNAM_TZ))
+    china, t_cn = timed(lambda: astro_np.generate_months(args.first, args.last, CHINA_TZ))
+    (term_days, _), t_terms = timed(lambda: astro_np.solar_terms(args.first, args.last, VIETNAM_TZ))
+    days = np.arange(int(vietnam.starts[0]), vietnam.end)
+    _, t_convert = timed(lambda: astro_np.ordinals_to_lunar(vietnam, days))
+    print(f"{args.first}-{args.last}: {vietnam.starts.size} tháng âm, {int(vietnam.leaps.sum())} tháng nhuận, "
+          f"{term_days.size} tiết khí, {days.size} ngày")
+    print(f"  sinh tháng UTC+7 {t_vn * 1000:.0f} ms, UTC+8 {t_cn * 1000:.0f} ms, tiết khí {t_terms * 1000:.0f} ms, "
+          f"đổi mọi ngày {t_convert * 1000:.0f} ms")
+    _, t_loop = timed(lambda: [astro.solar_terms(year) for year in range(2000, 2010)])
+    print(f"  tiết khí bản vòng lặp: {t_loop / 10 * 1000:.1f} ms/năm, NumPy {t_terms / (args.last - args.first + 1) * 1000:.3f} ms/năm")
+
+    millennium = (t_vn + t_cn + t_terms) * 1000 / max(1, args.last - args.first + 1)
+    if millennium > MILLENNIUM_BUDGET_S:
+        errors.append(f"một thiên niên kỷ mất {millennium:.1f} s > {MILLENNIUM_BUDGET_S} s")
+
+    check_structure(vietnam, errors)
+    check_structure(china, errors)
+    check_terms(errors)
+    mismatched = check_against_lunar_table(astro_np.generate_months(1899, 2100, CHINA_TZ), errors)
+    check_against_library(china, mismatched, errors)
+
+    first, last = OVERLAP
+    years = [y for y in astro_np.differing_years(vietnam, china) if first <= y <= last]
+    print(f"\nUTC+7 khác UTC+8 ở {len(years)} năm trong {first}-{last} (* = Tết hoặc tháng nhuận khác):")
+    for year in years:
+        ours, theirs = astro_np.describe_year(vietnam, year), astro_np.describe_year(china, year)
+        if ours == theirs:
+            ours, theirs = first_difference(vietnam, china, year)
+        print(f"  {year}{'*' if ours != theirs and ours.startswith('Tết') else ' '} UTC+7 {ours:<28} UTC+8 {theirs}")
+    if 1985 not in years or astro_np.describe_year(vietnam, 1985) != "Tết 1985-01-21, nhuận 2":
+        errors.append(f"Tết 1985 (UTC+7) phải là 21/1, nhuận tháng 2: {astro_np.describe_year(vietnam, 1985)}")
+
+    for error in errors:
+        print("LỖI:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
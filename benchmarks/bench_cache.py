@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""So sánh khởi động lạnh và ấm với file cache ngày (calendar_core/daycache.py).
+
+Mỗi lần đo chạy trong một tiến trình Python mới, tới lúc có bố cục popover
+đầu tiên (kèm dòng lễ của hôm nay):
+- lạnh: chưa có file cache, bố cục tính bằng NumPy và chỉ mục lễ của năm;
+  thời gian ghi file (việc của luồng nền trong app) được đo riêng;
+- ấm: file đã có, chỉ mmap rồi đọc bản ghi.
+
+Kiểm tra thêm: mọi ngày trong file khớp calendar_core.lunar và HolidayCalendar,
+file khác múi giờ / hỏng / cụt bị từ chối và được ghi lại, file dựng từ quy tắc
+lễ cũ bị từ chối, không để lại file tạm. Thoát với mã lỗi nếu có kiểm tra sai, nếu khởi động ấm còn nạp NumPy hoặc
+không nhanh hơn khởi động lạnh.
+Chạy: python benchmarks/bench_cache.py [--runs N]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from calendar_core import daycache, lunar
+from calendar_core.daycache import DayCache
+from calendar_core.holidays import HolidayCalendar
+
+CHILD = r'''
+import time
+started = time.perf_counter()
+import json, sys
+sys.path.insert(0, ROOT)
+from datetime import date
+from calendar_core.daycache import DayCache
+from calendar_core.holidays import HolidayCalendar
+from calendar_core.layout import MonthLayoutCache
+imported = time.perf_counter()
+
+today = date(2026, 2, 17)
+day_cache = DayCache.open(PATH)
+opened = time.perf_counter()
+holidays = HolidayCalendar(days=day_cache)
+MonthLayoutCache(today=today, holidays=holidays, days=day_cache).get(today.year, today.month)
+holidays.observances(today)
+popover = time.perf_counter()
+print(json.dumps({
+    "hit": day_cache is not None,
+    "import_ms": (imported - started) * 1000,
+    "open_ms": (opened - imported) * 1000,
+    "first_popover_ms": (popover - started) * 1000,
+    "numpy": "numpy" in sys.modules,
+}))
+'''
+
+
+def run_child(path):
+    output = subprocess.run([sys.executable, "-c", CHILD.replace("ROOT", repr(ROOT)).replace("PATH", repr(path))],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def measure(path, runs, warm):
+    results = []
+    for _ in range(runs):
+        if not warm and os.path.exists(path):
+            os.unlink(path)
+        results.append(run_child(path))
+    return results
+
+
+def check_contents(path, errors):
+    cache = DayCache.open(path)
+    holidays = HolidayCalendar(maxsize=1)
+    wrong = 0
+    for ordinal in range(lunar.MIN_ORDINAL, lunar.MAX_ORDINAL + 1):
+        if cache.record(ordinal) != lunar.ordinal_to_lunar(ordinal) + (holidays.observances(ordinal),):
+            wrong += 1
+    if wrong:
+        errors.append(f"{wrong} ngày trong file khác lunar / HolidayCalendar")
+    if cache.records(lunar.MIN_ORDINAL, 42) != [cache.record(o) for o in range(lunar.MIN_ORDINAL, lunar.MIN_ORDINAL + 42)]:
+        errors.append("records() khác record()")
+    print(f"nội dung: {cache.count} ngày ({lunar.FIRST_LUNAR_YEAR}-{lunar.LAST_LUNAR_YEAR}), "
+          f"{os.path.getsize(path) / 1024:.0f} KiB, lệch {wrong}")
+    cache.close()
+
+
+def check_invalidation(path, errors):
+    if DayCache.open(path, tz=8.0) is not None:
+        errors.append("file UTC+7 được mở cho UTC+8")
+    with open(path, "rb") as f:
+        data = f.read()
+    cases = {
+        "cụt": data[:-daycache.RECORD.size],
+        "sai magic": b"XXXX" + data[4:],
+        "engine khác": data[:8] + bytes(16) + data[24:],
+    }
+    for name, broken in cases.items():
+        with open(path, "wb") as f:
+            f.write(broken)
+        if DayCache.open(path) is not None:
+            errors.append(f"file {name} vẫn được mở")
+        cache = DayCache.load(path)
+        if cache is None or os.path.getsize(path) != len(data):
+            errors.append(f"file {name} không được ghi lại")
+        else:
+            cache.close()
+    # Đổi ngày của một quy tắc lễ (giữ nguyên tên) cũng phải làm file cũ mất hiệu lực
+    from calendar_core import holidays
+    original = holidays.LUNAR_RULES[0]
+    holidays.LUNAR_RULES[0] = (original[0], original[1] + 10) + original[2:]
+    try:
+        if DayCache.open(path) is not None:
+            errors.append("đổi ngày của quy tắc lễ mà file cũ vẫn được mở")
+    finally:
+        holidays.LUNAR_RULES[0] = original
+    leftovers = [name for name in os.listdir(os.path.dirname(path)) if name != daycache.CACHE_NAME]
+    if leftovers:
+        errors.append(f"còn file tạm: {leftovers}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+    errors = []
+    directory = tempfile.mkdtemp(prefix="menu_calendar_cache_")
+    path = os.path.join(directory, daycache.CACHE_NAME)
+    try:
+        cold = measure(path, args.runs, warm=False)
+        started = time.perf_counter()
+        daycache.write_cache(path)
+        write_ms = (time.perf_counter() - started) * 1000
+        warm = measure(path, args.runs, warm=True)
+
+        def median(runs, key):
+            return statistics.median(run[key] for run in runs)
+
+        print(f"{'':<8}{'import ms':>11}{'mở cache ms':>13}{'popover đầu ms':>16}  NumPy")
+        for name, runs in (("lạnh", cold), ("ấm", warm)):
+            print(f"{name:<8}{median(runs, 'import_ms'):>11.1f}{median(runs, 'open_ms'):>13.2f}"
+                  f"{median(runs, 'first_popover_ms'):>16.1f}  {'có' if any(r['numpy'] for r in runs) else 'không'}")
+        print(f"ghi file cache (luồng nền, một lần): {write_ms:.0f} ms")
+        speedup = median(cold, "first_popover_ms") / median(warm, "first_popover_ms")
+        print(f"popover đầu nhanh hơn {speedup:.1f} lần khi có cache")
+
+        if any(run["hit"] for run in cold) or not all(run["hit"] for run in warm):
+            errors.append("khởi động lạnh / ấm không đúng trạng thái cache")
+        if any(run["numpy"] for run in warm):
+            errors.append("khởi động ấm vẫn nạp NumPy")
+        if speedup <= 1:
+            errors.append("khởi động ấm không nhanh hơn khởi động lạnh")
+        check_contents(path, errors)
+        check_invalidation(path, errors)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    for error in errors:
+        print("LỖI:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Đếm số thuộc tính ghi và số view tạo mới mỗi lần chuyển tháng.
+
+Thoát với mã 1 nếu vượt giới hạn cứng.
+Chạy: python benchmarks/bench_cells.py
+"""
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_core.cells import CellPool
+from calendar_core.layout import MAX_CELLS, MonthLayoutCache, shift_month
+from fakes import FakeCellBackend
+
+# Mỗi ô đổi tối đa chữ + chữ âm lịch; thêm một ít cho ô hôm nay và hàng thứ 6 ẩn/hiện
+MAX_WRITES_PER_FLIP = 2 * MAX_CELLS + 16
+MAX_ALLOCATIONS_PER_FLIP = 0
+
+
+def main():
+    backend = FakeCellBackend()
+    pool = CellPool(backend)
+    cache = MonthLayoutCache(today=date(2025, 9, 13))
+    pool.apply(cache.get(2025, 9))
+    setup_allocations = backend.allocations
+
+    worst_writes = 0
+    worst_allocations = 0
+    year, month = 2025, 9
+    flips = 0
+    for step in [1] * 30 + [-1] * 45 + [1] * 15:
+        year, month = shift_month(year, month, step)
+        allocations_before = backend.allocations
+        writes = pool.apply(cache.get(year, month))
+        worst_writes = max(worst_writes, writes)
+        worst_allocations = max(worst_allocations, backend.allocations - allocations_before)
+        flips += 1
+
+    print(f"View tạo khi khởi động: {setup_allocations}")
+    print(f"{flips} lần chuyển tháng, tổng {pool.writes} lần ghi")
+    print(f"Ghi nhiều nhất / lần: {worst_writes} (giới hạn {MAX_WRITES_PER_FLIP})")
+    print(f"View tạo thêm nhiều nhất / lần: {worst_allocations} (giới hạn {MAX_ALLOCATIONS_PER_FLIP})")
+    unchanged = pool.apply(cache.get(year, month))
+    print(f"Vẽ lại cùng tháng: {unchanged} lần ghi")
+
+    failed = (setup_allocations != MAX_CELLS or worst_writes > MAX_WRITES_PER_FLIP
+              or worst_allocations > MAX_ALLOCATIONS_PER_FLIP or unchanged != 0)
+    if failed:
+        print("VƯỢT GIỚI HẠN")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
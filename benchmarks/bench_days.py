@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Đo tốc độ và bộ nhớ của iter_days trên khoảng 200 năm.
+
+Bộ nhớ đỉnh (tracemalloc) khi duyệt 200 năm không được lớn hơn nhiều so với
+khi duyệt 10 năm: nếu vượt MEMORY_GROWTH_LIMIT lần thì thoát với mã lỗi.
+
+Chạy: python benchmarks/bench_days.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_core.days import iter_day_chunks, iter_days
+
+START = date(1900, 1, 1)
+END = date(2099, 12, 31)
+MEMORY_GROWTH_LIMIT = 1.5
+
+
+def consume(start, end):
+    """Đọc mọi trường của mỗi bản ghi, trả về (số bản ghi, tổng kiểm tra)."""
+    count = checksum = 0
+    for record in iter_days(start, end):
+        lunar_year, lunar_month, lunar_day, leap = record.lunar
+        iso_year, iso_week = record.iso_week
+        checksum += record.weekday + iso_week + lunar_day + leap + len(record.can_chi_day)
+        count += 1
+    return count, checksum
+
+
+def peak_memory(start, end):
+    tracemalloc.start()
+    consume(start, end)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    begin = time.perf_counter()
+    total = sum(len(chunk) for chunk in iter_day_chunks(START, END))
+    chunk_elapsed = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    count, _ = consume(START, END)
+    record_elapsed = time.perf_counter() - begin
+    assert count == total == (END - START).days + 1
+
+    short_peak = peak_memory(date(2020, 1, 1), date(2029, 12, 31))
+    long_peak = peak_memory(START, END)
+
+    print(f"Khoảng: {START} → {END} ({count:,} ngày)")
+    print(f"Khối cột:      {total / chunk_elapsed:>12,.0f} ngày/giây")
+    print(f"DayRecord:     {count / record_elapsed:>12,.0f} bản ghi/giây (đọc mọi trường)")
+    print(f"Bộ nhớ đỉnh:   10 năm {short_peak / 1024:,.1f} KB, 200 năm {long_peak / 1024:,.1f} KB")
+
+    if long_peak > short_peak * MEMORY_GROWTH_LIMIT:
+        print(f"LỖI: bộ nhớ tăng theo độ dài khoảng ngày (> {MEMORY_GROWTH_LIMIT}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
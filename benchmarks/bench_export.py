@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Đo tốc độ xuất lịch hàng loạt (calendar_core/export.py) và kiểm tra nội dung.
+
+1. Xuất JSON + văn bản cho 1900-2099 (2400 tháng), chạy một process và chạy
+   qua pool, in số tháng / giây.
+2. Xuất PNG một năm, in số tháng / giây và ghép trang lịch năm.
+3. Kiểm tra: đủ file, lưới bắt đầu từ thứ Hai, cờ cuối tuần / hôm nay, Tết
+   2026 là ngày nghỉ lễ, bản văn bản và JSON khớp nhau, ảnh PNG đúng kích thước.
+
+Thoát với mã lỗi nếu có kiểm tra sai hoặc bản chạy qua pool cho kết quả khác
+bản một process.
+
+Chạy: python benchmarks/bench_export.py [--workers N]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_core.export import month_image_size, month_range, output_path, export_months
+from calendar_core.holidays import HolidayCalendar
+from calendar_core.layout import build_month_layout
+
+FIRST = (1900, 1)
+LAST = (2099, 12)
+PNG_YEAR = 2026
+TODAY = date(2026, 2, 17)
+
+
+def check_month_json(path, errors):
+    with open(path, encoding="utf-8") as f:
+        grid = json.load(f)
+    cells = grid["cells"]
+    if len(cells) != grid["weeks"] * 7:
+        errors.append(f"{path}: {len(cells)} ô cho {grid['weeks']} tuần")
+        return grid
+    for cell in cells:
+        weekday = date.fromisoformat(cell["date"]).weekday()
+        if weekday != cell["col"] or cell["weekend"] != (weekday >= 5):
+            errors.append(f"{path}: ô {cell['date']} sai cột / cờ cuối tuần")
+            break
+    in_month = [cell["day"] for cell in cells if cell["in_month"]]
+    if in_month != list(range(1, len(in_month) + 1)):
+        errors.append(f"{path}: các ngày trong tháng không liên tục")
+    return grid
+
+
+def check_samples(out_dir, errors):
+    feb = check_month_json(output_path(out_dir, 2026, 2, "json"), errors)
+    tet = next(cell for cell in feb["cells"] if cell["date"] == "2026-02-17")
+    if not (tet["today"] and tet["marker"] == "holiday" and tet["lunar"] == {"year": 2026, "month": 1, "day": 1, "leap": False}):
+        errors.append(f"2026-02-17: {tet}")
+    if sum(cell["today"] for cell in feb["cells"]) != 1:
+        errors.append("2026-02: cần đúng một ô hôm nay")
+    with open(output_path(out_dir, 2026, 2, "text"), encoding="utf-8") as f:
+        text = f.read()
+    if "[17]*" not in text or "17/2: Tết Nguyên Đán" not in text or not text.splitlines()[1].split() == feb["weekdays"]:
+        errors.append("2026-02.txt không khớp JSON")
+    other = check_month_json(output_path(out_dir, 1900, 1, "json"), errors)
+    if other["today"] != TODAY.isoformat() or any(cell["today"] for cell in other["cells"]):
+        errors.append("1900-01: không được có ô hôm nay")
+
+
+def run(months, formats, out_dir, workers):
+    stats = export_months(months, formats, out_dir, today=TODAY, workers=workers, year_sheets=True)
+    print(f"{','.join(formats):<10} {stats['months']:>5} tháng, workers={workers or 'auto':<4} "
+          f"{stats['seconds']:>6.2f} s  {stats['months_per_second']:>7.1f} tháng/giây  "
+          f"{stats['bytes'] / 1024 / stats['months']:>5.1f} KiB/tháng")
+    return stats
+
+
+def read_all(out_dir, months, fmt):
+    contents = []
+    for year, month in months:
+        with open(output_path(out_dir, year, month, fmt), "rb") as f:
+            contents.append(f.read())
+    return contents
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None, help="Số process cho lần chạy qua pool")
+    args = parser.parse_args()
+
+    errors = []
+    months = month_range(FIRST, LAST)
+    with tempfile.TemporaryDirectory() as single_dir, tempfile.TemporaryDirectory() as pool_dir:
+        run(months, ("json", "text"), single_dir, 1)
+        run(months, ("json", "text"), pool_dir, args.workers)
+        for fmt in ("json", "text"):
+            missing = [m for m in months if not os.path.exists(output_path(pool_dir, *m, fmt))]
+            if missing:
+                errors.append(f"Thiếu {len(missing)} file {fmt}, ví dụ {missing[0]}")
+        if not errors and read_all(single_dir, months, "json") != read_all(pool_dir, months, "json"):
+            errors.append("Pool cho JSON khác bản một process")
+        check_samples(pool_dir, errors)
+
+        png_months = month_range((PNG_YEAR, 1), (PNG_YEAR, 12))
+        stats = run(png_months, ("png",), pool_dir, args.workers)
+        from PIL import Image
+
+        layout = build_month_layout(PNG_YEAR, 2, TODAY, HolidayCalendar())
+        with Image.open(output_path(pool_dir, PNG_YEAR, 2, "png")) as image:
+            if image.size != month_image_size(layout, 2):
+                errors.append(f"PNG {image.size}, cần {month_image_size(layout, 2)}")
+        if stats["sheets"] != [os.path.join(pool_dir, f"{PNG_YEAR}.png")]:
+            errors.append(f"Trang lịch năm: {stats['sheets']}")
+
+    for error in errors:
+        print("LỖI:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
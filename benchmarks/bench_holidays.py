@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Đo thời gian dựng chỉ mục ngày lễ / tiết khí cho từng năm 1900-2100.
+
+Thoát với mã lỗi nếu p99 thời gian dựng một năm vượt BUILD_BUDGET_MS hoặc
+nếu vài ngày lễ mẫu (kể cả năm có tháng nhuận) bị sai.
+
+Chạy: python benchmarks/bench_holidays.py
+"""
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_core.holidays import HolidayCalendar, build_year_index
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+BUILD_BUDGET_MS = 1.0
+
+# (ngày, tên) phải xuất hiện đúng một lần trong năm
+EXPECTED = [
+    (date(2025, 1, 29), "Tết Nguyên Đán"),
+    (date(2025, 4, 7), "Giỗ Tổ Hùng Vương"),
+    (date(2025, 9, 6), "Vu Lan"),            # năm có tháng 6 nhuận
+    (date(2020, 5, 7), "Lễ Phật đản"),       # năm có tháng 4 nhuận
+    (date(2023, 1, 21), "Giao thừa"),        # tháng Chạp thiếu (29 ngày)
+    (date(2025, 2, 3), "Lập xuân"),
+    (date(2025, 12, 21), "Đông chí"),
+    (date(2025, 9, 2), "Quốc khánh"),
+]
+
+
+def check_expected():
+    errors = []
+    for day, name in EXPECTED:
+        index = build_year_index(day.year)
+        hits = [ordinal for ordinal, observances in index.items() if any(o.name == name for o in observances)]
+        if hits != [day.toordinal()]:
+            errors.append(f"{name} {day.year}: {[str(date.fromordinal(o)) for o in hits]}, cần {day}")
+    # Tháng nhuận vẫn có mùng 1 và rằm: năm 2023 có tháng 2 nhuận (mùng 1 là 22/3/2023)
+    if not any(o.name == "Mùng 1" for o in build_year_index(2023).get(date(2023, 3, 22).toordinal(), ())):
+        errors.append("Thiếu mùng 1 tháng 2 nhuận năm 2023")
+    return errors
+
+
+def main():
+    errors = check_expected()
+    for error in errors:
+        print("LỖI:", error)
+
+    timings = []
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        start = time.perf_counter()
+        build_year_index(year)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99)]
+
+    calendar = HolidayCalendar()
+    days = [date(2025, 1, 1).toordinal() + k for k in range(365)]
+    calendar.year_index(2025)
+    start = time.perf_counter()
+    for _ in range(20):
+        for ordinal in days:
+            calendar.observances(ordinal)
+    lookups = 20 * len(days) / (time.perf_counter() - start)
+
+    print(f"Dựng chỉ mục {FIRST_YEAR}-{LAST_YEAR}: p50 {p50:.3f} ms, p99 {p99:.3f} ms, "
+          f"max {timings[-1]:.3f} ms / năm")
+    print(f"Tra cứu (năm đã có trong cache): {lookups:,.0f} ngày/giây")
+
+    if p99 > BUILD_BUDGET_MS:
+        print(f"LỖI: p99 dựng chỉ mục vượt {BUILD_BUDGET_MS} ms")
+        errors.append("budget")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
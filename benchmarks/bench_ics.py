@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Đo nhập .ics: tốc độ phân tích, bộ nhớ, độ trễ truy vấn lưới 42 ngày, nhập lại.
+
+Sinh một file giả lập 100.000 VEVENT trong 10 năm (sự kiện cả ngày, có giờ
+UTC, nhiều ngày, dòng gập, VALARM; 3% có RRULE, phần lớn kết thúc bằng UNTIL
+trong vòng 2 năm, 10% lặp vô hạn), rồi kiểm tra một file nhỏ có kết quả biết trước.
+Truy vấn được đo cả trong cửa sổ khai triển sẵn của EventIndex (đặt trùng 10 năm
+dữ liệu) lẫn ngoài cửa sổ (khai triển từng luật), và hai cách phải cho cùng kết quả.
+Thoát với mã lỗi nếu kết quả sai hoặc vượt ngân sách.
+
+Chạy: python benchmarks/bench_ics.py [--events N]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_core.ics import EventIndex, EventStore, parse_buffer, parse_file
+
+EVENTS = 100000
+RECURRING_SHARE = 0.03
+UNBOUNDED_SHARE = 0.1
+FIRST_DAY = date(2020, 1, 1)
+YEARS = 10
+# Bộ nhớ Python khi phân tích phải nhỏ hơn hẳn kích thước file (không nạp cả file)
+HEAP_SHARE_LIMIT = 0.5
+QUERY_P99_BUDGET_MS = 10.0
+
+RULES = [
+    "FREQ=DAILY;INTERVAL=3",
+    "FREQ=WEEKLY;BYDAY=MO,WE,FR",
+    "FREQ=WEEKLY;INTERVAL=2;BYDAY=TU",
+    "FREQ=WEEKLY;BYDAY=TH;COUNT=20",
+    "FREQ=MONTHLY;BYMONTHDAY=-1",
+    "FREQ=MONTHLY;BYDAY=2TH",
+    "FREQ=YEARLY;BYMONTH=3,9",
+]
+
+SAMPLE = b"""BEGIN:VCALENDAR\r
+BEGIN:VTIMEZONE\r
+TZID:Asia/Ho_Chi_Minh\r
+BEGIN:STANDARD\r
+DTSTART:19700101T000000\r
+RRULE:FREQ=YEARLY\r
+END:STANDARD\r
+END:VTIMEZONE\r
+BEGIN:VEVENT\r
+UID:span\r
+DTSTART;VALUE=DATE:20250103\r
+DTEND;VALUE=DATE:20250106\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:weekly\r
+DTSTART;TZID=Asia/Ho_Chi_Minh:20250110T090000\r
+DURATION:PT1H\r
+RRULE:FREQ=WEEKLY;BYDAY=MO,FR;CO\r
+ UNT=4\r
+EXDATE;TZID=Asia/Ho_Chi_Minh:20250113T090000\r
+BEGIN:VALARM\r
+TRIGGER:-PT15M\r
+DURATION:P3D\r
+END:VALARM\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:weekly\r
+RECURRENCE-ID;TZID=Asia/Ho_Chi_Minh:20250117T090000\r
+DTSTART;TZID=Asia/Ho_Chi_Minh:20250118T090000\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:month-end\r
+DTSTART:20250131T100000\r
+RRULE:FREQ=MONTHLY;BYMONTHDAY=-1;UNTIL=20250501\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:leap\r
+DTSTART;VALUE=DATE:20200229\r
+RRULE:FREQ=YEARLY\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+SAMPLE_DAYS = {
+    date(2025, 1, 3), date(2025, 1, 4), date(2025, 1, 5),   # DTEND cả ngày là mốc loại trừ
+    date(2025, 1, 10), date(2025, 1, 20),                   # 13 bị EXDATE, 17 bị dời sang 18
+    date(2025, 1, 18),
+    date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30),
+    date(2024, 2, 29), date(2028, 2, 29),                   # 29/2 chỉ có ở năm nhuận
+}
+
+
+def check_sample():
+    first, last = date(2024, 1, 1).toordinal(), date(2028, 12, 31).toordinal()
+    errors = []
+    # Cửa sổ khai triển sẵn chứa cả khoảng hỏi, rồi cửa sổ không chạm tới nó
+    for window in ((first, last), (last + 1, last + 366)):
+        index = EventIndex([parse_buffer(SAMPLE)], window=window)
+        found = {date.fromordinal(first + i) for i, n in enumerate(index.counts(first, last)) if n}
+        if found != SAMPLE_DAYS:
+            errors.append(f"Mẫu .ics (cửa sổ {date.fromordinal(window[0])}): thừa "
+                          f"{sorted(map(str, found - SAMPLE_DAYS))}, thiếu {sorted(map(str, SAMPLE_DAYS - found))}")
+    return errors
+
+
+def write_synthetic(path, count, seed=7):
+    rng = random.Random(seed)
+    span_days = YEARS * 365
+    with open(path, "w", newline="") as out:
+        out.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\n")
+        for n in range(count):
+            day = FIRST_DAY + timedelta(days=rng.randrange(span_days))
+            out.write(f"BEGIN:VEVENT\r\nUID:event-{n}@bench\r\nSUMMARY:Sự kiện số {n}\r\n")
+            out.write("DESCRIPTION:Mô tả dài được gập thành nhiều dòng để giống file xuất từ\r\n"
+                      "  ứng dụng lịch thật, có cả dấu phẩy\\, chấm phẩy\; và ký tự Unicode.\r\n")
+            kind = rng.random()
+            if kind < 0.3:
+                length = rng.choice((1, 1, 1, 2, 3, 7, 45))
+                end = day + timedelta(days=length)
+                out.write(f"DTSTART;VALUE=DATE:{day:%Y%m%d}\r\nDTEND;VALUE=DATE:{end:%Y%m%d}\r\n")
+            else:
+                hour = rng.randrange(24)
+                out.write(f"DTSTART:{day:%Y%m%d}T{hour:02d}0000Z\r\nDURATION:PT{rng.choice((30, 60, 90))}M\r\n")
+            if kind > 1 - RECURRING_SHARE:
+                rule = rng.choice(RULES)
+                if "COUNT" not in rule and rng.random() > UNBOUNDED_SHARE:
+                    rule += f";UNTIL={day + timedelta(days=rng.randrange(30, 730)):%Y%m%d}T235959Z"
+                out.write(f"RRULE:{rule}\r\n")
+            if n % 10 == 0:
+                out.write("BEGIN:VALARM\r\nTRIGGER:-PT10M\r\nACTION:DISPLAY\r\nEND:VALARM\r\n")
+            out.write("END:VEVENT\r\n")
+        out.write("END:VCALENDAR\r\n")
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def rss_kib():
+    """RSS hiện tại (Linux) hoặc đỉnh (macOS), đơn vị KiB."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=EVENTS)
+    args = parser.parse_args()
+
+    errors = check_sample()
+    workdir = tempfile.mkdtemp(prefix="menu_calendar_ics_bench_")
+    try:
+        path = os.path.join(workdir, "synthetic.ics")
+        write_synthetic(path, args.events)
+        size = os.path.getsize(path)
+
+        rss_before = rss_kib()
+        start = time.perf_counter()
+        parsed = parse_file(path)
+        parse_seconds = time.perf_counter() - start
+        rss_after = rss_kib()
+
+        tracemalloc.start()
+        parse_file(path)
+        _, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        window = (FIRST_DAY.toordinal(), FIRST_DAY.toordinal() + YEARS * 365)
+        start = time.perf_counter()
+        index = EventIndex([parsed], window=window)
+        index_ms = (time.perf_counter() - start) * 1000
+        # Cửa sổ sau hết dữ liệu: mọi truy vấn đi đường khai triển từng luật
+        lazy = EventIndex([parsed], window=(window[1] + 1, window[1] + 1))
+
+        rng = random.Random(1)
+        timings, lazy_timings = [], []
+        mismatched = 0
+        for _ in range(300):
+            first = FIRST_DAY.toordinal() + rng.randrange(YEARS * 365 - 42)
+            begin = time.perf_counter()
+            counts = index.counts(first, first + 41)
+            timings.append((time.perf_counter() - begin) * 1000)
+            begin = time.perf_counter()
+            lazy_counts = lazy.counts(first, first + 41)
+            lazy_timings.append((time.perf_counter() - begin) * 1000)
+            mismatched += counts != lazy_counts
+        if mismatched:
+            errors.append(f"{mismatched} truy vấn khai triển sẵn khác khai triển từng luật")
+
+        store = EventStore(directory=workdir)
+        store.refresh()
+        begin = time.perf_counter()
+        unchanged = store.refresh()
+        stat_ms = (time.perf_counter() - begin) * 1000
+        os.utime(path)
+        begin = time.perf_counter()
+        touched = store.refresh()
+        hash_ms = (time.perf_counter() - begin) * 1000
+        extra = os.path.join(workdir, "extra.ics")
+        with open(extra, "wb") as out:
+            out.write(SAMPLE)
+        begin = time.perf_counter()
+        added = store.refresh()
+        added_ms = (time.perf_counter() - begin) * 1000
+        if unchanged or touched or not added or store.parsed != 2:
+            errors.append(f"Nhập lại không đúng: {unchanged=}, {touched=}, {added=}, parsed={store.parsed}")
+
+        print(f"File: {len(parsed):,} sự kiện ({len(parsed.rules):,} lặp lại, {parsed.skipped} bỏ qua), "
+              f"{size / 2**20:.1f} MiB")
+        print(f"Phân tích:        {len(parsed) / parse_seconds:>10,.0f} sự kiện/giây "
+              f"({size / 2**20 / parse_seconds:.1f} MiB/giây)")
+        print(f"Bộ nhớ:           heap đỉnh {heap_peak / 2**20:.1f} MiB, RSS +{(rss_after - rss_before) / 1024:.1f} MiB")
+        print(f"Dựng chỉ mục:     {index_ms:>10.1f} ms ({len(index.occurrence_starts):,} lần lặp khai triển sẵn)")
+        print(f"Truy vấn 42 ngày: p50 {percentile(timings, 0.5):.2f} ms, p99 {percentile(timings, 0.99):.2f} ms "
+              f"(ngoài cửa sổ: p50 {percentile(lazy_timings, 0.5):.2f} ms, p99 {percentile(lazy_timings, 0.99):.2f} ms)")
+        print(f"Nhập lại:         không đổi {stat_ms:.2f} ms, chỉ đổi mtime {hash_ms:.1f} ms, "
+              f"thêm một file {added_ms:.1f} ms")
+
+        if len(parsed) != args.events or parsed.skipped:
+            errors.append(f"Đọc được {len(parsed)} / {args.events} sự kiện, bỏ qua {parsed.skipped}")
+        if heap_peak > size * HEAP_SHARE_LIMIT:
+            errors.append(f"Heap đỉnh {heap_peak} B vượt {HEAP_SHARE_LIMIT:.0%} kích thước file")
+        if percentile(timings, 0.99) > QUERY_P99_BUDGET_MS:
+            errors.append(f"p99 truy vấn vượt {QUERY_P99_BUDGET_MS} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for error in errors:
+        print("LỖI:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Đo hit/miss và bộ nhớ của cache ảnh ngày với backend Pillow.
+
+Thoát với mã 1 nếu có lần vẽ/nạp ảnh không xuất phát từ cache miss, hoặc
+cache vượt giới hạn bộ nhớ.
+Chạy: python benchmarks/bench_images.py
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from calendar_core.images import DayImages, ImageCache, PillowImageBackend
+
+
+def main():
+    backend = PillowImageBackend()
+    images = DayImages(backend, os.path.join(ROOT, "images"), cache=ImageCache(backend))
+
+    # Mô phỏng 3 tháng chạy liên tục: mỗi phút vẽ lại thanh menu,
+    # thỉnh thoảng mở popover và đổi giao diện sáng/tối
+    start = time.perf_counter()
+    lookups = 0
+    for day_index in range(92):
+        day = day_index % 31 + 1
+        appearance = "dark" if day_index % 7 == 0 else "light"
+        for minute in range(0, 24 * 60, 15):
+            images.status_icon(day, scale=2.0)
+            images.today_marker(day, scale=2.0, appearance=appearance)
+            lookups += 2
+    elapsed = time.perf_counter() - start
+
+    cache = images.cache
+    print(f"{lookups} lần tra trong {elapsed * 1000:.1f} ms")
+    print(f"hit={cache.hits} miss={cache.misses} evict={cache.evictions} "
+          f"ảnh={len(cache)} bộ nhớ={cache.bytes / 1024:.0f} KiB (giới hạn {cache.max_bytes / 1024:.0f} KiB)")
+    print(f"vẽ hình tròn={backend.renders} nạp file={backend.loads}")
+
+    # Chỉ được vẽ/nạp khi trượt cache, và bộ nhớ không vượt giới hạn
+    failed = backend.renders + backend.loads != cache.misses or cache.bytes > cache.max_bytes
+    if failed:
+        print("CACHE KHÔNG HIỆU QUẢ")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Đo thời gian luồng chính tốn cho mỗi lời gọi log.
+
+So sánh FileHandler đồng bộ (như logging.basicConfig cũ) với pipeline hàng
+đợi của calendar_core.logging_setup, trên đĩa nhanh và trên "đĩa chậm" (mỗi
+lần ghi trễ thêm SLOW_WRITE_US), cả khi log bị giới hạn tần suất.
+Thoát với mã 1 nếu luồng chính vẫn phải chờ đĩa chậm, vượt ngân sách p99,
+file log vượt giới hạn xoay vòng, hoặc MENU_CALENDAR_LOG_LEVEL sai làm
+setup_logging lỗi thay vì rơi về INFO.
+Chạy: python benchmarks/bench_logging.py
+"""
+import glob
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_core.logging_setup import LOG_FORMAT, DATE_FORMAT, setup_logging, stop_listener
+
+CALLS = 20000
+SLOW_CALLS = 2000
+SLOW_WRITE_US = 200
+# Ngân sách p99 cho một lời gọi log trên luồng chính
+MAIN_THREAD_P99_BUDGET_US = 100
+
+
+class SlowFileHandler(logging.FileHandler):
+    """FileHandler giả lập đĩa chậm / đĩa mạng."""
+
+    def emit(self, record):
+        super().emit(record)
+        deadline = time.perf_counter() + SLOW_WRITE_US / 1e6
+        while time.perf_counter() < deadline:
+            pass
+
+
+def measure(label, calls=CALLS, **extra):
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter_ns()
+        logging.info(f"Updating UI with month: {i % 12 + 1}, year: 2025", **extra)
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    p50 = samples[len(samples) // 2] / 1000
+    p99 = samples[int(len(samples) * 0.99)] / 1000
+    print(f"{label:<40} p50 {p50:8.2f} µs   p99 {p99:8.2f} µs   trung bình {statistics.fmean(samples) / 1000:8.2f} µs")
+    return p50, p99
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def sync_logging(path, handler_class=logging.FileHandler):
+    reset_root()
+    handler = handler_class(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+    logging.getLogger().addHandler(handler)
+    logging.getLogger().setLevel(logging.INFO)
+
+
+def check_bad_level(directory):
+    """MENU_CALENDAR_LOG_LEVEL sai: vẫn chạy, mức INFO và một cảnh báo trong file log."""
+    reset_root()
+    previous = os.environ.get("MENU_CALENDAR_LOG_LEVEL")
+    os.environ["MENU_CALENDAR_LOG_LEVEL"] = "VERBOSE"
+    try:
+        log_path, listener = setup_logging(log_dir=directory)
+    except ValueError as e:
+        return [f"mức log sai làm setup_logging lỗi: {e}"]
+    finally:
+        if previous is None:
+            del os.environ["MENU_CALENDAR_LOG_LEVEL"]
+        else:
+            os.environ["MENU_CALENDAR_LOG_LEVEL"] = previous
+    level = logging.getLogger().level
+    stop_listener(listener)
+    reset_root()
+    with open(log_path, encoding="utf-8") as f:
+        warned = "Unknown log level 'VERBOSE'" in f.read()
+    failures = []
+    if level != logging.INFO:
+        failures.append(f"mức log sai không rơi về INFO (mức {logging.getLevelName(level)})")
+    if not warned:
+        failures.append("mức log sai không được cảnh báo trong log")
+    return failures
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        sync_logging(os.path.join(directory, "sync.log"))
+        measure("FileHandler đồng bộ")
+
+        reset_root()
+        async_dir = os.path.join(directory, "async")
+        max_bytes = 256 * 1024
+        _, listener = setup_logging(log_dir=async_dir, max_bytes=max_bytes, rate_burst=CALLS)
+        _, queued_p99 = measure("Hàng đợi + luồng nền")
+        stop_listener(listener)
+
+        reset_root()
+        _, listener = setup_logging(log_dir=os.path.join(directory, "limited"), max_bytes=max_bytes)
+        _, limited_p99 = measure("Hàng đợi + giới hạn tần suất", extra={"rate_key": "updateCalendarUI"})
+        stop_listener(listener)
+
+        sync_logging(os.path.join(directory, "slow.log"), SlowFileHandler)
+        slow_sync_p50, _ = measure(f"Đĩa chậm ({SLOW_WRITE_US} µs), đồng bộ", calls=SLOW_CALLS)
+
+        reset_root()
+        _, listener = setup_logging(log_dir=os.path.join(directory, "slow_async"), rate_burst=CALLS)
+        listener.handlers = (SlowFileHandler(os.path.join(directory, "slow_async.log"), encoding="utf-8"),)
+        slow_queued_p50, _ = measure(f"Đĩa chậm ({SLOW_WRITE_US} µs), hàng đợi", calls=SLOW_CALLS)
+        stop_listener(listener)
+        reset_root()
+
+        sizes = [os.path.getsize(path) for path in glob.glob(os.path.join(async_dir, "menu_calendar.log*"))]
+        print(f"File log sau xoay vòng: {len(sizes)} file, lớn nhất {max(sizes) / 1024:.0f} KiB")
+        if max(sizes) > max_bytes:
+            failures.append("file log vượt giới hạn")
+        if slow_queued_p50 >= SLOW_WRITE_US or slow_sync_p50 < SLOW_WRITE_US:
+            failures.append("luồng chính vẫn chờ ghi đĩa")
+        if max(queued_p99, limited_p99) > MAIN_THREAD_P99_BUDGET_US:
+            failures.append(f"p99 vượt ngân sách {MAIN_THREAD_P99_BUDGET_US} µs")
+        failures.extend(check_bad_level(os.path.join(directory, "bad_level")))
+    for failure in failures:
+        print(f"LỖI: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Đo tốc độ đổi dương -> âm lịch: lunarcalendar vs bảng nén vs NumPy.
+
+Chạy: python benchmarks/bench_lunar.py
+"""
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from calendar_core import lunar, lunar_np
+
+
+def rate(func, count, repeat=3):
+    """Số phép đổi mỗi giây (lấy lần chạy nhanh nhất)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main():
+    cases = [
+        ("lưới tháng (42 ô)", lunar_np.month_grid_ordinals(2025, 9, weeks=6)),
+        ("một năm", lunar_np.dates_to_ordinals(date(2025, 1, 1), date(2025, 12, 31))),
+        ("100 năm", lunar_np.dates_to_ordinals(date(1950, 1, 1), date(2049, 12, 31))),
+    ]
+    try:
+        from lunarcalendar import Converter, Solar
+    except ImportError:
+        Converter = None
+        print("lunarcalendar chưa được cài, bỏ qua cột thư viện gốc")
+
+    print(f"{'Trường hợp':<20}{'lunarcalendar':>16}{'bảng (scalar)':>16}{'NumPy':>16}   (phép đổi/giây)")
+    for name, ordinals in cases:
+        values = [int(o) for o in ordinals]
+        dates = [date.fromordinal(o) for o in values]
+        if Converter is not None:
+            sample = dates[:2000]
+            library = rate(lambda: [Converter.Solar2Lunar(Solar(d.year, d.month, d.day)) for d in sample], len(sample))
+        else:
+            library = float('nan')
+        scalar = rate(lambda: [lunar.ordinal_to_lunar(o) for o in values], len(values))
+        vectorized = rate(lambda: lunar_np.ordinals_to_lunar(ordinals), len(values), repeat=20)
+        print(f"{name:<20}{library:>16,.0f}{scalar:>16,.0f}{vectorized:>16,.0f}")
+
+    d, m, y, l = lunar_np.ordinals_to_lunar(cases[2][1])
+    reverse = rate(lambda: lunar_np.lunar_to_ordinals(y, m, d, l), d.size, repeat=20)
+    assert np.array_equal(lunar_np.lunar_to_ordinals(y, m, d, l), cases[2][1])
+    print(f"{'âm -> dương 100 năm':<20}{'':>16}{'':>16}{reverse:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Kiểm tra chi phí của calendar_core.metrics khi tắt và khi bật.
+
+- Khi tắt: mỗi `with span(...)` không ghi gì và tốn không quá DISABLED_RATIO lần
+  một `with` trên context manager rỗng đo cùng lần chạy (không dùng ngưỡng ns
+  tuyệt đối: máy CI đang bận chậm đều cả hai).
+- updateCalendarUI (trên AppKit giả) có vài span: chi phí khi tắt phải dưới
+  DISABLED_SHARE_LIMIT thời gian của hàm.
+- ProfileSession với timer giả: ghi tổng hợp đúng chu kỳ, lưu trace JSON và .prof.
+- Timer của RefreshScheduler và date_did_change (đường nửa đêm) có span.
+- MENU_CALENDAR_PROFILE_INTERVAL sai bị profile_modes từ chối; `--profile` vẫn
+  chạy khi app không có file log.
+
+Chạy: python benchmarks/bench_metrics.py
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from calendar_core import metrics
+from fakes import FakeClock, FakeTimers
+
+LOOPS = 200000
+DISABLED_RATIO = 3.0
+DISABLED_SHARE_LIMIT = 0.05
+# Số span chạy trong một lần updateCalendarUI khi layout đã có trong cache
+SPANS_PER_UPDATE = 5
+
+
+def per_call_ns(body, loops=LOOPS, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body(loops)
+        best = min(best, time.perf_counter() - start)
+    return best / loops * 1e9
+
+
+def bare(loops):
+    for _ in range(loops):
+        pass
+
+
+class NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def with_null(loops):
+    null = NullContext()
+    for _ in range(loops):
+        with null:
+            pass
+
+
+def with_span(loops):
+    span = metrics.span
+    for _ in range(loops):
+        with span("bench"):
+            pass
+
+
+def update_calendar_ui_ns():
+    import run_suite
+
+    app = run_suite.load_app()
+    delegate = run_suite.make_delegate(app)
+    delegate.ensureCalendarView()
+    view = delegate.calendar_view
+    view.updateCalendarUI()
+    return per_call_ns(lambda loops: [view.updateCalendarUI() for _ in range(loops)], loops=300)
+
+
+def check_session(errors):
+    workdir = tempfile.mkdtemp(prefix="menu_calendar_profile_")
+    try:
+        clock = FakeClock(datetime(2025, 1, 1, 12), timezone.utc)
+        timers = FakeTimers(clock)
+        emitted = []
+        session = metrics.ProfileSession({"summary", "trace", "cprofile"}, workdir, timers, emitted.append,
+                                         interval=60)
+        session.start()
+        for _ in range(10):
+            with metrics.span("bench.session"):
+                metrics.incr("bench.counter")
+        timers.run_for(185)
+        written = session.stop()
+        if session.summaries != 4 or timers.live:
+            errors.append(f"ProfileSession: {session.summaries} bản tổng hợp, {timers.live} timer còn sống")
+        if not any("bench.session" in text and "bench.counter" in text for text in emitted):
+            errors.append("Bản tổng hợp thiếu span / bộ đếm")
+        trace = [path for path in written if path.endswith(".json")]
+        if not trace or len(json.load(open(trace[0]))["traceEvents"]) != 10:
+            errors.append("File trace-event không đúng")
+        if not any(path.endswith(".prof") and os.path.getsize(path) for path in written):
+            errors.append("Không có file cProfile")
+        if metrics.is_enabled():
+            errors.append("ProfileSession.stop() không tắt đo đạc")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        metrics.REGISTRY.reset()
+        metrics.REGISTRY.trace = None
+
+
+def check_settings(errors):
+    """Chu kỳ tổng hợp sai bị từ chối; --profile vẫn chạy khi không có file log."""
+    for value in ("abc", "0", "-5", "nan", "inf"):
+        try:
+            metrics.profile_modes(["app", "--profile"], {metrics.INTERVAL_ENV: value})
+        except ValueError:
+            continue
+        errors.append(f"{metrics.INTERVAL_ENV}={value} được chấp nhận")
+    if metrics.profile_modes(["app"], {metrics.INTERVAL_ENV: "abc"}):
+        errors.append("Chu kỳ sai bật profile khi profile đang tắt")
+
+    import run_suite
+
+    app = run_suite.load_app()
+    log_file, argv = app.LOG_FILE, sys.argv
+    app.LOG_FILE, sys.argv = None, ["menu_calendar.py", "--profile"]
+    session = None
+    try:
+        session = app.start_profiling()
+    except Exception as e:
+        errors.append(f"--profile lỗi khi không có file log: {type(e).__name__}: {e}")
+    finally:
+        app.LOG_FILE, sys.argv = log_file, argv
+        if session is not None:
+            session.stop()
+        metrics.disable()
+        metrics.REGISTRY.reset()
+    if session is not None and not os.path.isdir(session.output_dir):
+        errors.append(f"Thư mục profile không tồn tại: {session.output_dir}")
+
+
+def check_midnight_spans(errors):
+    """Đường nửa đêm thật (timer của RefreshScheduler -> date_did_change) có span."""
+    import run_suite
+    from calendar_core.scheduler import RefreshScheduler
+
+    app = run_suite.load_app()
+    delegate = run_suite.make_delegate(app)
+    clock = FakeClock(datetime(2025, 1, 1, 23, 59), timezone.utc)
+    timers = FakeTimers(clock)
+    scheduler = RefreshScheduler(clock, timers, delegate.date_did_change)
+    metrics.enable()
+    try:
+        scheduler.start()
+        timers.run_for(120)
+        scheduler.stop()
+        recorded = set(metrics.REGISTRY.histograms)
+    finally:
+        metrics.disable()
+        metrics.REGISTRY.reset()
+    missing = {"scheduler.tick", "date_did_change"} - recorded
+    if scheduler.refreshes != 1 or missing:
+        errors.append(f"Qua nửa đêm: {scheduler.refreshes} lần làm mới, thiếu span {sorted(missing)}")
+
+
+def main():
+    errors = []
+    if metrics.profile_modes(["app", "--profile=trace"], {}) != {"summary", "trace"}:
+        errors.append("Không đọc được --profile=trace")
+    if metrics.profile_modes(["app"], {"MENU_CALENDAR_PROFILE": "0"}):
+        errors.append("MENU_CALENDAR_PROFILE=0 vẫn bật")
+
+    metrics.disable()
+    baseline = per_call_ns(bare)
+    disabled = per_call_ns(with_span) - baseline
+    reference = per_call_ns(with_null) - baseline
+    if metrics.REGISTRY.histograms:
+        errors.append("Span ghi dữ liệu khi đang tắt")
+    metrics.enable()
+    enabled = per_call_ns(with_span, loops=LOOPS // 4) - baseline
+    metrics.disable()
+    metrics.REGISTRY.reset()
+
+    update_ns = update_calendar_ui_ns()
+    share = disabled * SPANS_PER_UPDATE / update_ns
+
+    check_session(errors)
+    check_settings(errors)
+    check_midnight_spans(errors)
+
+    print(f"span khi tắt:  {disabled:8.0f} ns / lần ({disabled / reference:.1f}x một `with` rỗng, {reference:.0f} ns)")
+    print(f"span khi bật:  {enabled:8.0f} ns / lần")
+    print(f"updateCalendarUI: {update_ns / 1000:.1f} µs, phần span khi tắt ≈ {share:.2%}")
+    if disabled > DISABLED_RATIO * reference:
+        errors.append(f"span khi tắt tốn {disabled:.0f} ns > {DISABLED_RATIO:g}x một `with` rỗng ({reference:.0f} ns)")
+    if share > DISABLED_SHARE_LIMIT:
+        errors.append(f"span khi tắt chiếm {share:.2%} updateCalendarUI > {DISABLED_SHARE_LIMIT:.0%}")
+    for error in errors:
+        print("LỖI:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Kiểm tra RenderScheduler: N lần bấm liên tiếp chỉ vẽ một lần, độ trễ có giới hạn.
+
+1. Lõi: executor luồng nền thật, `compute` giả chậm COMPUTE_MS và lần tính
+   đầu mỗi đợt bị giữ cho tới khi bấm xong; luồng chính xử lý các lời gọi đã
+   dispatch giữa hai lần bấm (như run loop thật).
+2. App trên AppKit giả với ThreadExecutor thật: bấm → CLICKS lần, đếm số lần vẽ.
+
+Thoát với mã lỗi nếu có đợt bấm vẽ nhiều hơn một lần, vẽ sai tháng, hoặc độ
+trễ từ lần bấm cuối tới lúc vẽ vượt LATENCY_BUDGET_MS.
+
+Chạy: python benchmarks/bench_render.py
+"""
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+from calendar_core.render import QueueDispatcher, RenderScheduler, ThreadExecutor
+
+CLICKS = 10
+BURSTS = 20
+CLICK_GAP_MS = 1.0
+COMPUTE_MS = 5.0
+# Tối đa: lần tính đang chạy dở + lần tính cho yêu cầu cuối + độ trễ lập lịch luồng
+LATENCY_BUDGET_MS = 2 * COMPUTE_MS + 40.0
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def wait_idle(scheduler, pump, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        pump()
+        if scheduler.idle:
+            pump()
+            return True
+        time.sleep(0.0005)
+    return False
+
+
+def core_bursts(errors):
+    """Mỗi đợt: lần tính đầu bị giữ lại cho tới khi đủ CLICKS lần bấm, nên kết quả không phụ thuộc tốc độ máy."""
+    import threading
+
+    painted = []
+    gate = threading.Event()
+
+    def compute(target):
+        gate.wait()
+        time.sleep(COMPUTE_MS / 1000)
+        return target
+
+    executor = ThreadExecutor(name="bench-render")
+    dispatcher = QueueDispatcher()
+    scheduler = RenderScheduler(compute, lambda target, result: painted.append(result), executor, dispatcher)
+    latencies = []
+    try:
+        for burst in range(BURSTS):
+            before = len(painted)
+            gate.clear()
+            for click in range(CLICKS):
+                scheduler.request((burst, click))
+                time.sleep(CLICK_GAP_MS / 1000)
+                dispatcher.drain()
+            gate.set()
+            if not wait_idle(scheduler, dispatcher.drain):
+                errors.append(f"Lõi: đợt {burst} không xong")
+                continue
+            latencies.append(scheduler.last_latency * 1000)
+            paints = painted[before:]
+            if paints != [(burst, CLICKS - 1)]:
+                errors.append(f"Lõi: đợt {burst} vẽ {paints}, cần đúng một lần {(burst, CLICKS - 1)}")
+    finally:
+        gate.set()
+        executor.shutdown()
+    print(f"Lõi:  {BURSTS} đợt x {CLICKS} lần bấm -> {scheduler.paints} lần vẽ, "
+          f"{scheduler.computed} lần tính, {scheduler.stale} kết quả cũ bị bỏ; "
+          f"trễ từ lần bấm cuối p50 {percentile(latencies, 0.5):.1f} ms, max {max(latencies):.1f} ms")
+    return latencies
+
+
+def app_bursts(errors):
+    import fake_appkit
+    import run_suite
+
+    app = run_suite.load_app()
+    # Dùng luồng nền thật thay cho InlineExecutor mà run_suite cài sẵn
+    app.make_render_executor = ThreadExecutor
+    delegate = run_suite.make_delegate(app)
+    view = delegate.calendar_view
+    scheduler = view.render_scheduler
+    painted = []
+    apply = scheduler.apply
+    scheduler.apply = lambda target, layout: (painted.append(target), apply(target, layout))
+    latencies = []
+    main_thread = []
+    try:
+        for burst in range(BURSTS):
+            # Nhảy tới vùng chưa có trong cache để mỗi lần tính là một lần dựng bố cục thật
+            view.current_year = 1950 + burst * 7
+            view.current_month = 1
+            view.layout_cache.clear()
+            before = len(painted)
+            busy = 0.0
+            for _ in range(CLICKS):
+                start = time.perf_counter()
+                view.nextMonth_(None)
+                fake_appkit.RUN_LOOP.run_pending()
+                busy += time.perf_counter() - start
+            if not wait_idle(scheduler, fake_appkit.RUN_LOOP.run_pending):
+                errors.append(f"App: đợt {burst} không xong")
+                continue
+            latencies.append(scheduler.last_latency * 1000)
+            main_thread.append(busy * 1000)
+            expected = (view.current_year, view.current_month)
+            paints = painted[before:]
+            # Bố cục tính nhanh hơn khoảng cách giữa hai lần bấm thì có thể vẽ sớm hơn; lần cuối phải đúng tháng cuối
+            if not paints or paints[-1] != expected:
+                errors.append(f"App: đợt {burst} vẽ {paints}, tháng cuối phải là {expected}")
+    finally:
+        view.render_executor.shutdown()
+    total = len(painted)
+    print(f"App:  {BURSTS} đợt x {CLICKS} lần bấm -> {total} lần vẽ "
+          f"(trung bình {total / BURSTS:.1f} / đợt); trễ p50 {percentile(latencies, 0.5):.1f} ms, "
+          f"max {max(latencies):.1f} ms; luồng chính bận {percentile(main_thread, 0.5):.2f} ms / đợt")
+    return latencies
+
+
+def main():
+    errors = []
+    latencies = core_bursts(errors) + app_bursts(errors)
+    worst = max(latencies) if latencies else float("inf")
+    if worst > LATENCY_BUDGET_MS:
+        errors.append(f"Độ trễ vẽ {worst:.1f} ms > {LATENCY_BUDGET_MS:.0f} ms")
+    for error in errors:
+        print("LỖI:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
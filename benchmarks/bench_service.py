@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Đo thông lượng / độ trễ của dịch vụ tra cứu qua Unix socket (calendar_core/service.py).
+
+Chạy một QueryServer thật trên socket tạm (thay cho app, chạy được trên Linux)
+rồi đo bằng QueryClient:
+
+1. Độ trễ khứ hồi của `lunar` gửi từng yêu cầu một (p50 / p99).
+2. Thông lượng khi pipelining với độ sâu PIPELINE_DEPTHS.
+3. Một lệnh `batch` MAX_BATCH ngày, và nhiều client song song.
+4. So sánh một lần gọi từ tiến trình mới: import lunarcalendar để đổi một ngày
+   so với `python -m calendar_core.client`.
+
+Thoát với mã lỗi nếu kết quả sai (so với calendar_core.lunar và
+calendar_core.export), nếu dịch vụ của app (trên AppKit giả) dùng chung LRU năm
+lễ với popover, p99 độ trễ vượt LATENCY_P99_BUDGET_MS, hoặc pipelining
+không nhanh hơn gửi từng yêu cầu ít nhất PIPELINE_MIN_SPEEDUP lần.
+
+Chạy: python benchmarks/bench_service.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from calendar_core.client import QueryClient, QueryError
+from calendar_core.export import month_dict
+from calendar_core.holidays import HolidayCalendar
+from calendar_core.layout import build_month_layout
+from calendar_core.lunar import convert_range, solar_to_lunar
+from calendar_core.service import MAX_BATCH, QueryServer, QueryService
+
+TODAY = date(2026, 2, 17)
+SEQUENTIAL = 2000
+PIPELINE_DEPTHS = (1, 16, 128)
+PIPELINE_REQUESTS = 20000
+CLIENT_THREADS = 4
+COLD_RUNS = 3
+
+LATENCY_P99_BUDGET_MS = 5.0
+# Client và server chạy cùng máy: khi chỉ có một lõi, phần tiết kiệm được chỉ là
+# số lần gọi hệ thống / chuyển ngữ cảnh, còn chi phí JSON mỗi dòng vẫn giữ nguyên
+PIPELINE_MIN_SPEEDUP = 1.5
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def check_answers(client, errors):
+    if client.lunar() != list(solar_to_lunar(TODAY.year, TODAY.month, TODAY.day)):
+        errors.append(f"lunar (hôm nay): {client.lunar()}")
+    if client.lunar("2023-04-19") != [2023, 2, 29, True]:
+        errors.append(f"lunar 2023-04-19 (tháng 2 nhuận): {client.lunar('2023-04-19')}")
+    days = [date(1900, 1, 31) + timedelta(days=97 * k) for k in range(700)]
+    expected = [list(solar_to_lunar(d.year, d.month, d.day)) for d in days]
+    if client.batch(days) != expected:
+        errors.append("batch khác calendar_core.lunar")
+    first = date(2024, 12, 1)
+    if client.range(first, 400) != [list(item) for item in convert_range(first.toordinal(), 400)]:
+        errors.append("range khác convert_range")
+    grid = client.month(2026, 2)
+    if grid != month_dict(build_month_layout(2026, 2, TODAY, HolidayCalendar())):
+        errors.append("month khác export.month_dict")
+    holidays = client.holidays("2026-01-01", "2026-12-31")
+    if ["2026-02-17", "Tết Nguyên Đán", "lunar", True] not in holidays or ["2026-09-02", "Quốc khánh", "solar", True] not in holidays:
+        errors.append(f"holidays 2026 thiếu Tết / Quốc khánh ({len(holidays)} mục)")
+    # Pipelining: lỗi ở giữa không làm lệch thứ tự các phản hồi sau
+    results = client.pipeline(["ping", "lunar 1800-01-01", "bogus", "lunar 2026-02-17", "range 2026-01-01 x"],
+                              raise_errors=False)
+    kinds = [type(result).__name__ if isinstance(result, QueryError) else result for result in results]
+    if kinds != ["pong", "QueryError", "QueryError", [2026, 1, 1, False], "QueryError"]:
+        errors.append(f"pipeline có lỗi xen giữa: {kinds}")
+
+
+def sequential_latency(client):
+    timings = []
+    for k in range(SEQUENTIAL):
+        day = (TODAY + timedelta(days=k)).isoformat()
+        start = time.perf_counter()
+        client.request(f"lunar {day}")
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def pipelined_throughput(client, depth):
+    lines = [f"lunar {(TODAY + timedelta(days=k % 3650)).isoformat()}" for k in range(PIPELINE_REQUESTS)]
+    start = time.perf_counter()
+    for offset in range(0, len(lines), depth):
+        client.pipeline(lines[offset:offset + depth])
+    return len(lines) / (time.perf_counter() - start)
+
+
+def concurrent_throughput(path):
+    per_thread = PIPELINE_REQUESTS // CLIENT_THREADS
+    failures = []
+
+    def worker():
+        try:
+            with QueryClient(path) as client:
+                lines = [f"lunar {(TODAY + timedelta(days=k)).isoformat()}" for k in range(per_thread)]
+                for offset in range(0, per_thread, 64):
+                    client.pipeline(lines[offset:offset + 64])
+        except Exception as e:
+            failures.append(str(e))
+
+    threads = [threading.Thread(target=worker) for _ in range(CLIENT_THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_thread * CLIENT_THREADS / (time.perf_counter() - start), failures
+
+
+def check_private_holidays(directory, errors):
+    """Dịch vụ app bật bằng --serve: truy vấn `holidays` nhiều năm không đẩy các năm
+    của popover ra khỏi HolidayCalendar của app."""
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    import run_suite
+
+    app = run_suite.load_app()
+    delegate = run_suite.make_delegate(app)
+    app_holidays = delegate.holidays
+    for year in range(TODAY.year - 1, TODAY.year + 2):
+        app_holidays.year_index(year)
+    before = list(app_holidays._years)
+    argv = sys.argv
+    sys.argv = ["menu_calendar.py", "--serve=" + os.path.join(directory, "app.sock")]
+    try:
+        server = app.start_query_service(delegate.day_cache)
+    finally:
+        sys.argv = argv
+    try:
+        server.service.handle_line(b"holidays 2000-01-01 2010-12-31")
+    finally:
+        server.stop()
+    if server.service.holidays is app_holidays or list(app_holidays._years) != before:
+        errors.append("truy vấn holidays dài đẩy các năm của app ra khỏi cache")
+
+
+def cold_call(argv, env):
+    timings = []
+    for _ in range(COLD_RUNS):
+        start = time.perf_counter()
+        result = subprocess.run(argv, cwd=ROOT, env=env, capture_output=True, text=True)
+        timings.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            return None, result.stderr.strip()
+    return statistics.median(timings), result.stdout.strip()
+
+
+def main():
+    errors = []
+    with tempfile.TemporaryDirectory() as directory:
+        check_private_holidays(directory, errors)
+        path = os.path.join(directory, "query.sock")
+        server = QueryServer(path, QueryService(today=lambda: TODAY)).start()
+        try:
+            with QueryClient(path) as client:
+                check_answers(client, errors)
+
+                timings = sequential_latency(client)
+                p50, p99 = percentile(timings, 0.5), percentile(timings, 0.99)
+                print(f"lunar từng yêu cầu: {SEQUENTIAL} lần, p50 {p50 * 1000:.0f} µs, p99 {p99 * 1000:.0f} µs")
+                if p99 > LATENCY_P99_BUDGET_MS:
+                    errors.append(f"p99 {p99:.2f} ms > {LATENCY_P99_BUDGET_MS} ms")
+
+                rates = {}
+                for depth in PIPELINE_DEPTHS:
+                    rates[depth] = pipelined_throughput(client, depth)
+                    print(f"pipeline độ sâu {depth:>4}: {rates[depth]:>9.0f} yêu cầu/giây")
+                speedup = max(rates[depth] for depth in PIPELINE_DEPTHS[1:]) / rates[1]
+                if speedup < PIPELINE_MIN_SPEEDUP:
+                    errors.append(f"pipelining chỉ nhanh gấp {speedup:.1f} lần (cần {PIPELINE_MIN_SPEEDUP})")
+
+                days = [date(1950, 1, 1) + timedelta(days=k) for k in range(MAX_BATCH)]
+                start = time.perf_counter()
+                client.batch(days)
+                elapsed = time.perf_counter() - start
+                print(f"batch {MAX_BATCH} ngày: {elapsed * 1000:.1f} ms ({MAX_BATCH / elapsed:.0f} ngày/giây)")
+
+            rate, failures = concurrent_throughput(path)
+            print(f"{CLIENT_THREADS} client song song: {rate:.0f} yêu cầu/giây")
+            errors.extend(f"client song song: {failure}" for failure in failures)
+
+            env = dict(os.environ, MENU_CALENDAR_SOCKET=path)
+            cold_import, output = cold_call([sys.executable, "-c", (
+                "from lunarcalendar import Converter, Solar; "
+                "l = Converter.Solar2Lunar(Solar(2026, 2, 17)); print(l.day, l.month, l.year)")], env)
+            cold_client, answer = cold_call([sys.executable, "-m", "calendar_core.client", "lunar", "2026-02-17"], env)
+            if cold_client is None:
+                errors.append(f"python -m calendar_core.client: {answer}")
+            else:
+                if answer != "1/1/2026":
+                    errors.append(f"python -m calendar_core.client in {answer!r}")
+                if cold_import is not None:
+                    print(f"tiến trình mới: import lunarcalendar {cold_import:.0f} ms, "
+                          f"calendar_core.client {cold_client:.0f} ms (trung vị {COLD_RUNS} lần)")
+                else:
+                    print(f"tiến trình mới: calendar_core.client {cold_client:.0f} ms (không có lunarcalendar: {output})")
+        finally:
+            server.stop()
+        if os.path.exists(path):
+            errors.append("stop() không xoá socket")
+
+    for error in errors:
+        print("LỖI:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Đo độ trễ khởi động của lõi: thời gian import, thời gian tới lần vẽ thanh
+menu đầu tiên, lần mở popover đầu tiên và RSS đỉnh.
+
+Mỗi lần đo chạy trong một tiến trình Python mới. Thoát với mã 1 nếu NumPy
+hoặc Pillow bị nạp trước lần vẽ đầu tiên, hoặc vượt ngân sách thời gian.
+Chạy: python benchmarks/bench_startup.py [--runs N] [--json out.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Ngân sách tính theo bội số thời gian chạy `python -c pass` đo trong cùng lần chạy
+# (trung vị), để máy chậm / đang bận không làm cổng kiểm tra chập chờn
+IMPORT_BUDGET_RATIO = 6.0
+FIRST_PAINT_BUDGET_RATIO = 8.0
+
+CHILD = r'''
+import time
+started = time.perf_counter()
+import json, os, resource, sys
+sys.path.insert(0, ROOT)
+
+# Các module lõi mà menu_calendar.py import khi khởi động
+import calendar_core.lunar, calendar_core.layout, calendar_core.cells
+import calendar_core.images, calendar_core.scheduler, calendar_core.logging_setup
+import calendar_core.holidays, calendar_core.ics, calendar_core.daycache
+imported = time.perf_counter()
+
+from datetime import datetime
+from calendar_core.images import DayImages, ImageBackend
+from calendar_core.layout import WEEKDAY_LABELS
+
+class BytesBackend(ImageBackend):
+    # Không giải mã ảnh: chỉ đo phần việc của lõi, không đo AppKit
+    def load_file(self, path):
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+    def slice_atlas(self, atlas, frame, scale):
+        return (atlas, frame)
+    def image_bytes(self, image):
+        return len(image[0]) if isinstance(image, tuple) else len(image)
+
+today = datetime.now()
+title = " " + WEEKDAY_LABELS[today.weekday()]
+icon = DayImages(BytesBackend(), os.path.join(ROOT, "images")).status_icon(today.day)
+painted = time.perf_counter()
+heavy_at_paint = sorted(m for m in ("numpy", "PIL", "lunarcalendar") if m in sys.modules)
+
+from calendar_core.layout import MonthLayoutCache
+MonthLayoutCache().get(today.year, today.month)
+popover = time.perf_counter()
+
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_kib = rss / 1024 if sys.platform == "darwin" else rss
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_paint_ms": (painted - started) * 1000,
+    "first_popover_ms": (popover - started) * 1000,
+    "peak_rss_kib": rss_kib,
+    "heavy_at_paint": heavy_at_paint,
+    "icon_found": icon is not None,
+}))
+'''
+
+
+def run_child():
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD.replace("ROOT", repr(ROOT))],
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output)
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def interpreter_baseline_ms():
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--json", help="Ghi kết quả trung vị ra file JSON")
+    args = parser.parse_args()
+
+    baseline = statistics.median(interpreter_baseline_ms() for _ in range(args.runs))
+    runs = [run_child() for _ in range(args.runs)]
+    summary = {key: statistics.median(run[key] for run in runs)
+               for key in ("import_ms", "first_paint_ms", "first_popover_ms", "peak_rss_kib", "process_ms")}
+    summary["interpreter_ms"] = baseline
+    heavy = sorted({name for run in runs for name in run["heavy_at_paint"]})
+
+    print(f"Interpreter trống:          {baseline:8.1f} ms")
+    print(f"Import lõi:                 {summary['import_ms']:8.1f} ms")
+    print(f"Vẽ thanh menu lần đầu:      {summary['first_paint_ms']:8.1f} ms")
+    print(f"Mở popover lần đầu:         {summary['first_popover_ms']:8.1f} ms (gồm nạp NumPy)")
+    print(f"Cả tiến trình:              {summary['process_ms']:8.1f} ms")
+    print(f"RSS đỉnh:                   {summary['peak_rss_kib'] / 1024:8.1f} MiB")
+    print(f"Module nặng lúc vẽ đầu:     {', '.join(heavy) or 'không có'}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    failures = []
+    if heavy:
+        failures.append(f"nạp sớm {', '.join(heavy)}")
+    import_budget = IMPORT_BUDGET_RATIO * baseline
+    paint_budget = FIRST_PAINT_BUDGET_RATIO * baseline
+    print(f"Ngân sách import / vẽ đầu:  {import_budget:8.1f} / {paint_budget:.1f} ms "
+          f"({IMPORT_BUDGET_RATIO:g}x / {FIRST_PAINT_BUDGET_RATIO:g}x interpreter trống)")
+    if summary["import_ms"] > import_budget:
+        failures.append(f"import vượt {import_budget:.0f} ms")
+    if summary["first_paint_ms"] > paint_budget:
+        failures.append(f"vẽ đầu vượt {paint_budget:.0f} ms")
+    for failure in failures:
+        print(f"LỖI: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
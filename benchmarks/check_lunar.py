@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Kiểm tra bảng âm lịch dựng sẵn (calendar_core/lunar.py) với lunarcalendar.
+
+So từng ngày từ 1/1/1900 tới 31/12/2100 (hoặc --first/--last): ordinal_to_lunar,
+convert_range, lunar_to_ordinal (chiều ngược lại) và lunar_np.ordinals_to_lunar,
+rồi kiểm tra tháng / năm âm ngoài khoảng bị từ chối bằng ValueError.
+Thoát với mã lỗi nếu có ngày lệch hoặc chưa cài lunarcalendar.
+Chạy: python benchmarks/check_lunar.py [--first 1900 --last 2100]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_core import lunar
+
+
+def check_numpy(first, last):
+    """Các ngày mà bản NumPy khác bản vòng lặp (bản vòng lặp đã được so với lunarcalendar)."""
+    from calendar_core import lunar_np
+
+    ordinals = range(first, last + 1)
+    days, months, years, leaps = lunar_np.ordinals_to_lunar(list(ordinals))
+    return [date.fromordinal(ordinal) for ordinal, y, m, d, leap in
+            zip(ordinals, years.tolist(), months.tolist(), days.tolist(), leaps.tolist())
+            if (y, m, d, leap) != lunar.ordinal_to_lunar(ordinal)]
+
+
+def check_rejects():
+    """Các lời gọi với tháng / năm ngoài khoảng mà không raise ValueError."""
+    leap_years = [year for year in range(lunar.FIRST_LUNAR_YEAR, lunar.LAST_LUNAR_YEAR + 1) if lunar.leap_month(year)]
+    calls = [(lunar.lunar_to_ordinal, (year, month, 1)) for year in (2020, 2023, leap_years[-1]) for month in (0, 13, 14)]
+    calls += [(lunar.lunar_to_ordinal, (2023, 14, 1, True)),
+              (lunar.lunar_to_ordinal, (lunar.FIRST_LUNAR_YEAR - 1, 1, 1)),
+              (lunar.lunar_to_ordinal, (lunar.LAST_LUNAR_YEAR + 1, 1, 1))]
+    calls += [(lunar.leap_month, (year,)) for year in (1800, lunar.FIRST_LUNAR_YEAR - 1, lunar.LAST_LUNAR_YEAR + 1)]
+    failures = []
+    for function, args in calls:
+        try:
+            result = function(*args)
+        except ValueError:
+            continue
+        except Exception as e:
+            failures.append(f"{function.__name__}{args} raise {type(e).__name__} thay vì ValueError")
+            continue
+        failures.append(f"{function.__name__}{args} trả về {result} thay vì ValueError")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--first", type=int, default=1900)
+    parser.add_argument("--last", type=int, default=2100)
+    args = parser.parse_args()
+    first = max(date(args.first, 1, 1).toordinal(), lunar.MIN_ORDINAL)
+    last = min(date(args.last, 12, 31).toordinal(), lunar.MAX_ORDINAL)
+
+    try:
+        import lunarcalendar  # noqa: F401
+    except ImportError:
+        print("LỖI: cần lunarcalendar để kiểm tra (pip install lunarcalendar)")
+        return 1
+
+    started = time.perf_counter()
+    mismatches = lunar.verify_against_lunarcalendar(first, last)
+    numpy_mismatches = check_numpy(first, last)
+    rejects = check_rejects()
+    print(f"Đã kiểm tra {last - first + 1} ngày ({date.fromordinal(first)} - {date.fromordinal(last)}) "
+          f"trong {time.perf_counter() - started:.1f} s: lệch lunarcalendar {len(mismatches)}, "
+          f"lệch NumPy {len(numpy_mismatches)}, đầu vào sai không bị từ chối {len(rejects)}")
+    for item in mismatches[:20]:
+        print("LỖI:", item)
+    for day in numpy_mismatches[:20]:
+        print("LỖI: lunar_np khác lunar ở", day)
+    for failure in rejects:
+        print("LỖI:", failure)
+    return 1 if mismatches or numpy_mismatches or rejects else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
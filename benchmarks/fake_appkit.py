@@ -0,0 +1,569 @@
+"""AppKit/Foundation/objc giả, chạy trong cùng tiến trình, ghi lại thao tác view.
+
+`install()` đặt các module giả vào sys.modules để `import menu_calendar`
+chạy được trên Linux. Như PyObjC, lớp con của ứng dụng bị từ chối khi số
+tham số của một phương thức không khớp số ":" trong selector suy ra từ tên
+(trừ khi có @objc.python_method). Mọi lời gọi phương thức Objective-C được đếm trong
+`STATS.ops`; số view đang gắn vào cây view, số timer còn sống và số đối
+tượng đã cấp phát được theo dõi để benchmark và soak test đọc.
+"""
+from collections import Counter
+import inspect
+import sys
+import types
+
+
+class Stats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ops = Counter()
+        self.allocations = Counter()
+        self.live_views = 0
+        self.live_timers = 0
+        self.live_observers = 0
+
+    @property
+    def total_ops(self):
+        return sum(self.ops.values())
+
+
+STATS = Stats()
+
+
+def _method_name(selector):
+    # intern: tên thuộc tính mới mỗi lần gọi sẽ bị cache thuộc tính của CPython
+    # giữ lại, trông như bộ nhớ tăng dần trong benchmarks/soak.py
+    return sys.intern(selector.replace(":", "_"))
+
+
+class RunLoop:
+    """Run loop giả: timer theo đồng hồ monotonic truyền vào và các lời gọi performSelector."""
+
+    def __init__(self):
+        self.clock = None
+        self.timers = []
+        self.pending = []
+
+    def now(self):
+        return self.clock.monotonic() if self.clock is not None else 0.0
+
+    def reset(self, clock=None):
+        self.clock = clock
+        self.timers = []
+        self.pending = []
+
+    def run_pending(self):
+        calls, self.pending = self.pending, []
+        for target, selector, argument in calls:
+            getattr(target, _method_name(selector))(argument)
+        return len(calls)
+
+    def next_fire(self):
+        live = [timer.fire_at for timer in self.timers if timer.valid]
+        return min(live) if live else None
+
+    def run_until(self, target):
+        """Chạy các timer đến hạn trước `target` (monotonic), tiến đồng hồ giả theo."""
+        fired = 0
+        while True:
+            self.run_pending()
+            due = [timer for timer in self.timers if timer.valid and timer.fire_at <= target]
+            if not due:
+                break
+            timer = min(due, key=lambda t: t.fire_at)
+            if self.clock is not None and timer.fire_at > self.clock.monotonic():
+                self.clock.advance(timer.fire_at - self.clock.monotonic())
+            timer.fire()
+            fired += 1
+        if self.clock is not None and target > self.clock.monotonic():
+            self.clock.advance(target - self.clock.monotonic())
+        self.timers = [timer for timer in self.timers if timer.valid]
+        return fired
+
+
+RUN_LOOP = RunLoop()
+
+
+def _recorder(owner, name, returns):
+    def method(*args, **kwargs):
+        STATS.ops[f"{owner}.{name}"] += 1
+        return returns
+    return method
+
+
+class FakeMeta(type):
+    # Phương thức lớp chưa khai báo (NSColor.systemOrangeColor()...) trả về một đối tượng mới
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def class_method(*args, **kwargs):
+            STATS.ops[f"{cls.__name__}.{name}"] += 1
+            return cls._new()
+        return class_method
+
+
+def _implied_selector(name, argcount):
+    """Selector PyObjC suy ra từ tên hàm: "_" thành ":" (giữ "_" ở đầu tên).
+
+    Như PyObjC, tên không kết thúc bằng "_" mà số ":" không khớp số tham số
+    thì được dùng nguyên dạng (không có ":").
+    """
+    stripped = name.lstrip("_")
+    selector = name[:len(name) - len(stripped)] + stripped.replace("_", ":")
+    if selector.count(":") != argcount and not name.endswith("_"):
+        selector = name
+    return selector
+
+
+def _check_selectors(cls):
+    # PyObjC báo objc.BadPrototypeError khi tạo lớp nếu số tham số Python khác số ":" của selector
+    for name, value in vars(cls).items():
+        if name.startswith("__") or not isinstance(value, types.FunctionType):
+            continue
+        if getattr(value, "__python_method__", False):
+            continue
+        code = value.__code__
+        argcount = code.co_argcount - 1
+        if code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS) or code.co_kwonlyargcount:
+            argcount = -1
+        selector = _implied_selector(name, argcount)
+        if selector.count(":") != argcount:
+            raise BadPrototypeError(f"{cls.__name__}.{name}: selector {selector!r} nhận {selector.count(':')} "
+                                    f"tham số, hàm Python nhận {argcount} (thiếu @objc.python_method?)")
+
+
+class BadPrototypeError(TypeError):
+    pass
+
+
+def _python_method(function):
+    function.__python_method__ = True
+    return function
+
+
+class FakeObject(metaclass=FakeMeta):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Chỉ kiểm tra lớp con của ứng dụng, không kiểm tra các lớp giả trong file này
+        if cls.__module__ != __name__:
+            _check_selectors(cls)
+
+    @classmethod
+    def _new(cls):
+        STATS.allocations[cls.__name__] += 1
+        return cls.__new__(cls)
+
+    @classmethod
+    def alloc(cls):
+        return cls._new()
+
+    @classmethod
+    def new(cls):
+        return cls._new().init()
+
+    def init(self):
+        return self
+
+    def performSelector_withObject_afterDelay_(self, selector, argument, delay):
+        STATS.ops[f"{type(self).__name__}.performSelector"] += 1
+        RUN_LOOP.pending.append((self, selector, argument))
+
+    def performSelectorOnMainThread_withObject_waitUntilDone_(self, selector, argument, wait):
+        # Có thể được gọi từ luồng nền: list.append là nguyên tử, run loop giả chạy ở luồng gọi run_pending
+        STATS.ops[f"{type(self).__name__}.performSelectorOnMainThread"] += 1
+        if wait:
+            getattr(self, _method_name(selector))(argument)
+        else:
+            RUN_LOOP.pending.append((self, selector, argument))
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        owner = type(self).__name__
+        if name.startswith("init"):
+            return _recorder(owner, name, self)
+        return _recorder(owner, name, None)
+
+
+NSObject = FakeObject
+
+
+class Size:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+
+class NSView(FakeObject):
+    def initWithFrame_(self, frame):
+        STATS.ops[f"{type(self).__name__}.initWithFrame_"] += 1
+        self._frame = frame
+        self._subviews = []
+        self._superview = None
+        return self
+
+    def init(self):
+        return self.initWithFrame_((0, 0, 0, 0))
+
+    def subviews(self):
+        return list(self.__dict__.get("_subviews", []))
+
+    def addSubview_(self, view):
+        STATS.ops["NSView.addSubview_"] += 1
+        self.__dict__.setdefault("_subviews", []).append(view)
+        if view.__dict__.get("_superview") is None:
+            STATS.live_views += 1
+        view._superview = self
+
+    def removeFromSuperview(self):
+        STATS.ops["NSView.removeFromSuperview"] += 1
+        parent = self.__dict__.get("_superview")
+        if parent is not None:
+            parent._subviews.remove(self)
+            self._superview = None
+            STATS.live_views -= 1
+
+    def bounds(self):
+        return self.__dict__.get("_frame")
+
+    def window(self):
+        if "_window" not in self.__dict__:
+            self._window = NSWindow._new()
+        return self._window
+
+
+class NSTextField(NSView):
+    pass
+
+
+class NSButton(NSView):
+    pass
+
+
+class NSAttributedString(FakeObject):
+    def initWithString_attributes_(self, text, attributes=None):
+        STATS.ops["NSAttributedString.initWithString_attributes_"] += 1
+        self._text = text
+        return self
+
+    def initWithString_(self, text):
+        return self.initWithString_attributes_(text)
+
+    def initWithAttributedString_(self, other):
+        STATS.ops[f"{type(self).__name__}.initWithAttributedString_"] += 1
+        self._text = other.__dict__.get("_text", "")
+        return self
+
+    @classmethod
+    def attributedStringWithAttachment_(cls, attachment):
+        STATS.ops["NSAttributedString.attributedStringWithAttachment_"] += 1
+        return cls._new().initWithString_attributes_("￼")
+
+    def appendAttributedString_(self, other):
+        STATS.ops["NSMutableAttributedString.appendAttributedString_"] += 1
+        self._text = self.__dict__.get("_text", "") + other.__dict__.get("_text", "")
+
+    def length(self):
+        return len(self.__dict__.get("_text", ""))
+
+    def size(self):
+        return Size(7.0 * self.length(), 14.0)
+
+
+class NSMutableAttributedString(NSAttributedString):
+    pass
+
+
+class NSBitmapImageRep(FakeObject):
+    pass
+
+
+class NSGraphicsContext(FakeObject):
+    pass
+
+
+class NSImage(FakeObject):
+    def initWithSize_(self, size):
+        STATS.ops["NSImage.initWithSize_"] += 1
+        self._size = size
+        return self
+
+    def initWithContentsOfFile_(self, path):
+        STATS.ops["NSImage.initWithContentsOfFile_"] += 1
+        self._size = Size(20, 20)
+        return self
+
+    def size(self):
+        return self.__dict__.get("_size", Size(0, 0))
+
+
+class NSTimer(FakeObject):
+    @classmethod
+    def scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(cls, interval, target, selector, info, repeats):
+        STATS.ops["NSTimer.scheduledTimer"] += 1
+        timer = cls._new()
+        timer.interval = interval
+        timer.fire_at = RUN_LOOP.now() + interval
+        timer.target = target
+        timer.selector = selector
+        timer.repeats = repeats
+        timer.valid = True
+        STATS.live_timers += 1
+        RUN_LOOP.timers.append(timer)
+        return timer
+
+    def invalidate(self):
+        STATS.ops["NSTimer.invalidate"] += 1
+        if self.valid:
+            self.valid = False
+            STATS.live_timers -= 1
+            # Như run loop thật: timer đã huỷ không còn được giữ lại
+            try:
+                RUN_LOOP.timers.remove(self)
+            except ValueError:
+                pass
+
+    def fire(self):
+        selector = self.selector
+        method = getattr(self.target, _method_name(selector))
+        if not self.repeats:
+            self.invalidate()
+        else:
+            self.fire_at += self.interval
+        if selector.endswith(":"):
+            method(self)
+        else:
+            method()
+
+
+class NSPopover(FakeObject):
+    def init(self):
+        self._shown = False
+        self._controller = None
+        return self
+
+    def isShown(self):
+        return self._shown
+
+    def showRelativeToRect_ofView_preferredEdge_(self, rect, view, edge):
+        STATS.ops["NSPopover.show"] += 1
+        self._shown = True
+
+    def close(self):
+        STATS.ops["NSPopover.close"] += 1
+        self._shown = False
+
+    def setContentViewController_(self, controller):
+        self._controller = controller
+
+    def contentViewController(self):
+        return self._controller
+
+
+class NSViewController(FakeObject):
+    def initWithNibName_bundle_(self, name, bundle):
+        self._view = None
+        return self
+
+    def setView_(self, view):
+        STATS.ops["NSViewController.setView_"] += 1
+        self._view = view
+
+    def view(self):
+        return self._view
+
+
+class NSWindow(FakeObject):
+    pass
+
+
+class NSStatusBarButton(NSButton):
+    def window(self):
+        return NSWindow._new()
+
+
+class NSStatusItem(FakeObject):
+    def button(self):
+        if "_button" not in self.__dict__:
+            self._button = NSStatusBarButton.alloc().initWithFrame_((0, 0, 24, 22))
+        return self._button
+
+
+class NSStatusBar(FakeObject):
+    @classmethod
+    def systemStatusBar(cls):
+        return cls._new()
+
+    def statusItemWithLength_(self, length):
+        return NSStatusItem._new()
+
+
+class NSScreen(FakeObject):
+    @classmethod
+    def mainScreen(cls):
+        return cls._new()
+
+    def backingScaleFactor(self):
+        return 2.0
+
+
+class NSAppearance(FakeObject):
+    def bestMatchFromAppearancesWithNames_(self, names):
+        return names[0]
+
+
+class NSApplication(FakeObject):
+    _shared = None
+
+    @classmethod
+    def sharedApplication(cls):
+        if cls._shared is None:
+            cls._shared = cls._new()
+        return cls._shared
+
+    def effectiveAppearance(self):
+        return NSAppearance._new()
+
+
+class NSNotificationCenter(FakeObject):
+    _default = None
+
+    @classmethod
+    def defaultCenter(cls):
+        if cls.__dict__.get("_default") is None:
+            cls._default = cls._new()
+            cls._default._observers = []
+        return cls._default
+
+    def addObserver_selector_name_object_(self, observer, selector, name, obj):
+        STATS.ops[f"{type(self).__name__}.addObserver"] += 1
+        self.__dict__.setdefault("_observers", []).append((observer, selector, name))
+        STATS.live_observers += 1
+
+    def removeObserver_(self, observer):
+        observers = self.__dict__.setdefault("_observers", [])
+        kept = [entry for entry in observers if entry[0] is not observer]
+        STATS.live_observers -= len(observers) - len(kept)
+        self._observers = kept
+
+    def post(self, name):
+        """Gửi thông báo giả tới các observer đăng ký tên `name`."""
+        note = Notification(name)
+        for observer, selector, observed in list(self.__dict__.get("_observers", [])):
+            if observed == name:
+                selector(note)
+
+
+class NSDistributedNotificationCenter(NSNotificationCenter):
+    _default = None
+
+
+class NSWorkspace(FakeObject):
+    _shared = None
+
+    @classmethod
+    def sharedWorkspace(cls):
+        if cls._shared is None:
+            cls._shared = cls._new()
+            cls._shared._center = NSNotificationCenter._new()
+        return cls._shared
+
+    def notificationCenter(self):
+        return self._center
+
+
+class Notification:
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class NSDictionary(FakeObject):
+    pass
+
+
+class NSColor(FakeObject):
+    pass
+
+
+class NSFont(FakeObject):
+    pass
+
+
+class NSTextAttachment(FakeObject):
+    pass
+
+
+class NSMutableParagraphStyle(FakeObject):
+    pass
+
+
+class NSBezierPath(FakeObject):
+    pass
+
+
+class NSMenu(FakeObject):
+    pass
+
+
+class NSMenuItem(FakeObject):
+    pass
+
+
+def NSMakeRect(x, y, w, h):
+    return (x, y, w, h)
+
+
+def NSMakePoint(x, y):
+    return (x, y)
+
+
+def NSSize(w, h):
+    return Size(w, h)
+
+
+_CLASSES = {cls.__name__: cls for cls in (
+    NSView, NSTextField, NSButton, NSAttributedString, NSMutableAttributedString, NSImage, NSTimer,
+    NSPopover, NSViewController, NSStatusBar, NSScreen, NSApplication, NSNotificationCenter,
+    NSDistributedNotificationCenter, NSWorkspace, NSDictionary, NSColor, NSFont, NSTextAttachment,
+    NSMutableParagraphStyle, NSBezierPath, NSMenu, NSMenuItem, NSBitmapImageRep, NSGraphicsContext,
+)}
+
+
+def _lookup_class(name):
+    return _CLASSES[name]
+
+
+def install():
+    """Đăng ký các module objc, AppKit, Foundation giả vào sys.modules."""
+    objc = types.ModuleType("objc")
+    objc.super = super
+    objc.selector = lambda function, signature=None, **kwargs: function
+    objc.python_method = _python_method
+    objc.BadPrototypeError = BadPrototypeError
+    objc.lookUpClass = _lookup_class
+
+    appkit = types.ModuleType("AppKit")
+    for name, cls in _CLASSES.items():
+        setattr(appkit, name, cls)
+    for name, value in (("NSMakeRect", NSMakeRect), ("NSMakePoint", NSMakePoint), ("NSSize", NSSize),
+                        ("NSRoundedBezelStyle", 1), ("NSCenterTextAlignment", 2),
+                        ("NSCompositingOperationCopy", 1),
+                        ("NSWorkspaceDidWakeNotification", "NSWorkspaceDidWakeNotification")):
+        setattr(appkit, name, value)
+
+    foundation = types.ModuleType("Foundation")
+    foundation.NSObject = NSObject
+    for name in ("NSAttributedString", "NSDictionary", "NSNotificationCenter", "NSDistributedNotificationCenter"):
+        setattr(foundation, name, _CLASSES[name])
+    foundation.NSSystemClockDidChangeNotification = "NSSystemClockDidChangeNotification"
+    foundation.NSSystemTimeZoneDidChangeNotification = "NSSystemTimeZoneDidChangeNotification"
+
+    sys.modules["objc"] = objc
+    sys.modules["AppKit"] = appkit
+    sys.modules["Foundation"] = foundation
@@ -0,0 +1,102 @@
+"""Các backend giả để chạy lõi giao diện trên Linux, không cần AppKit."""
+from calendar_core.cells import CellBackend
+
+
+class FakeCellBackend(CellBackend):
+    """Ghi lại số view được tạo và số thuộc tính được ghi."""
+
+    def __init__(self):
+        self.allocations = 0
+        self.writes = 0
+        self.views = []
+
+    def create_cell(self, index):
+        self.allocations += 1
+        view = {"index": index}
+        self.views.append(view)
+        return view
+
+    def update(self, view, state, changed):
+        for name in changed:
+            view[name] = getattr(state, name)
+        self.writes += len(changed)
+
+
+class FakeClock:
+    """Đồng hồ giả: giờ hệ thống và monotonic tách rời, múi giờ đổi được.
+
+    Khi máy ngủ, giờ hệ thống vẫn chạy còn monotonic (như mach_absolute_time
+    mà NSTimer dùng) thì đứng yên.
+    """
+
+    def __init__(self, start, tz):
+        self.tz = tz
+        self._time = start.replace(tzinfo=tz).timestamp()
+        self._monotonic = 1000.0
+
+    def monotonic(self):
+        return self._monotonic
+
+    def time(self):
+        return self._time
+
+    def local_datetime(self, timestamp=None):
+        from datetime import datetime
+        return datetime.fromtimestamp(self._time if timestamp is None else timestamp, self.tz).replace(tzinfo=None)
+
+    def local_timestamp(self, naive):
+        return naive.replace(tzinfo=self.tz).timestamp()
+
+    def advance(self, seconds):
+        self._time += seconds
+        self._monotonic += seconds
+
+    def sleep(self, seconds):
+        self._time += seconds
+
+    def set_wall_time(self, timestamp):
+        self._time = timestamp
+
+
+class FakeTimers:
+    """Timer giả chạy theo FakeClock.monotonic()."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self._timers = {}
+        self._next_id = 0
+        self.armed_total = 0
+
+    def arm(self, delay, callback):
+        self._next_id += 1
+        self._timers[self._next_id] = (self.clock.monotonic() + delay, callback)
+        self.armed_total += 1
+        return self._next_id
+
+    def cancel(self, handle):
+        self._timers.pop(handle, None)
+
+    @property
+    def live(self):
+        return len(self._timers)
+
+    def next_deadline(self):
+        return min((deadline for deadline, _ in self._timers.values()), default=None)
+
+    def run_until(self, monotonic_target):
+        """Chạy tất cả timer đến hạn trước `monotonic_target`, tiến đồng hồ theo."""
+        fired = 0
+        while True:
+            due = [(deadline, handle) for handle, (deadline, _) in self._timers.items() if deadline <= monotonic_target]
+            if not due:
+                break
+            deadline, handle = min(due)
+            _, callback = self._timers.pop(handle)
+            self.clock.advance(max(0.0, deadline - self.clock.monotonic()))
+            callback()
+            fired += 1
+        self.clock.advance(max(0.0, monotonic_target - self.clock.monotonic()))
+        return fired
+
+    def run_for(self, seconds):
+        return self.run_until(self.clock.monotonic() + seconds)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Bộ benchmark cho các đường nóng của Menu Calendar, chạy headless với AppKit giả.
+
+Đo phân bố độ trễ (p50/p90/p99), cấp phát bộ nhớ (tracemalloc) và số thao
+tác view giả cho: updateCalendarUI, prevMonth_/nextMonth_,
+updateStatusBar, kiểm tra ngày của RefreshScheduler (như khi wake / mở khoá),
+date_did_change (đường nửa đêm), đổi âm lịch và vẽ icon.
+
+So sánh với baseline JSON (benchmarks/baseline.json) và thoát với mã 1 nếu
+có chỉ số vượt ngưỡng. Số thao tác view và số byte cấp phát luôn được so;
+độ trễ chỉ được so khi baseline được ghi trên cùng máy/phiên bản Python.
+
+Chạy: python benchmarks/run_suite.py [--save-baseline] [--baseline PATH] [--only NAME]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+import fake_appkit
+from calendar_core.render import InlineExecutor
+
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+# Ngưỡng hồi quy so với baseline (độ trễ trên máy dùng chung dao động tới ~2 lần)
+LATENCY_TOLERANCE = 1.0
+ALLOCATION_TOLERANCE = 0.25
+OPS_TOLERANCE = 0.10
+ROUNDS = 3
+
+
+def load_app():
+    """Import menu_calendar trên AppKit giả, log, thư mục .ics và file cache ngày trỏ vào thư mục tạm."""
+    os.environ.setdefault("MENU_CALENDAR_LOG_DIR", tempfile.mkdtemp(prefix="menu_calendar_bench_"))
+    os.environ.setdefault("MENU_CALENDAR_ICS_DIR", tempfile.mkdtemp(prefix="menu_calendar_ics_"))
+    os.environ.setdefault("MENU_CALENDAR_CACHE_DIR", tempfile.mkdtemp(prefix="menu_calendar_cache_"))
+    fake_appkit.install()
+    import menu_calendar
+    # Tính bố cục ngay trên luồng gọi để số liệu ổn định; kết quả vẫn đi qua run loop giả như app thật
+    menu_calendar.make_render_executor = InlineExecutor
+    return menu_calendar
+
+
+def make_delegate(app):
+    delegate = app.CalendarAppDelegate.alloc().init()
+    delegate.togglePopover_(delegate.status_item.button())
+    return delegate
+
+
+def case_update_calendar_ui(app, delegate):
+    view = delegate.calendar_view
+    return view.updateCalendarUI
+
+
+def case_navigate(app, delegate):
+    view = delegate.calendar_view
+    state = {"step": 0}
+
+    def step():
+        # Tới 6 tháng rồi lùi 6 tháng, chạy prefetch như run loop thật
+        if state["step"] % 12 < 6:
+            view.nextMonth_(None)
+        else:
+            view.prevMonth_(None)
+        fake_appkit.RUN_LOOP.run_pending()
+        state["step"] += 1
+    return step
+
+
+def case_navigate_far(app, delegate):
+    view = delegate.calendar_view
+    state = {"step": 0}
+
+    def step():
+        # Nhảy qua nhiều năm trong 1950-2099: luôn trượt cache bố cục
+        state["step"] += 1
+        view.current_year = 1950 + state["step"] * 7 % 150
+        view.nextMonth_(None)
+        # Áp dụng kết quả vẽ (và tính sẵn hai tháng kề) như run loop thật
+        fake_appkit.RUN_LOOP.run_pending()
+    return step
+
+
+def case_update_status_bar(app, delegate):
+    return delegate.updateStatusBar
+
+
+def case_refresh_check(app, delegate):
+    return delegate.refresh_scheduler.check_now
+
+
+def case_date_did_change(app, delegate):
+    from datetime import date, timedelta
+    today = date.today()
+    state = {"day": 0}
+
+    def step():
+        # Xen kẽ hôm nay / ngày mai: mỗi lần là một lần đổi ngày thật
+        state["day"] ^= 1
+        delegate.date_did_change(today + timedelta(days=state["day"]))
+    return step
+
+
+def case_lunar_month(app, delegate):
+    from calendar_core.lunar import month_lunar
+    state = {"month": 0}
+
+    def step():
+        state["month"] += 1
+        month_lunar(1950 + state["month"] // 12 % 150, state["month"] % 12 + 1)
+    return step
+
+
+def case_icon_render(app, delegate):
+    try:
+        sys.path.insert(0, os.path.join(ROOT, "images"))
+        from generate_calendar_day_png import MENUBAR_POINTS, find_font, render_day_icon
+    except ImportError:
+        return None
+    font = find_font()
+    state = {"day": 0}
+
+    def step():
+        state["day"] = state["day"] % 31 + 1
+        render_day_icon(state["day"], MENUBAR_POINTS * 2, font)
+    return step
+
+
+CASES = {
+    "updateCalendarUI": (case_update_calendar_ui, 300),
+    "navigate": (case_navigate, 300),
+    "navigate_far": (case_navigate_far, 100),
+    "updateStatusBar": (case_update_status_bar, 500),
+    "refresh_check": (case_refresh_check, 500),
+    "date_did_change": (case_date_did_change, 300),
+    "lunar_month": (case_lunar_month, 2000),
+    "icon_render": (case_icon_render, 100),
+}
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run_case(app, name, factory, iterations):
+    delegate = make_delegate(app)
+    step = factory(app, delegate)
+    if step is None:
+        return None
+    for _ in range(min(20, iterations)):
+        step()
+
+    # Lượt 1: độ trễ, không bật tracemalloc; lấy vòng có p50 thấp nhất để bớt nhiễu
+    ops_before = fake_appkit.STATS.total_ops
+    samples = None
+    for _ in range(ROUNDS):
+        round_samples = []
+        for _ in range(iterations):
+            start = time.perf_counter_ns()
+            step()
+            round_samples.append((time.perf_counter_ns() - start) / 1000)
+        round_samples.sort()
+        if samples is None or percentile(round_samples, 0.5) < percentile(samples, 0.5):
+            samples = round_samples
+    ops = (fake_appkit.STATS.total_ops - ops_before) / (iterations * ROUNDS)
+
+    # Lượt 2: cấp phát bộ nhớ
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(iterations):
+        step()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_us": percentile(samples, 0.50),
+        "p90_us": percentile(samples, 0.90),
+        "p99_us": percentile(samples, 0.99),
+        "max_us": samples[-1],
+        "mean_us": statistics.fmean(samples),
+        "view_ops_per_call": ops,
+        "alloc_peak_bytes": peak - before,
+        "alloc_retained_bytes": after - before,
+    }
+
+
+def calibrate():
+    """Thời gian (µs) của một vòng Python cố định, dùng để chuẩn hoá độ trễ giữa các lần chạy."""
+    best = float("inf")
+    for _ in range(7):
+        start = time.perf_counter_ns()
+        total = 0
+        for i in range(20000):
+            total += i % 7
+        best = min(best, (time.perf_counter_ns() - start) / 1000)
+    return best
+
+
+def host_key():
+    return f"{platform.node()}|{platform.machine()}|{platform.python_version()}"
+
+
+def compare(results, baseline, results_calibration, latency_tolerance=LATENCY_TOLERANCE):
+    failures = []
+    same_host = baseline.get("host") == host_key()
+    for name, current in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if not base or not current:
+            continue
+        if current["view_ops_per_call"] > base["view_ops_per_call"] * (1 + OPS_TOLERANCE) + 0.5:
+            failures.append(f"{name}: thao tác view {current['view_ops_per_call']:.1f} > baseline {base['view_ops_per_call']:.1f}")
+        limit = base["alloc_peak_bytes"] * (1 + ALLOCATION_TOLERANCE) + 4096
+        if current["alloc_peak_bytes"] > limit:
+            failures.append(f"{name}: cấp phát đỉnh {current['alloc_peak_bytes']} B > {limit:.0f} B")
+        # So độ trễ đã chuẩn hoá theo vòng hiệu chuẩn để bớt phụ thuộc tải máy
+        scale = max(1.0, results_calibration / baseline.get("calibration_us", results_calibration))
+        if same_host and current["p50_us"] > base["p50_us"] * scale * (1 + latency_tolerance):
+            failures.append(f"{name}: p50 {current['p50_us']:.1f} µs > baseline {base['p50_us']:.1f} µs "
+                            f"(x{scale:.2f} theo hiệu chuẩn)")
+    if not same_host:
+        print("(baseline ghi trên máy khác: bỏ qua so sánh độ trễ)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless cho Menu Calendar")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Ghi kết quả lần chạy này làm baseline")
+    parser.add_argument("--json", help="Ghi kết quả ra file JSON")
+    parser.add_argument("--only", action="append", help="Chỉ chạy case có tên này (lặp lại được)")
+    parser.add_argument("--latency-tolerance", type=float, default=LATENCY_TOLERANCE,
+                        help="Tỉ lệ tăng p50 cho phép so với baseline (mặc định %(default)s)")
+    args = parser.parse_args()
+
+    app = load_app()
+    calibration = calibrate()
+    results = {}
+    print(f"{'case':<24}{'p50 µs':>10}{'p90 µs':>10}{'p99 µs':>10}{'ops/lần':>10}{'alloc đỉnh':>12}")
+    for name, (factory, iterations) in CASES.items():
+        if args.only and name not in args.only:
+            continue
+        result = run_case(app, name, factory, iterations)
+        results[name] = result
+        if result is None:
+            print(f"{name:<24}{'bỏ qua':>10}")
+            continue
+        print(f"{name:<24}{result['p50_us']:>10.1f}{result['p90_us']:>10.1f}{result['p99_us']:>10.1f}"
+              f"{result['view_ops_per_call']:>10.1f}{result['alloc_peak_bytes'] / 1024:>10.1f}Ki")
+
+    report = {"host": host_key(), "calibration_us": (calibration + calibrate()) / 2, "cases": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Đã lưu baseline vào {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except OSError:
+        print("Chưa có baseline, chạy với --save-baseline để tạo")
+        return 0
+    failures = compare(results, baseline, report["calibration_us"], args.latency_tolerance)
+    for failure in failures:
+        print(f"HỒI QUY: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Mô phỏng nhiều tuần chạy RefreshScheduler với đồng hồ giả.
+
+Kiểm tra số lần thức dậy, việc sang ngày đúng lúc qua giờ mùa hè, giấc ngủ
+dài, đổi múi giờ và chỉnh giờ hệ thống. Thoát với mã 1 nếu có sai lệch.
+Chạy: python benchmarks/sim_scheduler.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_core.scheduler import RefreshScheduler
+from fakes import FakeClock, FakeTimers
+
+# Giới hạn thức dậy mỗi ngày (hạn chót nửa đêm + lưới an toàn 6 giờ)
+MAX_WAKEUPS_PER_DAY = 5
+
+
+class Recorder:
+    def __init__(self, clock):
+        self.clock = clock
+        self.events = []
+
+    def __call__(self, today):
+        self.events.append((today, self.clock.local_datetime()))
+
+
+def make(start, tz_name):
+    clock = FakeClock(start, ZoneInfo(tz_name))
+    timers = FakeTimers(clock)
+    recorder = Recorder(clock)
+    scheduler = RefreshScheduler(clock, timers, recorder)
+    scheduler.start()
+    return clock, timers, recorder, scheduler
+
+
+def check(name, condition, failures):
+    print(f"  [{'OK' if condition else 'LỖI'}] {name}")
+    if not condition:
+        failures.append(name)
+
+
+def scenario_weeks(start, tz_name, days, failures):
+    clock, timers, recorder, scheduler = make(start, tz_name)
+    timers.run_for(days * 86400)
+    dates = [today for today, _ in recorder.events]
+    expected = [start.date() + timedelta(days=i) for i in range(1, len(dates) + 1)]
+    late = [wall for _, wall in recorder.events if not (wall.hour == 0 and wall.minute == 0 and wall.second <= 5)]
+    print(f"{tz_name} từ {start:%Y-%m-%d}, {days} ngày: {scheduler.wakeups} lần thức, {scheduler.refreshes} lần sang ngày")
+    check("sang ngày đủ và đúng thứ tự", dates == expected and len(dates) >= days - 1, failures)
+    check("mỗi lần sang ngày trong 5 giây sau nửa đêm", not late, failures)
+    check(f"<= {MAX_WAKEUPS_PER_DAY} lần thức/ngày", scheduler.wakeups <= MAX_WAKEUPS_PER_DAY * days, failures)
+    check("luôn đúng một timer", timers.live == 1, failures)
+
+
+def scenario_sleep_and_pokes(failures):
+    clock, timers, recorder, scheduler = make(datetime(2025, 9, 13, 21, 30), "Asia/Ho_Chi_Minh")
+    rng = random.Random(7)
+    print("Ngủ/thức ngẫu nhiên 30 ngày, mỗi lần thức gửi 3 thông báo trùng")
+    pokes = 0
+    for _ in range(120):
+        timers.run_for(rng.uniform(600, 8 * 3600))
+        clock.sleep(rng.uniform(60, 14 * 3600))
+        for reason in ("wake", "screenIsUnlocked", "wake"):
+            scheduler.poke(reason)
+            pokes += 1
+        timers.run_for(0)
+    dates = [today for today, _ in recorder.events]
+    check("không sang ngày trùng lặp", len(dates) == len(set(dates)), failures)
+    check("ngày cuối khớp đồng hồ", scheduler.last_date == clock.local_datetime().date(), failures)
+    check("các poke trùng được gộp", scheduler.coalesced == pokes * 2 // 3, failures)
+    check("luôn đúng một timer", timers.live == 1, failures)
+
+
+def scenario_timezone_and_clock(failures):
+    clock, timers, recorder, scheduler = make(datetime(2025, 9, 13, 23, 0), "Asia/Ho_Chi_Minh")
+    print("Đổi múi giờ và chỉnh giờ hệ thống")
+    # 23:00 Hà Nội = 16:00 cùng ngày ở Paris: ngày không đổi, chỉ hẹn lại
+    clock.tz = ZoneInfo("Europe/Paris")
+    scheduler.poke("timezone")
+    timers.run_for(0)
+    check("đổi múi giờ không đổi ngày thì không làm mới", not recorder.events, failures)
+    timers.run_for(8 * 3600 + 10)
+    check("sang ngày theo nửa đêm Paris", recorder.events[-1][0] == datetime(2025, 9, 14).date()
+          and recorder.events[-1][1].hour == 0, failures)
+    clock.set_wall_time(clock.time() + 3 * 86400)
+    scheduler.poke("clock")
+    scheduler.poke("clock")
+    timers.run_for(0)
+    check("chỉnh giờ tiến 3 ngày làm mới ngay một lần", [e[0] for e in recorder.events][-1] == datetime(2025, 9, 17).date()
+          and scheduler.refreshes == 2, failures)
+
+
+def main():
+    failures = []
+    started = time.perf_counter()
+    scenario_weeks(datetime(2025, 3, 15, 9, 0), "Europe/Berlin", 42, failures)
+    scenario_weeks(datetime(2025, 10, 1, 9, 0), "America/New_York", 42, failures)
+    scenario_weeks(datetime(2025, 1, 1, 9, 0), "Asia/Ho_Chi_Minh", 365, failures)
+    scenario_sleep_and_pokes(failures)
+    scenario_timezone_and_clock(failures)
+    print(f"Xong trong {(time.perf_counter() - started) * 1000:.0f} ms, {len(failures)} lỗi")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""Soak test: chạy menu_calendar nhiều tuần với đồng hồ giả và AppKit giả, nén trong vài giây.
+
+Mô phỏng theo từng phút (run loop giả chạy mọi timer đến hạn), xen kẽ:
+mở / đóng popover, chuyển tháng ngẫu nhiên, mở khoá màn hình, máy ngủ qua
+đêm rồi thức dậy, thông báo đổi giờ / múi giờ và các lần sang ngày lúc nửa
+đêm. `datetime.now()` và SystemClock của app được thay bằng FakeClock.
+
+Cuối mỗi ngày giả lấy mẫu: số timer còn sống, số view trong cây view, số
+observer, số luồng, cache bố cục / ảnh, bộ nhớ Python (tracemalloc, sau
+gc) và số byte log đã ghi. Thoát với mã lỗi nếu:
+
+* số timer / view / observer / luồng, hay số view được cấp phát mới,
+  thay đổi sau ngày khởi động;
+* bộ nhớ tăng quá MEMORY_GROWTH_BUDGET từ sau khởi động, hoặc nửa sau
+  tăng quá một nửa ngân sách đó (rò rỉ thì tăng đều theo ngày);
+* số byte log mỗi ngày ở nửa sau lớn hơn LOG_GROWTH_FACTOR lần nửa đầu,
+  hoặc dung lượng thư mục log vượt giới hạn xoay vòng;
+* có ngày bị bỏ lỡ / ô "hôm nay" không khớp ngày giả, hoặc app ghi log lỗi.
+
+Chạy: python benchmarks/soak.py [--days N] [--seed S]
+"""
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, time as dt_time, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import fake_appkit
+from fakes import FakeClock
+from run_suite import load_app
+
+START = datetime(2026, 1, 25, 8, 0)
+TIME_ZONE = "Asia/Ho_Chi_Minh"
+DEFAULT_DAYS = 35
+WARMUP_DAYS = 3
+
+# Số lần mỗi loại sự kiện trong một ngày giả (trung bình)
+POPOVER_OPENS_PER_DAY = 24
+UNLOCKS_PER_DAY = 4
+MAX_NAVIGATION_PER_OPEN = 8
+SLEEP_PROBABILITY = 0.6
+
+MEMORY_GROWTH_BUDGET = 64 * 1024
+LOG_GROWTH_FACTOR = 1.5
+LOG_SLACK_BYTES = 64 * 1024
+
+# Các lớp view của popover: số lần cấp phát phải đứng yên sau lần mở đầu tiên
+VIEW_CLASSES = ("NSView", "NSTextField", "NSButton", "ClickableTextField", "ClickableDayLabel", "CalendarView")
+
+
+class SoakDatetime(datetime):
+    """`datetime` của app, trả về giờ của FakeClock."""
+
+    clock = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.clock.local_datetime()
+
+
+class LogMeter(logging.Filter):
+    """Đếm số byte log thực sự đi vào hàng đợi (sau bộ lọc giới hạn tần suất)."""
+
+    def __init__(self, formatter):
+        super().__init__()
+        self.formatter = formatter
+        self.bytes = 0
+        self.records = 0
+        self.errors = []
+
+    def filter(self, record):
+        self.records += 1
+        # Chỉ giữ vài thông báo đầu, tự bộ đo không được làm tăng bộ nhớ
+        if record.levelno >= logging.ERROR and len(self.errors) < 5:
+            self.errors.append(record.getMessage())
+        self.bytes += len(self.formatter.format(record).encode("utf-8")) + 1
+        return True
+
+
+def install_clock(app, clock):
+    SoakDatetime.clock = clock
+    app.datetime = SoakDatetime
+    app.SystemClock = lambda: clock
+    fake_appkit.RUN_LOOP.reset(clock)
+
+    from calendar_core.logging_setup import RateLimitFilter
+
+    file_handler = app.LOG_LISTENER.handlers[0]
+    meter = LogMeter(file_handler.formatter)
+    for handler in logging.getLogger().handlers:
+        for log_filter in handler.filters:
+            if isinstance(log_filter, RateLimitFilter):
+                # Cửa sổ giới hạn tần suất phải trôi theo giờ giả, không theo giờ thật
+                log_filter.clock = clock.monotonic
+        # Đặt sau bộ lọc tần suất: chỉ đếm bản ghi được ghi ra file
+        handler.addFilter(meter)
+    return meter, file_handler
+
+
+class Soak:
+    def __init__(self, app, clock, rng):
+        self.app = app
+        self.clock = clock
+        self.rng = rng
+        self.delegate = app.CalendarAppDelegate.alloc().init()
+        self.button = self.delegate.status_item.button()
+        self.counts = {"ticks": 0, "opens": 0, "navigations": 0, "unlocks": 0, "sleeps": 0, "notifications": 0}
+        self.errors = []
+
+    def run_minutes(self, minutes):
+        for _ in range(minutes):
+            fake_appkit.RUN_LOOP.run_until(self.clock.monotonic() + 60)
+            self.counts["ticks"] += 1
+
+    def open_popover(self):
+        self.delegate.togglePopover_(self.button)
+        self.counts["opens"] += 1
+        view = self.delegate.calendar_view
+        for _ in range(self.rng.randrange(MAX_NAVIGATION_PER_OPEN + 1)):
+            action = self.rng.choice((view.prevMonth_, view.nextMonth_, view.nextMonth_, view.currentMonth_))
+            action(None)
+            fake_appkit.RUN_LOOP.run_pending()
+            self.counts["navigations"] += 1
+        self.run_minutes(self.rng.randrange(1, 3))
+        self.delegate.togglePopover_(self.button)
+
+    def post(self, center, name):
+        center.post(name)
+        self.counts["notifications"] += 1
+
+    def unlock(self):
+        self.post(fake_appkit.NSDistributedNotificationCenter.defaultCenter(), "com.apple.screenIsUnlocked")
+        self.counts["unlocks"] += 1
+
+    def sleep_overnight(self):
+        # Máy ngủ: giờ hệ thống chạy, monotonic (NSTimer) đứng yên; thức dậy gửi wake + unlock
+        self.clock.sleep(self.rng.uniform(2, 10) * 3600)
+        self.post(fake_appkit.NSWorkspace.sharedWorkspace().notificationCenter(), "NSWorkspaceDidWakeNotification")
+        self.unlock()
+        self.counts["sleeps"] += 1
+
+    def simulate_day(self):
+        """Chạy tới 08:00 ngày hôm sau, trả về ngày giả vừa kết thúc."""
+        day = self.clock.local_datetime().date()
+        events = (["open"] * self.rng.randint(POPOVER_OPENS_PER_DAY // 2, POPOVER_OPENS_PER_DAY * 3 // 2)
+                  + ["unlock"] * self.rng.randint(1, UNLOCKS_PER_DAY * 2))
+        if self.rng.random() < 0.1:
+            events.append(self.rng.choice(("NSSystemClockDidChangeNotification", "NSSystemTimeZoneDidChangeNotification")))
+        # Các sự kiện rải trong 15 giờ thức (08:00-23:00)
+        minutes = sorted(self.rng.randrange(15 * 60) for _ in events)
+        self.rng.shuffle(events)
+        elapsed = 0
+        for minute, event in zip(minutes, events):
+            self.run_minutes(max(0, minute - elapsed))
+            elapsed = max(elapsed, minute)
+            if event == "open":
+                self.open_popover()
+            elif event == "unlock":
+                self.unlock()
+            else:
+                self.post(fake_appkit.NSNotificationCenter.defaultCenter(), event)
+        self.run_minutes(max(0, 15 * 60 - elapsed))
+        if self.rng.random() < SLEEP_PROBABILITY:
+            self.run_minutes(self.rng.randrange(30, 120))
+            self.sleep_overnight()
+        # Chạy từng phút tới 08:00 sáng hôm sau (ngủ lâu thì có thể đã quá giờ đó)
+        target = self.clock.local_timestamp(datetime.combine(day + timedelta(days=1), dt_time(8)))
+        if self.clock.time() < target:
+            self.run_minutes(int((target - self.clock.time()) // 60))
+        self.check_today()
+        return day
+
+    def check_today(self):
+        today = self.clock.local_datetime().date()
+        scheduler = self.delegate.refresh_scheduler
+        if scheduler.last_date != today:
+            self.errors.append(f"{today}: scheduler vẫn ở {scheduler.last_date}")
+        view = self.delegate.calendar_view
+        if view is not None and view.layout_cache.today != today:
+            self.errors.append(f"{today}: cache bố cục vẫn coi hôm nay là {view.layout_cache.today}")
+
+    def sample(self, meter):
+        view = self.delegate.calendar_view
+        images = self.app.get_day_images().cache
+        sample = {
+            "timers": fake_appkit.STATS.live_timers,
+            "views": fake_appkit.STATS.live_views,
+            "view_allocs": sum(fake_appkit.STATS.allocations[name] for name in VIEW_CLASSES),
+            "observers": fake_appkit.STATS.live_observers,
+            "threads": threading.active_count(),
+            "layouts": len(view.layout_cache) if view is not None else 0,
+            "images": len(images),
+            "log_bytes": meter.bytes,
+        }
+        if view is not None and sample["layouts"] > view.layout_cache.maxsize:
+            self.errors.append(f"cache bố cục {sample['layouts']} > {view.layout_cache.maxsize}")
+        if images.bytes > images.max_bytes or sample["images"] > images.max_entries:
+            self.errors.append(f"cache ảnh {sample['images']} ảnh / {images.bytes} B vượt giới hạn")
+        # Hai cache có giới hạn đầy dần theo thao tác ngẫu nhiên; làm rỗng trước khi đo
+        # để số bộ nhớ chỉ phản ánh phần còn lại của app
+        if view is not None:
+            view.layout_cache.clear()
+        images.clear()
+        gc.collect()
+        sample["memory"] = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        return sample
+
+
+def wait_for_log_queue(listener, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not listener.queue.empty() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Bản ghi cuối vừa lấy khỏi hàng đợi có thể chưa ghi xong
+    time.sleep(0.05)
+
+
+def directory_bytes(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def check_flat(name, values, errors):
+    if len(set(values)) > 1:
+        errors.append(f"{name} thay đổi sau khởi động: {values[0]} -> {max(values)} (cuối {values[-1]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if args.days < WARMUP_DAYS + 4:
+        parser.error(f"--days phải ít nhất {WARMUP_DAYS + 4}")
+
+    os.environ.setdefault("MENU_CALENDAR_LOG_DIR", tempfile.mkdtemp(prefix="menu_calendar_soak_"))
+    app = load_app()
+    # Giờ địa phương của tiến trình (tz=None) như SystemClock thật; FakeClock với
+    # ZoneInfo sẽ làm zoneinfo tự cache thêm vài trăm đối tượng, lẫn vào số đo bộ nhớ
+    os.environ["TZ"] = TIME_ZONE
+    time.tzset()
+    clock = FakeClock(START, None)
+    meter, file_handler = install_clock(app, clock)
+    fake_appkit.STATS.reset()
+    soak = Soak(app, clock, random.Random(args.seed))
+
+    started = time.perf_counter()
+    samples = []
+    print(f"{'ngày':<12}{'timer':>6}{'view':>6}{'obs':>5}{'luồng':>6}{'bố cục':>8}{'ảnh':>5}{'bộ nhớ KiB':>12}{'log B/ngày':>12}")
+    for index in range(args.days):
+        if index == WARMUP_DAYS:
+            tracemalloc.start()
+        log_before = meter.bytes
+        day = soak.simulate_day()
+        sample = soak.sample(meter)
+        sample["day"] = day
+        sample["log_day"] = meter.bytes - log_before
+        samples.append(sample)
+        if index < WARMUP_DAYS + 1 or index % 5 == 0 or index == args.days - 1:
+            print(f"{day.isoformat():<12}{sample['timers']:>6}{sample['views']:>6}{sample['observers']:>5}"
+                  f"{sample['threads']:>6}{sample['layouts']:>8}{sample['images']:>5}"
+                  f"{sample['memory'] / 1024:>12.1f}{sample['log_day']:>12}")
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - started
+
+    errors = list(soak.errors)
+    errors.extend(f"log lỗi: {message}" for message in meter.errors)
+    steady = samples[WARMUP_DAYS:]
+    for name in ("timers", "views", "view_allocs", "observers", "threads"):
+        check_flat(name, [sample[name] for sample in steady], errors)
+    if steady[0]["timers"] != 1:
+        errors.append(f"cần đúng một timer (hạn chót nửa đêm), có {steady[0]['timers']}")
+
+    memory = [sample["memory"] for sample in steady]
+    growth = memory[-1] - memory[0]
+    half = len(memory) // 2
+    late_growth = memory[-1] - memory[half]
+    if growth > MEMORY_GROWTH_BUDGET or late_growth > MEMORY_GROWTH_BUDGET / 2:
+        errors.append(f"bộ nhớ tăng {growth / 1024:.0f} KiB (nửa sau {late_growth / 1024:.0f} KiB)")
+
+    logs = [sample["log_day"] for sample in steady]
+    early = sum(logs[:half]) / half
+    late = sum(logs[half:]) / (len(logs) - half)
+    if late > early * LOG_GROWTH_FACTOR + 1024:
+        errors.append(f"log mỗi ngày tăng: {early:.0f} B -> {late:.0f} B")
+    wait_for_log_queue(app.LOG_LISTENER)
+    log_dir = os.path.dirname(app.LOG_FILE)
+    on_disk = directory_bytes(log_dir)
+    disk_limit = (file_handler.backupCount + 1) * file_handler.maxBytes + LOG_SLACK_BYTES
+    if on_disk > disk_limit:
+        errors.append(f"thư mục log {on_disk} B > giới hạn xoay vòng {disk_limit} B")
+
+    scheduler = soak.delegate.refresh_scheduler
+    counts = soak.counts
+    print(f"\n{args.days} ngày giả trong {elapsed:.1f} s: {counts['ticks']} phút, {counts['opens']} lần mở popover, "
+          f"{counts['navigations']} lần chuyển tháng, {counts['unlocks']} lần mở khoá, {counts['sleeps']} lần ngủ qua đêm, "
+          f"{counts['notifications']} thông báo")
+    print(f"Scheduler: {scheduler.refreshes} lần sang ngày, {scheduler.wakeups} lần thức, {scheduler.coalesced} poke được gộp")
+    print(f"Bộ nhớ sau khởi động: {memory[0] / 1024:.0f} -> {memory[-1] / 1024:.0f} KiB; "
+          f"log {early:.0f} -> {late:.0f} B/ngày ({meter.records} bản ghi), thư mục log {on_disk / 1024:.0f} KiB")
+    if scheduler.refreshes < args.days - 1:
+        errors.append(f"chỉ {scheduler.refreshes} lần sang ngày trong {args.days} ngày")
+
+    for error in errors:
+        print("LỖI:", error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
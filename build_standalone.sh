@@ -60,10 +60,16 @@ print_status "Dọn dẹp build cũ..."
 rm -rf build/ dist/ MenuCalendar_Standalone.app
 print_success "Đã dọn dẹp"
 
+# Build icon (chỉ vẽ lại icon đã thay đổi) và sprite atlas cho thanh menu
+print_status "Build icon ngày..."
+python3 images/generate_calendar_day_png.py
+print_success "Icon đã sẵn sàng"
+
 # Tạo spec file cho PyInstaller
 print_status "Tạo PyInstaller spec file..."
 cat > menu_calendar.spec << 'EOF'
 # -*- mode: python ; coding: utf-8 -*-
+from PyInstaller.utils.hooks import collect_submodules
 
 block_cipher = None
 
@@ -74,14 +80,13 @@ a = Analysis(
     datas=[
         ('images', 'images'),
     ],
+    # calendar_core nạp nhiều module lười (NumPy, --serve, export...): lấy hết các module con
     hiddenimports=[
         'objc',
         'AppKit',
         'Foundation',
-        'lunarcalendar',
-        'lunarcalendar.Converter',
-        'lunarcalendar.Solar',
-    ],
+        'numpy',
+    ] + collect_submodules('calendar_core'),
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
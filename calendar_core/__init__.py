@@ -0,0 +1,54 @@
+"""Lõi tính toán ngày tháng cho Menu Calendar (không phụ thuộc AppKit).
+
+Import gói này không kéo theo NumPy hay Pillow: các tên bên dưới chỉ được
+nạp khi truy cập lần đầu.
+"""
+import importlib
+
+_EXPORTS = {
+    "solar_to_lunar": "calendar_core.lunar",
+    "ordinal_to_lunar": "calendar_core.lunar",
+    "lunar_to_solar": "calendar_core.lunar",
+    "month_lunar": "calendar_core.lunar",
+    "year_lunar": "calendar_core.lunar",
+    "ordinals_to_lunar": "calendar_core.lunar_np",
+    "lunar_to_ordinals": "calendar_core.lunar_np",
+    "DayRecord": "calendar_core.days",
+    "iter_days": "calendar_core.days",
+    "iter_day_chunks": "calendar_core.days",
+    "MonthLayout": "calendar_core.layout",
+    "MonthLayoutCache": "calendar_core.layout",
+    "build_month_layout": "calendar_core.layout",
+    "CellPool": "calendar_core.cells",
+    "export_months": "calendar_core.export",
+    "RenderScheduler": "calendar_core.render",
+    "ThreadExecutor": "calendar_core.render",
+    "HolidayCalendar": "calendar_core.holidays",
+    "build_year_index": "calendar_core.holidays",
+    "DayCache": "calendar_core.daycache",
+    "solar_terms": "calendar_core.astro",
+    "generate_months": "calendar_core.astro_np",
+    "EventIndex": "calendar_core.ics",
+    "EventStore": "calendar_core.ics",
+    "span": "calendar_core.metrics",
+    "QueryClient": "calendar_core.client",
+    "QueryServer": "calendar_core.service",
+    "DayImages": "calendar_core.images",
+    "RefreshScheduler": "calendar_core.scheduler",
+    "setup_logging": "calendar_core.logging_setup",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'calendar_core' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
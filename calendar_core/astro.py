@@ -0,0 +1,75 @@
+"""Tính toán thiên văn đơn giản: kinh độ mặt trời và 24 tiết khí.
+
+Công thức kinh độ mặt trời theo Meeus (bản rút gọn, như trong thuật toán âm
+lịch của Hồ Ngọc Đức), đủ chính xác để xác định ngày của tiết khí.
+"""
+from datetime import date
+from math import floor, pi, sin
+
+# Tiết khí thứ k bắt đầu khi kinh độ mặt trời đạt k * 15 độ
+SOLAR_TERMS = [
+    "Xuân phân", "Thanh minh", "Cốc vũ", "Lập hạ", "Tiểu mãn", "Mang chủng",
+    "Hạ chí", "Tiểu thử", "Đại thử", "Lập thu", "Xử thử", "Bạch lộ",
+    "Thu phân", "Hàn lộ", "Sương giáng", "Lập đông", "Tiểu tuyết", "Đại tuyết",
+    "Đông chí", "Tiểu hàn", "Đại hàn", "Lập xuân", "Vũ thủy", "Kinh trập",
+]
+
+# Múi giờ Việt Nam (giờ)
+VIETNAM_TZ = 7.0
+
+# Tăng khi công thức tính tiết khí đổi (file cache ngày dựa vào số này để tự làm mới)
+ALGORITHM_VERSION = 1
+
+# ordinal 1 (1/1/0001) lúc 0h UTC có số ngày Julius 1721425.5
+_JD_MIDNIGHT_OFFSET = 1721424.5
+
+_DR = pi / 180
+# Tốc độ kinh độ mặt trời lớn nhất (độ/ngày), dùng để nhảy mà không vượt qua tiết khí
+_MAX_DAILY_MOTION = 1.02
+
+
+def sun_longitude_unwrapped(jd):
+    """Kinh độ mặt trời (độ, chưa lấy modulo 360) tại thời điểm Julius `jd` (UTC)."""
+    t = (jd - 2451545.0) / 36525
+    t2 = t * t
+    m = 357.52910 + 35999.05030 * t - 0.0001559 * t2 - 0.00000048 * t * t2
+    l0 = 280.46645 + 36000.76983 * t + 0.0003032 * t2
+    dl = ((1.914600 - 0.004817 * t - 0.000014 * t2) * sin(_DR * m)
+          + (0.019993 - 0.000101 * t) * sin(2 * _DR * m)
+          + 0.000290 * sin(3 * _DR * m))
+    return l0 + dl
+
+
+def sun_longitude(jd):
+    """Kinh độ mặt trời (độ, trong [0, 360)) tại thời điểm Julius `jd` (UTC)."""
+    return sun_longitude_unwrapped(jd) % 360
+
+
+def _longitude_at_midnight(ordinal, tz):
+    return sun_longitude_unwrapped(ordinal + _JD_MIDNIGHT_OFFSET - tz / 24)
+
+
+def solar_terms(year, tz=VIETNAM_TZ):
+    """Các tiết khí rơi vào năm dương `year`: danh sách (ordinal, chỉ số tiết khí).
+
+    Tiết khí thuộc ngày mà kinh độ mặt trời vượt mốc k * 15 độ giữa nửa đêm
+    đầu ngày và nửa đêm cuối ngày theo giờ địa phương.
+    """
+    day = date(year, 1, 1).toordinal()
+    end = date(year + 1, 1, 1).toordinal()
+    longitude = _longitude_at_midnight(day, tz)
+    terms = []
+    while day < end:
+        boundary = (floor(longitude / 15) + 1) * 15
+        jump = int((boundary - longitude) / _MAX_DAILY_MOTION)
+        if jump >= 1:
+            # Chưa thể tới mốc trong `jump` ngày, nhảy thẳng tới đó
+            day += jump
+            longitude = _longitude_at_midnight(day, tz)
+            continue
+        next_longitude = _longitude_at_midnight(day + 1, tz)
+        if next_longitude >= boundary:
+            terms.append((day, int(boundary // 15) % 24))
+        day += 1
+        longitude = next_longitude
+    return terms
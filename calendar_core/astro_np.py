@@ -0,0 +1,226 @@
+"""Sinh lịch âm từ thiên văn cho cả dải năm bằng NumPy (thuật toán của Hồ Ngọc Đức).
+
+Khác với calendar_core.lunar (bảng lấy từ lunarcalendar, theo giờ Trung Quốc
+UTC+8, chỉ 1899-2101), module này tính trực tiếp các điểm sóc (trăng mới) và
+kinh độ mặt trời với múi giờ tuỳ chọn:
+
+* mùng 1 là ngày (theo giờ địa phương) chứa điểm sóc;
+* tháng 11 âm là tháng chứa Đông chí;
+* giữa hai tháng 11 có 13 tháng thì tháng đầu tiên không chứa trung khí (mốc
+  kinh độ bội của 30 độ) là tháng nhuận, mang số của tháng trước nó.
+
+Mọi bước chạy trên mảng: một lần tính cho toàn bộ sóc, một lần cho toàn bộ
+ngày khi cần tiết khí. Công thức sóc là bản rút gọn của Meeus (sai số vài
+phút) nên kết quả ngoài khoảng 1000-3000 kém tin cậy. Ordinal theo lịch
+Gregory đón trước như datetime.date.
+
+Dòng lệnh: python -m calendar_core.astro_np [năm đầu năm cuối] [--tz 7] [--compare 8]
+"""
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+
+from calendar_core.astro import VIETNAM_TZ
+
+CHINA_TZ = 8.0
+SYNODIC_MONTH = 29.530588853
+
+# ordinal + _JDN_OFFSET = số ngày Julius (tính từ trưa) của ngày đó
+_JDN_OFFSET = 1721425
+# Sóc k = 0 rơi vào ngày 1/1/1900
+_K0_ORDINAL = date(1900, 1, 1).toordinal()
+_DR = np.pi / 180
+
+# Các tháng âm theo thứ tự ngày bắt đầu; `end` là ngày bắt đầu của tháng kế tiếp
+# tháng cuối, để tính được độ dài tháng cuối
+MonthTable = namedtuple("MonthTable", ["starts", "years", "months", "leaps", "end", "tz"])
+
+
+def new_moons(k):
+    """Thời điểm sóc thứ `k` (số ngày Julius, UTC); k = 0 là sóc ngày 1/1/1900. Nhận mảng."""
+    k = np.asarray(k, dtype=np.float64)
+    t = k / 1236.85
+    t2 = t * t
+    t3 = t2 * t
+    jd = 2415020.75933 + 29.53058868 * k + 0.0001178 * t2 - 0.000000155 * t3
+    jd += 0.00033 * np.sin((166.56 + 132.87 * t - 0.009173 * t2) * _DR)
+    m = (359.2242 + 29.10535608 * k - 0.0000333 * t2 - 0.00000347 * t3) * _DR
+    mpr = (306.0253 + 385.81691806 * k + 0.0107306 * t2 + 0.00001236 * t3) * _DR
+    f = (21.2964 + 390.67050646 * k - 0.0016528 * t2 - 0.00000239 * t3) * _DR
+    c1 = ((0.1734 - 0.000393 * t) * np.sin(m) + 0.0021 * np.sin(2 * m)
+          - 0.4068 * np.sin(mpr) + 0.0161 * np.sin(2 * mpr) - 0.0004 * np.sin(3 * mpr)
+          + 0.0104 * np.sin(2 * f) - 0.0051 * np.sin(m + mpr) - 0.0074 * np.sin(m - mpr)
+          + 0.0004 * np.sin(2 * f + m) - 0.0004 * np.sin(2 * f - m) - 0.0006 * np.sin(2 * f + mpr)
+          + 0.0010 * np.sin(2 * f - mpr) + 0.0005 * np.sin(2 * mpr + m))
+    # Chênh lệch giờ thiên văn (TT) và giờ dân sự (UT)
+    delta_t = np.where(t < -11,
+                       0.001 + 0.000839 * t + 0.0002261 * t2 - 0.00000845 * t3 - 0.000000081 * t * t3,
+                       -0.000278 + 0.000265 * t + 0.000262 * t2)
+    return jd + c1 - delta_t
+
+
+def sun_longitudes(jd):
+    """Kinh độ mặt trời (độ, chưa lấy modulo 360) tại các thời điểm Julius `jd` (UTC).
+
+    Cùng công thức với astro.sun_longitude_unwrapped, chạy trên mảng.
+    """
+    t = (np.asarray(jd, dtype=np.float64) - 2451545.0) / 36525
+    t2 = t * t
+    m = (357.52910 + 35999.05030 * t - 0.0001559 * t2 - 0.00000048 * t * t2) * _DR
+    l0 = 280.46645 + 36000.76983 * t + 0.0003032 * t2
+    dl = ((1.914600 - 0.004817 * t - 0.000014 * t2) * np.sin(m)
+          + (0.019993 - 0.000101 * t) * np.sin(2 * m)
+          + 0.000290 * np.sin(3 * m))
+    return l0 + dl
+
+
+def new_moon_ordinals(k, tz=VIETNAM_TZ):
+    """Ordinal của ngày (giờ địa phương UTC+`tz`) chứa sóc thứ `k`."""
+    return np.floor(new_moons(k) + 0.5 + tz / 24).astype(np.int64) - _JDN_OFFSET
+
+
+def longitudes_at_midnight(ordinals, tz=VIETNAM_TZ):
+    """Kinh độ mặt trời (chưa lấy modulo) lúc 0h địa phương đầu các ngày `ordinals`."""
+    return sun_longitudes(np.asarray(ordinals, dtype=np.float64) + _JDN_OFFSET - 0.5 - tz / 24)
+
+
+def boundary_minutes(ordinals, tz=VIETNAM_TZ):
+    """Số phút từ điểm sóc gần ngày `ordinals` nhất tới nửa đêm địa phương gần nhất.
+
+    Dương nếu sóc rơi sau nửa đêm. Sóc cách nửa đêm vài phút nằm trong sai số
+    công thức: các nguồn khác nhau có thể đặt mùng 1 lệch một ngày ở những tháng này.
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    k = np.rint((ordinals - _K0_ORDINAL) / SYNODIC_MONTH)
+    # Giờ địa phương của ba sóc quanh ngày, tính bằng ngày kể từ 0h của ngày đó
+    local = new_moons(k[..., None] + np.arange(-1, 2)) + 0.5 + tz / 24 - _JDN_OFFSET - ordinals[..., None]
+    nearest = np.take_along_axis(local, np.abs(local - 0.5).argmin(axis=-1)[..., None], axis=-1)[..., 0]
+    return (nearest - np.rint(nearest)) * 1440
+
+
+def generate_months(first_year, last_year, tz=VIETNAM_TZ):
+    """Mọi tháng của các năm âm lịch `first_year`..`last_year` theo giờ UTC+`tz`."""
+    if first_year > last_year:
+        raise ValueError(f"Khoảng năm không hợp lệ: {first_year}-{last_year}")
+    # Đủ sóc từ trước tháng 11 năm first_year - 1 tới sau tháng 11 năm last_year + 1
+    k_first = int((date(first_year - 1, 10, 1).toordinal() - _K0_ORDINAL) // SYNODIC_MONTH) - 1
+    k_last = int((date(last_year + 2, 1, 31).toordinal() - _K0_ORDINAL) // SYNODIC_MONTH) + 2
+    starts = new_moon_ordinals(np.arange(k_first, k_last + 1), tz)
+    longitudes = longitudes_at_midnight(starts, tz)
+
+    # Tháng chứa Đông chí (kinh độ 270 + 360n) là tháng 11
+    winter = np.floor((longitudes - 270) / 360)
+    month11 = np.flatnonzero(winter[1:] > winter[:-1])
+    # Tháng không chứa trung khí: đầu tháng và đầu tháng sau cùng một cung 30 độ
+    sector = np.floor(longitudes / 30)
+    no_major_term = np.append(sector[1:] == sector[:-1], False)
+
+    # Mỗi chu kỳ chạy từ một tháng 11 tới trước tháng 11 kế tiếp
+    cycle_years = date.fromordinal(int(starts[month11[0]])).year + np.arange(month11.size - 1)
+    index = np.arange(month11[0], month11[-1])
+    cycle = np.searchsorted(month11, index, side="right") - 1
+    offset = index - month11[cycle]
+    leap_cycle = (month11[1:] - month11[:-1]) == 13
+    # Tháng nhuận: tháng không trung khí đầu tiên sau tháng 11 trong chu kỳ 13 tháng
+    leap_offset = np.full(month11.size - 1, 99, dtype=np.int64)
+    candidates = no_major_term[index] & (offset >= 1) & leap_cycle[cycle]
+    np.minimum.at(leap_offset, cycle[candidates], offset[candidates])
+
+    leaps = offset == leap_offset[cycle]
+    # Từ tháng nhuận trở đi số tháng lùi một
+    months = (offset + 10 - (offset >= leap_offset[cycle])) % 12 + 1
+    # Tháng 11, 12 thuộc năm của Đông chí; tháng 1-10 thuộc năm sau
+    years = cycle_years[cycle] + (months < 11)
+
+    keep = (years >= first_year) & (years <= last_year)
+    selected = index[keep]
+    return MonthTable(starts[selected], years[keep].astype(np.int32), months[keep].astype(np.int8),
+                      leaps[keep], int(starts[selected[-1] + 1]), tz)
+
+
+def table_from_lunar():
+    """MonthTable của bảng dựng sẵn trong calendar_core.lunar (dữ liệu lunarcalendar, UTC+8)."""
+    from calendar_core import lunar, lunar_np
+
+    return MonthTable(lunar_np._STARTS, lunar_np._YEARS, lunar_np._MONTHS, lunar_np._IS_LEAP,
+                      lunar.MAX_ORDINAL + 1, CHINA_TZ)
+
+
+def ordinals_to_lunar(table, ordinals):
+    """Đổi mảng ordinal sang bốn mảng (ngày, tháng, năm, nhuận) theo `table`."""
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if ordinals.size and (ordinals.min() < table.starts[0] or ordinals.max() >= table.end):
+        raise ValueError("Có ordinal nằm ngoài bảng tháng")
+    idx = np.searchsorted(table.starts, ordinals, side="right") - 1
+    days = (ordinals - table.starts[idx] + 1).astype(np.int8)
+    return days, table.months[idx], table.years[idx], table.leaps[idx]
+
+
+def solar_terms(first_year, last_year, tz=VIETNAM_TZ):
+    """24 tiết khí của các năm dương `first_year`..`last_year`: hai mảng (ordinal, chỉ số).
+
+    Cùng quy ước với astro.solar_terms: tiết khí k (SOLAR_TERMS[k], mốc k * 15 độ)
+    thuộc ngày mà kinh độ vượt mốc giữa nửa đêm đầu ngày và nửa đêm cuối ngày.
+    """
+    days = np.arange(date(first_year, 1, 1).toordinal(), date(last_year + 1, 1, 1).toordinal() + 1)
+    term = np.floor(longitudes_at_midnight(days, tz) / 15).astype(np.int64)
+    crossing = np.flatnonzero(term[1:] > term[:-1])
+    return days[crossing], term[crossing + 1] % 24
+
+
+def year_months(table, year):
+    """Các tháng của năm âm `year` trong `table`: danh sách (tháng, nhuận, ordinal mùng 1, số ngày)."""
+    lo, hi = np.searchsorted(table.years, [year, year + 1])
+    if lo == hi:
+        raise ValueError(f"Năm âm lịch {year} nằm ngoài bảng tháng")
+    ends = np.append(table.starts, table.end)[lo + 1:hi + 1]
+    return [(int(month), bool(leap), int(start), int(end - start))
+            for month, leap, start, end in zip(table.months[lo:hi], table.leaps[lo:hi], table.starts[lo:hi], ends)]
+
+
+def describe_year(table, year):
+    """Tóm tắt một năm âm: ngày Tết và tháng nhuận, ví dụ "Tết 1985-01-21, nhuận 0"."""
+    months = year_months(table, year)
+    leap = next((month for month, is_leap, _, _ in months if is_leap), 0)
+    return f"Tết {date.fromordinal(months[0][2])}, nhuận {leap}"
+
+
+def differing_years(a, b):
+    """Các năm âm có trong cả hai bảng mà ngày đầu tháng, số tháng hoặc tháng nhuận khác nhau."""
+    first = max(int(a.years[0]), int(b.years[0]))
+    last = min(int(a.years[-1]), int(b.years[-1]))
+    result = []
+    a_bounds = np.searchsorted(a.years, np.arange(first, last + 2))
+    b_bounds = np.searchsorted(b.years, np.arange(first, last + 2))
+    for i, year in enumerate(range(first, last + 1)):
+        a_slice = slice(a_bounds[i], a_bounds[i + 1])
+        b_slice = slice(b_bounds[i], b_bounds[i + 1])
+        if not (np.array_equal(a.starts[a_slice], b.starts[b_slice])
+                and np.array_equal(a.months[a_slice], b.months[b_slice])
+                and np.array_equal(a.leaps[a_slice], b.leaps[b_slice])):
+            result.append(year)
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Sinh lịch âm từ thiên văn và so sánh hai múi giờ")
+    parser.add_argument("first", type=int, nargs="?", default=1900)
+    parser.add_argument("last", type=int, nargs="?", default=2100)
+    parser.add_argument("--tz", type=float, default=VIETNAM_TZ)
+    parser.add_argument("--compare", type=float, default=CHINA_TZ, help="Múi giờ để so sánh")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = generate_months(args.first, args.last, args.tz)
+    other = generate_months(args.first, args.last, args.compare)
+    elapsed = time.perf_counter() - start
+    print(f"{args.first}-{args.last}: {table.starts.size} tháng, {int(table.leaps.sum())} tháng nhuận "
+          f"(UTC{args.tz:+g}), hai múi giờ trong {elapsed * 1000:.0f} ms")
+    years = differing_years(table, other)
+    print(f"{len(years)} năm khác nhau giữa UTC{args.tz:+g} và UTC{args.compare:+g}:")
+    for year in years:
+        print(f"  {year}: {describe_year(table, year)} | {describe_year(other, year)}")
@@ -0,0 +1,74 @@
+"""Tái sử dụng các ô ngày: tạo một lần, mỗi lần vẽ chỉ đẩy thuộc tính đã đổi.
+
+`CellPool` không biết gì về AppKit. Nó giữ trạng thái đã áp dụng cho từng ô
+và gọi `backend.update(handle, state, changed)` với danh sách trường thay đổi.
+Backend AppKit nằm trong menu_calendar.py; backend giả dùng cho benchmark nằm
+trong benchmarks/fakes.py.
+"""
+from collections import namedtuple
+
+from calendar_core.holidays import cell_marker
+from calendar_core.layout import MAX_CELLS
+
+CellState = namedtuple("CellState", ["origin", "hidden", "text", "lunar_text", "today",
+                                     "marker", "tooltip", "events"])
+
+FIELDS = CellState._fields
+
+# Trạng thái ban đầu: chưa hiển thị gì
+EMPTY_STATE = CellState(origin=None, hidden=True, text="", lunar_text="", today=False,
+                        marker=None, tooltip="", events=False)
+
+
+def cell_state(cell):
+    """Trạng thái hiển thị của một DayCell; None (ô ẩn) với ngày của tháng bên cạnh."""
+    if not cell.in_month:
+        return None
+    origin = (cell.x, cell.y + 2) if cell.is_today else (cell.x, cell.y)
+    return CellState(origin=origin, hidden=False, text=str(cell.day), lunar_text=cell.lunar_text,
+                     today=cell.is_today, marker=cell_marker(cell.observances),
+                     tooltip="\n".join(observance.name for observance in cell.observances),
+                     events=cell.events > 0)
+
+
+class CellBackend:
+    """Giao diện backend cho CellPool."""
+
+    def create_cell(self, index):
+        """Tạo view cho ô `index`, trả về handle bất kỳ."""
+        raise NotImplementedError
+
+    def update(self, handle, state, changed):
+        """Áp dụng `state` cho ô; `changed` là tuple tên trường đã đổi."""
+        raise NotImplementedError
+
+
+class CellPool:
+    def __init__(self, backend, size=MAX_CELLS):
+        self.backend = backend
+        self.handles = [backend.create_cell(index) for index in range(size)]
+        self.states = [EMPTY_STATE] * size
+        self.writes = 0
+
+    def apply(self, layout):
+        """Đẩy bố cục tháng vào các ô; trả về số thuộc tính đã ghi."""
+        writes = 0
+        cells = layout.cells
+        for index, handle in enumerate(self.handles):
+            previous = self.states[index]
+            state = cell_state(cells[index]) if index < len(cells) else None
+            if state is None:
+                # Ô ẩn: giữ nguyên nội dung cũ, chỉ cần ẩn đi
+                state = previous._replace(hidden=True)
+            if state == previous:
+                continue
+            changed = tuple(name for name, old, new in zip(FIELDS, previous, state) if old != new)
+            self.backend.update(handle, state, changed)
+            self.states[index] = state
+            writes += len(changed)
+        self.writes += writes
+        return writes
+
+    def invalidate(self):
+        """Quên trạng thái đã áp dụng (ví dụ khi đổi giao diện sáng/tối) để lần sau ghi lại toàn bộ."""
+        self.states = [EMPTY_STATE._replace(hidden=None)] * len(self.handles)
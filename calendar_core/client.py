@@ -0,0 +1,166 @@
+"""Client nhỏ cho dịch vụ tra cứu của app (calendar_core/service.py).
+
+Chỉ dùng socket và json: không import lunarcalendar, NumPy, bảng âm lịch hay
+phần server, nên gọi từ script / prompt shell rất nhẹ. Quy ước đường dẫn
+socket cũng nằm ở đây và được app (service.py) dùng lại.
+
+    from calendar_core.client import QueryClient
+    with QueryClient() as client:
+        client.lunar("2026-02-17")          # [2026, 1, 1, False]
+        client.pipeline(["lunar", "month 2026 2"])
+
+Dòng lệnh: python -m calendar_core.client [lệnh tham số...] (mặc định `lunar`).
+"""
+import json
+import os
+import socket
+import sys
+
+APP_NAME = "MenuCalendar"
+SOCKET_ENV = "MENU_CALENDAR_SOCKET"
+SOCKET_NAME = "query.sock"
+
+
+def default_socket_path():
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~/Library/Application Support"), APP_NAME, SOCKET_NAME)
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or os.path.expanduser("~/.local/share")
+    return os.path.join(runtime, APP_NAME, SOCKET_NAME)
+
+
+def socket_path(argv, environ=os.environ):
+    """Đường dẫn socket từ `--serve[=đường dẫn]` hoặc MENU_CALENDAR_SOCKET; None nếu tắt."""
+    value = None
+    for arg in argv[1:]:
+        if arg == "--serve":
+            value = "1"
+        elif arg.startswith("--serve="):
+            value = arg.split("=", 1)[1]
+    if value is None:
+        value = environ.get(SOCKET_ENV, "")
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return default_socket_path()
+    return os.path.expanduser(value)
+
+
+class QueryError(Exception):
+    pass
+
+
+def _date_text(value):
+    return value if isinstance(value, str) else value.isoformat()
+
+
+class QueryClient:
+    def __init__(self, path=None, timeout=5.0):
+        # Cùng quy ước với app: MENU_CALENDAR_SOCKET là đường dẫn hoặc "1" cho mặc định
+        self.path = path or socket_path([], os.environ) or default_socket_path()
+        self.timeout = timeout
+        self._sock = None
+        self._buffer = b""
+
+    def connect(self):
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        return self
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            self._buffer = b""
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _read_lines(self, count):
+        # Đọc tới khi đủ `count` dòng rồi mới tách một lần, tránh cắt buffer sau mỗi dòng
+        chunks = [self._buffer]
+        seen = self._buffer.count(b"\n")
+        while seen < count:
+            chunk = self._sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("Server closed the connection")
+            chunks.append(chunk)
+            seen += chunk.count(b"\n")
+        *lines, self._buffer = b"".join(chunks).split(b"\n", count)
+        return lines
+
+    def pipeline(self, requests, raise_errors=True):
+        """Gửi mọi dòng yêu cầu một lần rồi đọc các phản hồi theo thứ tự.
+
+        Trả về danh sách giá trị `ok`; với `raise_errors=False`, yêu cầu lỗi trả
+        về QueryError thay vì ném ra.
+        """
+        self.connect()
+        self._sock.sendall("".join(request + "\n" for request in requests).encode("utf-8"))
+        results = []
+        for line in self._read_lines(len(requests)):
+            response = json.loads(line)
+            if "error" in response:
+                error = QueryError(response["error"])
+                if raise_errors:
+                    raise error
+                results.append(error)
+            else:
+                results.append(response["ok"])
+        return results
+
+    def request(self, line):
+        return self.pipeline([line])[0]
+
+    def ping(self):
+        return self.request("ping")
+
+    def lunar(self, day=None):
+        return self.request("lunar" if day is None else f"lunar {_date_text(day)}")
+
+    def batch(self, days):
+        return self.request("batch " + " ".join(_date_text(day) for day in days))
+
+    def range(self, first, count):
+        return self.request(f"range {_date_text(first)} {count}")
+
+    def month(self, year, month):
+        return self.request(f"month {year} {month}")
+
+    def holidays(self, first, last=None):
+        return self.request(f"holidays {_date_text(first)}" + (f" {_date_text(last)}" if last is not None else ""))
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    line = " ".join(args) or "lunar"
+    try:
+        with QueryClient() as client:
+            result = client.request(line)
+    except OSError as e:
+        print(f"Không kết nối được tới Menu Calendar: {e}", file=sys.stderr)
+        return 2
+    except QueryError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    if line.split()[0] == "lunar":
+        # Dạng ngắn cho prompt shell: ngày/tháng/năm âm, thêm "n" nếu tháng nhuận
+        year, month, day, leap = result
+        print(f"{day}/{month}{'n' if leap else ''}/{year}")
+    else:
+        print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Bộ nhớ đệm ngày tính sẵn trên đĩa, đọc bằng mmap.
+
+Một file nhị phân bản ghi cố định (RECORD, 8 byte) cho mọi ngày trong bảng âm
+lịch: năm / tháng / ngày âm, cờ nhuận và tối đa MAX_OBSERVANCES mã lễ trỏ vào
+CATALOG. Lần khởi động sau chỉ cần mmap file: tra một ngày là một lần
+`struct.unpack_from` ở vị trí (ordinal - first) * RECORD.size, không phân tích
+hay unpickle gì, và dựng bố cục tháng không cần nạp NumPy.
+
+File nằm trong thư mục cache của người dùng (không cạnh script: bundle có thể
+chỉ đọc). Header ghi phiên bản định dạng, mã băm "engine" (bảng âm lịch, quy
+tắc lễ, tiết khí) và múi giờ; khác một trong số đó thì file bị coi như không
+có và được ghi lại. File mới được ghi vào file tạm cùng thư mục rồi
+`os.replace`, nên tiến trình khác không bao giờ thấy file dở dang.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from datetime import date
+
+from calendar_core import lunar
+from calendar_core.astro import ALGORITHM_VERSION, SOLAR_TERMS, VIETNAM_TZ
+from calendar_core.holidays import (LUNAR_RULES, MONTHLY_RULES, NO_OBSERVANCES, SOLAR_RULES, Observance,
+                                    build_year_index)
+
+APP_NAME = "MenuCalendar"
+CACHE_NAME = "days.bin"
+
+MAGIC = b"MCDC"
+FORMAT_VERSION = 1
+# Tăng khi cách dựng chỉ mục lễ (holidays.build_year_index) đổi mà quy tắc không đổi
+ENGINE_REVISION = 2
+MAX_OBSERVANCES = 3
+LEAP_FLAG = 0x01
+
+# magic, định dạng, kích thước bản ghi, engine, múi giờ, ordinal đầu, số ngày
+HEADER = struct.Struct("<4sHH16sdii")
+# năm âm, tháng âm, ngày âm, cờ, MAX_OBSERVANCES mã lễ 1 byte (0: không có)
+RECORD = struct.Struct(f"<HBBB{MAX_OBSERVANCES}s")
+
+# Mọi Observance có thể xuất hiện; mã lễ trong file là vị trí trong danh sách + 1
+CATALOG = tuple(
+    [Observance(name, "solar", public) for _, _, name, public in SOLAR_RULES]
+    + [Observance(name, "lunar", public) for _, _, name, public in LUNAR_RULES]
+    + [Observance(name, "monthly", False) for _, name in MONTHLY_RULES]
+    + [Observance(name, "term", False) for name in SOLAR_TERMS]
+)
+_CODES = {observance: code for code, observance in enumerate(CATALOG, 1)}
+# Chuỗi mã lễ -> tuple Observance; chỉ có vài trăm tổ hợp nên giữ hết
+_OBSERVANCES = {bytes(MAX_OBSERVANCES): NO_OBSERVANCES}
+
+
+def _decode(codes):
+    observances = _OBSERVANCES.get(codes)
+    if observances is None:
+        observances = _OBSERVANCES[codes] = tuple(CATALOG[code - 1] for code in codes if code)
+    return observances
+
+
+def user_cache_dir():
+    """Thư mục cache của người dùng: ~/Library/Caches trên macOS, XDG cache ở nơi khác."""
+    override = os.environ.get("MENU_CALENDAR_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~/Library/Caches"), APP_NAME)
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache, APP_NAME)
+
+
+def default_cache_path():
+    return os.path.join(user_cache_dir(), CACHE_NAME)
+
+
+def engine_version():
+    """Mã băm 16 byte của mọi dữ liệu đầu vào quyết định nội dung file.
+
+    Gồm bảng năm âm lịch, các quy tắc lễ (cả ngày tháng lẫn tên), danh mục mã lễ
+    và phiên bản thuật toán tiết khí.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((FORMAT_VERSION, ENGINE_REVISION, ALGORITHM_VERSION, lunar.FIRST_LUNAR_YEAR)).encode())
+    digest.update(lunar.YEAR_TABLE.tobytes())
+    digest.update(repr((LUNAR_RULES, MONTHLY_RULES, SOLAR_RULES)).encode())
+    digest.update(repr(CATALOG).encode())
+    return digest.digest()
+
+
+def build_records(tz=VIETNAM_TZ):
+    """Nội dung file (header + bản ghi) cho mọi ngày từ lunar.MIN_ORDINAL tới MAX_ORDINAL."""
+    first, last = lunar.MIN_ORDINAL, lunar.MAX_ORDINAL
+    count = last - first + 1
+    buffer = bytearray(HEADER.size + count * RECORD.size)
+    HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, RECORD.size, engine_version(), tz, first, count)
+    index = {}
+    for year in range(date.fromordinal(first).year, date.fromordinal(last).year + 1):
+        index.update(build_year_index(year, tz))
+    for lunar_year in range(lunar.FIRST_LUNAR_YEAR, lunar.LAST_LUNAR_YEAR + 1):
+        for month, leap, start, length in lunar.lunar_months(lunar_year):
+            flags = LEAP_FLAG if leap else 0
+            for day in range(1, length + 1):
+                ordinal = start + day - 1
+                codes = [_CODES[observance] for observance in index.get(ordinal, NO_OBSERVANCES)]
+                if len(codes) > MAX_OBSERVANCES:
+                    raise ValueError(f"{date.fromordinal(ordinal)} có {len(codes)} lễ, tối đa {MAX_OBSERVANCES}")
+                RECORD.pack_into(buffer, HEADER.size + (ordinal - first) * RECORD.size,
+                                 lunar_year, month, day, flags, bytes(codes))
+    return bytes(buffer)
+
+
+def write_cache(path=None, tz=VIETNAM_TZ):
+    """Tính và ghi file cache một cách nguyên tử; trả về đường dẫn."""
+    path = path or default_cache_path()
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    data = build_records(tz)
+    import tempfile
+    fd, temp = tempfile.mkstemp(prefix="." + CACHE_NAME + ".", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+class DayCache:
+    """Tra ngày âm và lễ của từng ordinal thẳng trên trang nhớ của file đã mmap.
+
+    Chỉ đọc nên dùng chung được giữa luồng chính và luồng vẽ nền.
+    """
+
+    def __init__(self, mapped, tz, first, count):
+        self._map = mapped
+        self.tz = tz
+        self.first = first
+        self.count = count
+        self.last = first + count - 1
+
+    @classmethod
+    def open(cls, path=None, tz=VIETNAM_TZ):
+        """Mmap file cache; None nếu chưa có, hỏng hoặc khác phiên bản / múi giờ."""
+        path = path or default_cache_path()
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mapped) >= HEADER.size:
+            magic, version, size, engine, file_tz, first, count = HEADER.unpack_from(mapped, 0)
+            if (magic == MAGIC and version == FORMAT_VERSION and size == RECORD.size and file_tz == tz
+                    and engine == engine_version() and len(mapped) == HEADER.size + count * RECORD.size):
+                return cls(mapped, tz, first, count)
+        mapped.close()
+        return None
+
+    @classmethod
+    def load(cls, path=None, tz=VIETNAM_TZ):
+        """Như `open`, nhưng ghi lại file trước nếu chưa dùng được; None nếu không ghi được."""
+        cache = cls.open(path, tz)
+        if cache is not None:
+            return cache
+        try:
+            path = write_cache(path, tz)
+        except OSError as e:
+            logging.error(f"Error writing day cache: {str(e)}")
+            return None
+        return cls.open(path, tz)
+
+    def covers(self, first, last):
+        return self.first <= first and last <= self.last
+
+    def record(self, ordinal):
+        """(năm âm, tháng âm, ngày âm, nhuận, tuple Observance) của một ordinal trong file."""
+        if not self.first <= ordinal <= self.last:
+            raise ValueError(f"Ordinal {ordinal} nằm ngoài cache")
+        year, month, day, flags, codes = RECORD.unpack_from(self._map, HEADER.size + (ordinal - self.first) * RECORD.size)
+        return year, month, day, bool(flags & LEAP_FLAG), _decode(codes)
+
+    def lunar(self, ordinal):
+        return self.record(ordinal)[:4]
+
+    def observances(self, ordinal):
+        return self.record(ordinal)[4]
+
+    def records(self, first, count):
+        """Danh sách `record` cho `count` ngày liên tiếp từ `first` (một lát cắt của file)."""
+        if not self.covers(first, first + count - 1):
+            raise ValueError(f"Khoảng {first}+{count} nằm ngoài cache")
+        offset = HEADER.size + (first - self.first) * RECORD.size
+        return [(year, month, day, bool(flags & LEAP_FLAG), _decode(codes))
+                for year, month, day, flags, codes in RECORD.iter_unpack(self._map[offset:offset + count * RECORD.size])]
+
+    def close(self):
+        self._map.close()
+
+
+if __name__ == "__main__":
+    # python -m calendar_core.daycache [đường dẫn]: ghi lại file cache
+    import time
+    started = time.perf_counter()
+    written = write_cache(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"{written}: {os.path.getsize(written)} byte, {time.perf_counter() - started:.2f} s")
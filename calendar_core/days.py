@@ -0,0 +1,183 @@
+"""Duyệt từng ngày trên khoảng ngày bất kỳ với bộ nhớ không đổi.
+
+`iter_day_chunks` tính theo khối (mặc định 1024 ngày) vào các mảng cột;
+`iter_days` dựng `DayRecord` từ các khối đó. Dùng chung bảng âm lịch với
+popover nên kết quả khớp với lịch hiển thị.
+"""
+from array import array
+from datetime import date, timedelta
+
+from calendar_core.lunar import convert_range
+
+CAN = ["Giáp", "Ất", "Bính", "Đinh", "Mậu", "Kỷ", "Canh", "Tân", "Nhâm", "Quý"]
+CHI = ["Tý", "Sửu", "Dần", "Mão", "Thìn", "Tỵ", "Ngọ", "Mùi", "Thân", "Dậu", "Tuất", "Hợi"]
+
+# date(1, 1, 1).toordinal() == 1 ứng với số ngày Julius 1721426
+JDN_OFFSET = 1721425
+
+CHUNK_DAYS = 1024
+
+
+def can_chi_year(lunar_year):
+    return f"{CAN[(lunar_year + 6) % 10]} {CHI[(lunar_year + 8) % 12]}"
+
+
+def can_chi_month(lunar_year, lunar_month):
+    # Tháng nhuận dùng can chi của tháng chính
+    return f"{CAN[(lunar_year * 12 + lunar_month + 3) % 10]} {CHI[(lunar_month + 1) % 12]}"
+
+
+def can_chi_day(ordinal):
+    jdn = ordinal + JDN_OFFSET
+    return f"{CAN[(jdn + 9) % 10]} {CHI[(jdn + 1) % 12]}"
+
+
+def _iso_year_start(year):
+    # Thứ Hai của tuần chứa ngày 4/1
+    jan4 = date(year, 1, 4).toordinal()
+    return jan4 - (jan4 - 1) % 7
+
+
+class DayChunk:
+    """Một khối ngày liên tiếp lưu theo cột (array), không có đối tượng cho từng ngày."""
+
+    __slots__ = ("first_ordinal", "count", "weekday", "iso_year", "iso_week",
+                 "lunar_year", "lunar_month", "lunar_day", "lunar_leap")
+
+    def __init__(self, first_ordinal, count):
+        self.first_ordinal = first_ordinal
+        self.count = count
+        self.weekday = array('b')
+        self.iso_year = array('h')
+        self.iso_week = array('b')
+        self.lunar_year = array('h')
+        self.lunar_month = array('b')
+        self.lunar_day = array('b')
+        self.lunar_leap = array('b')
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        return DayRecord(self, index)
+
+
+def _build_chunk(first_ordinal, count):
+    chunk = DayChunk(first_ordinal, count)
+    first = date.fromordinal(first_ordinal)
+    iso_year = first.isocalendar()[0]
+    iso_start = _iso_year_start(iso_year)
+    next_iso_start = _iso_year_start(iso_year + 1)
+    weekday = first.weekday()
+    for offset, (lunar_year, lunar_month, lunar_day, leap) in enumerate(convert_range(first_ordinal, count)):
+        ordinal = first_ordinal + offset
+        if ordinal >= next_iso_start:
+            iso_year += 1
+            iso_start, next_iso_start = next_iso_start, _iso_year_start(iso_year + 1)
+        chunk.weekday.append(weekday)
+        chunk.iso_year.append(iso_year)
+        chunk.iso_week.append((ordinal - iso_start) // 7 + 1)
+        chunk.lunar_year.append(lunar_year)
+        chunk.lunar_month.append(lunar_month)
+        chunk.lunar_day.append(lunar_day)
+        chunk.lunar_leap.append(leap)
+        weekday = (weekday + 1) % 7
+    return chunk
+
+
+def _ordinal(value):
+    return value if isinstance(value, int) else value.toordinal()
+
+
+def iter_day_chunks(start, end, chunk_days=CHUNK_DAYS):
+    """Sinh các DayChunk phủ từ `start` đến `end` (date hoặc ordinal, tính cả hai đầu)."""
+    first, last = _ordinal(start), _ordinal(end)
+    while first <= last:
+        count = min(chunk_days, last - first + 1)
+        yield _build_chunk(first, count)
+        first += count
+
+
+def iter_days(start, end, chunk_days=CHUNK_DAYS):
+    """Sinh DayRecord cho mỗi ngày từ `start` đến `end` (tính cả hai đầu).
+
+    Bộ nhớ chỉ phụ thuộc `chunk_days`, không phụ thuộc độ dài khoảng ngày.
+    """
+    for chunk in iter_day_chunks(start, end, chunk_days):
+        for index in range(chunk.count):
+            yield DayRecord(chunk, index)
+
+
+class DayRecord:
+    """Thông tin một ngày: dương lịch, thứ, tuần ISO, âm lịch, nhuận, can chi.
+
+    Chỉ giữ tham chiếu tới khối và vị trí; các trường được đọc từ mảng cột khi truy cập.
+    """
+
+    __slots__ = ("_chunk", "_index")
+
+    def __init__(self, chunk, index):
+        self._chunk = chunk
+        self._index = index
+
+    @property
+    def ordinal(self):
+        return self._chunk.first_ordinal + self._index
+
+    @property
+    def date(self):
+        return date.fromordinal(self.ordinal)
+
+    @property
+    def weekday(self):
+        """0 = thứ Hai ... 6 = Chủ nhật."""
+        return self._chunk.weekday[self._index]
+
+    @property
+    def iso_week(self):
+        """(năm ISO, tuần ISO)."""
+        return self._chunk.iso_year[self._index], self._chunk.iso_week[self._index]
+
+    @property
+    def lunar(self):
+        """(năm, tháng, ngày, nhuận) âm lịch."""
+        chunk, i = self._chunk, self._index
+        return chunk.lunar_year[i], chunk.lunar_month[i], chunk.lunar_day[i], bool(chunk.lunar_leap[i])
+
+    @property
+    def lunar_leap(self):
+        return bool(self._chunk.lunar_leap[self._index])
+
+    @property
+    def can_chi_day(self):
+        return can_chi_day(self.ordinal)
+
+    @property
+    def can_chi_month(self):
+        return can_chi_month(self._chunk.lunar_year[self._index], self._chunk.lunar_month[self._index])
+
+    @property
+    def can_chi_year(self):
+        return can_chi_year(self._chunk.lunar_year[self._index])
+
+    def as_dict(self):
+        lunar_year, lunar_month, lunar_day, leap = self.lunar
+        iso_year, iso_week = self.iso_week
+        return {
+            "date": self.date.isoformat(),
+            "weekday": self.weekday,
+            "iso_year": iso_year,
+            "iso_week": iso_week,
+            "lunar_year": lunar_year,
+            "lunar_month": lunar_month,
+            "lunar_day": lunar_day,
+            "lunar_leap": leap,
+            "can_chi_day": self.can_chi_day,
+            "can_chi_month": self.can_chi_month,
+            "can_chi_year": self.can_chi_year,
+        }
+
+    def __repr__(self):
+        lunar_year, lunar_month, lunar_day, leap = self.lunar
+        return (f"DayRecord({self.date}, âm {lunar_day}/{lunar_month}{'n' if leap else ''}/{lunar_year}, "
+                f"{self.can_chi_day})")
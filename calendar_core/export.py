@@ -0,0 +1,331 @@
+"""Xuất lưới tháng ra PNG, văn bản hoặc JSON mà không cần AppKit.
+
+Dùng chung `build_month_layout` và `HolidayCalendar` với CalendarView nên cùng
+quy tắc: tuần bắt đầu từ thứ Hai ("T2" … "CN"), tô màu cuối tuần ở tiêu đề
+cột, đánh dấu hôm nay, ngày âm lịch và ngày lễ. Ảnh PNG mượn kiểu vẽ (font,
+dải tiêu đề đỏ) của images/generate_calendar_day_png.py.
+
+`export_months()` chia các tháng cho một process pool; mỗi process tự ghi file
+của tháng mình ngay khi vẽ xong. Điểm vào dòng lệnh: export_calendar.py.
+"""
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+
+from calendar_core.holidays import HolidayCalendar, cell_marker
+from calendar_core.images import TODAY_DIAMETER
+from calendar_core.layout import CELL_GAP, CELL_HEIGHT, CELL_WIDTH, PADDING, WEEKDAY_LABELS, build_month_layout, shift_month
+
+FORMATS = ("png", "text", "json")
+EXTENSIONS = {"png": "png", "text": "txt", "json": "json"}
+
+ICON_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "images", "generate_calendar_day_png.py")
+
+# Kích thước ảnh tháng theo point, nhân với `scale` khi vẽ
+TITLE_HEIGHT = 44
+WEEKDAY_HEIGHT = 30
+FOOTER_LINE = 14
+BOTTOM_PADDING = 16
+MONTH_WIDTH = 2 * PADDING + 7 * CELL_WIDTH + 6 * CELL_GAP
+
+# Màu hệ thống macOS dùng trong CalendarView (giao diện sáng)
+COLORS = {
+    "background": (255, 255, 255),
+    "weekday": (48, 176, 199),    # systemTeal
+    "weekend": (255, 149, 0),     # systemOrange
+    "day": (0, 0, 0),             # labelColor
+    "holiday": (255, 59, 48),     # systemRed
+    "lunar": (142, 142, 147),     # systemGray
+    "observance": (255, 149, 0),  # systemOrange
+    "footer": (99, 99, 102),
+    "today": (255, 149, 0),       # hình tròn hôm nay, như AppKitImageBackend
+}
+
+# Arial (như icon) không có thì thử font có dấu tiếng Việt khác trước khi dùng font mặc định
+FONT_FALLBACKS = (
+    "DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+
+# Ký hiệu trong bản văn bản
+TEXT_MARKS = {"holiday": "*", "observance": "+", None: " "}
+TEXT_CELL = 7
+
+YEAR_SHEET_COLUMNS = 3
+
+
+@lru_cache(maxsize=None)
+def icon_module():
+    """Nạp images/generate_calendar_day_png.py (không phải package) một lần cho mỗi process."""
+    spec = importlib.util.spec_from_file_location("generate_calendar_day_png", ICON_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def find_font(font=None):
+    found = icon_module().find_font(font)
+    if found is None and font is None:
+        for candidate in FONT_FALLBACKS:
+            found = icon_module().find_font(candidate)
+            if found is not None:
+                break
+    return found
+
+
+@lru_cache(maxsize=None)
+def _font(font_path, size):
+    if font_path is None:
+        from PIL import ImageFont
+
+        return ImageFont.load_default(size)
+    return icon_module().load_font(font_path, size)[0]
+
+
+def month_dict(layout):
+    """Lưới tháng dạng dict (sẵn sàng cho json.dump)."""
+    cells = []
+    for cell in layout.cells:
+        cells.append({
+            "date": date.fromordinal(cell.ordinal).isoformat(),
+            "row": cell.row,
+            "col": cell.col,
+            "day": cell.day,
+            "in_month": cell.in_month,
+            "today": cell.is_today,
+            "weekend": cell.is_weekend,
+            "lunar": None if cell.lunar_day is None else {
+                "year": cell.lunar_year, "month": cell.lunar_month, "day": cell.lunar_day, "leap": cell.lunar_leap},
+            "lunar_text": cell.lunar_text,
+            "marker": cell_marker(cell.observances),
+            "observances": [{"name": o.name, "kind": o.kind, "public": o.public} for o in cell.observances],
+        })
+    return {
+        "year": layout.year,
+        "month": layout.month,
+        "title": layout.title,
+        "weeks": layout.weeks,
+        "weekdays": WEEKDAY_LABELS,
+        "today": layout.today.isoformat() if layout.today else None,
+        "cells": cells,
+    }
+
+
+def _observance_lines(layout):
+    return [f"{date.fromordinal(cell.ordinal).day:>2}/{layout.month}: " + ", ".join(o.name for o in cell.observances)
+            for cell in layout.cells if cell.observances]
+
+
+def month_text(layout):
+    """Lưới tháng dạng văn bản: mỗi tuần hai dòng (ngày dương, ngày âm).
+
+    [5] là hôm nay, * ngày nghỉ lễ, + ngày lễ / tiết khí khác; danh sách tên ở cuối.
+    """
+    width = TEXT_CELL * 7
+    lines = [layout.title.center(width).rstrip(), "".join(label.center(TEXT_CELL) for label in WEEKDAY_LABELS).rstrip()]
+    for row in range(layout.weeks):
+        days, lunar = [], []
+        for cell in layout.cells[row * 7:row * 7 + 7]:
+            if not cell.in_month:
+                days.append(" " * TEXT_CELL)
+                lunar.append(" " * TEXT_CELL)
+                continue
+            text = f"[{cell.day}]" if cell.is_today else str(cell.day)
+            days.append((text + TEXT_MARKS[cell_marker(cell.observances)]).center(TEXT_CELL))
+            lunar.append(cell.lunar_text.center(TEXT_CELL))
+        lines.append("".join(days).rstrip())
+        lines.append("".join(lunar).rstrip())
+    observances = _observance_lines(layout)
+    if observances:
+        lines.append("")
+        lines.extend(observances)
+    return "\n".join(lines) + "\n"
+
+
+def month_image_size(layout, scale=1):
+    height = (TITLE_HEIGHT + WEEKDAY_HEIGHT + layout.weeks * CELL_HEIGHT
+              + len(_observance_lines(layout)) * FOOTER_LINE + BOTTOM_PADDING)
+    return MONTH_WIDTH * scale, height * scale
+
+
+def render_month_png(layout, scale=2, font_path=None):
+    """Vẽ lưới tháng thành ảnh Pillow RGB (cạnh tính theo point × `scale`)."""
+    from PIL import Image, ImageDraw
+
+    template = icon_module().TEMPLATE
+    image = Image.new("RGB", month_image_size(layout, scale), COLORS["background"])
+    draw = ImageDraw.Draw(image)
+
+    # Dải tiêu đề đỏ như phần đầu icon ngày
+    draw.rounded_rectangle([0, 0, image.width, TITLE_HEIGHT * scale], radius=round(template["radius"] * scale / 4),
+                           fill=template["header_color"], corners=(True, True, False, False))
+    draw.text((image.width // 2, TITLE_HEIGHT * scale // 2), layout.title, anchor="mm",
+              fill=template["body_color"], font=_font(font_path, 20 * scale))
+
+    top = TITLE_HEIGHT * scale
+    for col, label in enumerate(WEEKDAY_LABELS):
+        x = (PADDING + col * (CELL_WIDTH + CELL_GAP) + CELL_WIDTH // 2) * scale
+        draw.text((x, top + WEEKDAY_HEIGHT * scale // 2), label, anchor="mm",
+                  fill=COLORS["weekend" if col >= 5 else "weekday"], font=_font(font_path, 15 * scale))
+
+    grid_top = top + WEEKDAY_HEIGHT * scale
+    day_font, lunar_font = _font(font_path, 12 * scale), _font(font_path, 9 * scale)
+    for cell in layout.cells:
+        if not cell.in_month:
+            continue
+        x = (PADDING + cell.col * (CELL_WIDTH + CELL_GAP) + CELL_WIDTH // 2) * scale
+        y = grid_top + cell.row * CELL_HEIGHT * scale
+        marker = cell_marker(cell.observances)
+        day_center = (x, y + 17 * scale)
+        if cell.is_today:
+            radius = TODAY_DIAMETER * scale // 2
+            draw.ellipse([x - radius, day_center[1] - radius, x + radius, day_center[1] + radius], fill=COLORS["today"])
+            color = COLORS["day"]
+        else:
+            color = COLORS["holiday" if marker == "holiday" else "day"]
+        draw.text(day_center, str(cell.day), anchor="mm", fill=color, font=day_font)
+        draw.text((x, y + 40 * scale), cell.lunar_text, anchor="mm",
+                  fill=COLORS["observance" if marker else "lunar"], font=lunar_font)
+
+    footer_top = grid_top + layout.weeks * CELL_HEIGHT * scale
+    footer_font = _font(font_path, 10 * scale)
+    for index, line in enumerate(_observance_lines(layout)):
+        draw.text((PADDING * scale, footer_top + index * FOOTER_LINE * scale), line,
+                  fill=COLORS["footer"], font=footer_font)
+    return image
+
+
+def month_range(start, end):
+    """Các (năm, tháng) từ `start` tới `end` (cả hai đầu), mỗi đầu là (năm, tháng)."""
+    months = []
+    current = start
+    while current <= end:
+        months.append(current)
+        current = shift_month(*current, 1)
+    return months
+
+
+def output_path(out_dir, year, month, fmt):
+    return os.path.join(out_dir, f"{year:04d}-{month:02d}.{EXTENSIONS[fmt]}")
+
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+# Trạng thái riêng mỗi process vẽ, khởi tạo một lần trong _init_worker
+_worker = {}
+
+
+def _init_worker(today, font_path, scale):
+    _worker.update(holidays=HolidayCalendar(maxsize=2), today=today, font_path=font_path, scale=scale)
+
+
+def _export_month(job):
+    """Dựng và xuất một tháng; ghi file (out_dir) hoặc trả về nội dung (out_dir None, chỉ text/json)."""
+    year, month, formats, out_dir = job
+    layout = build_month_layout(year, month, _worker["today"], _worker["holidays"])
+    outputs = {}
+    for fmt in formats:
+        if fmt == "json":
+            data = json.dumps(month_dict(layout), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        elif fmt == "text":
+            data = month_text(layout).encode("utf-8")
+        else:
+            import io
+
+            buffer = io.BytesIO()
+            render_month_png(layout, _worker["scale"], _worker["font_path"]).save(buffer, "PNG")
+            data = buffer.getvalue()
+        if out_dir is None:
+            outputs[fmt] = data
+        else:
+            path = output_path(out_dir, year, month, fmt)
+            outputs[fmt] = (path, _write_atomic(path, data))
+    return year, month, outputs
+
+
+def build_year_sheet(out_dir, year):
+    """Ghép 12 ảnh tháng đã xuất của `year` thành một trang lịch năm; trả về đường dẫn."""
+    from PIL import Image
+
+    months = [Image.open(output_path(out_dir, year, month, "png")) for month in range(1, 13)]
+    try:
+        width, height = months[0].width, max(image.height for image in months)
+        rows = (len(months) + YEAR_SHEET_COLUMNS - 1) // YEAR_SHEET_COLUMNS
+        sheet = Image.new("RGB", (width * YEAR_SHEET_COLUMNS, height * rows), COLORS["background"])
+        for index, image in enumerate(months):
+            sheet.paste(image, ((index % YEAR_SHEET_COLUMNS) * width, (index // YEAR_SHEET_COLUMNS) * height))
+    finally:
+        for image in months:
+            image.close()
+    path = os.path.join(out_dir, f"{year:04d}.png")
+    sheet.save(path, "PNG")
+    return path
+
+
+def export_months(months, formats, out_dir=None, today=None, workers=None, scale=2, font=None,
+                  year_sheets=False, on_month=None):
+    """Xuất các tháng `months` theo `formats`, trả về dict thống kê.
+
+    `out_dir` None: không ghi file, `on_month(year, month, outputs)` nhận nội dung
+    (bytes theo định dạng) theo đúng thứ tự tháng. Ngược lại mỗi tháng được ghi
+    ngay khi vẽ xong và `on_month` nhận {định dạng: (đường dẫn, số byte)}.
+    `workers` 1 thì chạy ngay trên process hiện tại.
+    """
+    formats = tuple(formats)
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Định dạng không hỗ trợ: {', '.join(sorted(unknown))}")
+    if out_dir is None and "png" in formats:
+        raise ValueError("PNG cần thư mục đầu ra")
+    font_path = find_font(font) if "png" in formats else None
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    jobs = [(year, month, formats, out_dir) for year, month in months]
+    initargs = (today, font_path, scale)
+    written = 0
+    sheets = []
+    wanted = set(months)
+    if workers == 1:
+        _init_worker(*initargs)
+        results = map(_export_month, jobs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+        # Kết quả về theo thứ tự tháng; file thì đã được ghi ngay trong process con
+        results = pool.map(_export_month, jobs, chunksize=max(1, min(12, len(jobs) // (4 * (workers or os.cpu_count() or 1)))))
+    try:
+        for year, month, outputs in results:
+            if out_dir is not None:
+                written += sum(size for _, size in outputs.values())
+                if year_sheets and "png" in formats and month == 12 and all((year, m) in wanted for m in range(1, 12)):
+                    sheets.append(build_year_sheet(out_dir, year))
+            else:
+                written += sum(len(data) for data in outputs.values())
+            if on_month is not None:
+                on_month(year, month, outputs)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    elapsed = time.perf_counter() - started
+    return {
+        "months": len(jobs),
+        "formats": formats,
+        "bytes": written,
+        "sheets": sheets,
+        "font": font_path or "default",
+        "seconds": elapsed,
+        "months_per_second": len(jobs) / elapsed if elapsed else float("inf"),
+    }
@@ -0,0 +1,170 @@
+"""Ngày lễ, ngày rằm / mùng 1 và 24 tiết khí, tra theo chỉ mục từng năm.
+
+`build_year_index(year)` tính một lần cho cả năm dương lịch một dict
+ordinal -> tuple các `Observance`; sau đó mỗi ô lịch chỉ cần một lần tra dict.
+`HolidayCalendar` giữ các chỉ mục đó trong một LRU nhỏ.
+
+Lễ theo âm lịch chỉ rơi vào tháng chính, không lặp lại ở tháng nhuận; riêng
+mùng 1 và rằm thì tháng nhuận cũng có, còn lễ cuối tháng (Giao thừa) rơi vào
+ngày cuối của tháng nhuận nếu tháng đó có nhuận.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import date
+
+from calendar_core.astro import SOLAR_TERMS, VIETNAM_TZ, solar_terms
+from calendar_core.lunar import FIRST_LUNAR_YEAR, LAST_LUNAR_YEAR, lunar_months
+
+# kind: "lunar" (lễ âm lịch), "monthly" (mùng 1 / rằm), "solar" (lễ dương lịch), "term" (tiết khí)
+# public: ngày nghỉ lễ chính thức
+Observance = namedtuple("Observance", ["name", "kind", "public"])
+
+# (tháng, ngày, tên, nghỉ lễ); ngày -1 là ngày cuối tháng (29 hoặc 30)
+LUNAR_RULES = [
+    (1, 1, "Tết Nguyên Đán", True),
+    (1, 2, "Mùng 2 Tết", True),
+    (1, 3, "Mùng 3 Tết", True),
+    (1, 15, "Rằm tháng Giêng", False),
+    (3, 3, "Tết Hàn thực", False),
+    (3, 10, "Giỗ Tổ Hùng Vương", True),
+    (4, 15, "Lễ Phật đản", False),
+    (5, 5, "Tết Đoan ngọ", False),
+    (7, 15, "Vu Lan", False),
+    (8, 15, "Tết Trung thu", False),
+    (12, 23, "Ông Công Ông Táo", False),
+    (12, -1, "Giao thừa", False),
+]
+
+# (ngày, tên) áp dụng cho mọi tháng âm lịch, kể cả tháng nhuận
+MONTHLY_RULES = [
+    (1, "Mùng 1"),
+    (15, "Rằm"),
+]
+
+# (tháng, ngày, tên, nghỉ lễ)
+SOLAR_RULES = [
+    (1, 1, "Tết Dương lịch", True),
+    (2, 3, "Ngày thành lập Đảng", False),
+    (2, 14, "Lễ Tình nhân", False),
+    (3, 8, "Quốc tế Phụ nữ", False),
+    (4, 30, "Ngày Giải phóng miền Nam", True),
+    (5, 1, "Quốc tế Lao động", True),
+    (5, 19, "Ngày sinh Chủ tịch Hồ Chí Minh", False),
+    (6, 1, "Quốc tế Thiếu nhi", False),
+    (7, 27, "Ngày Thương binh Liệt sĩ", False),
+    (9, 2, "Quốc khánh", True),
+    (10, 20, "Ngày Phụ nữ Việt Nam", False),
+    (11, 20, "Ngày Nhà giáo Việt Nam", False),
+    (12, 22, "Ngày Quân đội Nhân dân", False),
+    (12, 24, "Lễ Giáng sinh", False),
+]
+
+NO_OBSERVANCES = ()
+
+
+def _add(index, ordinal, observance):
+    index[ordinal] = index.get(ordinal, NO_OBSERVANCES) + (observance,)
+
+
+def build_year_index(year, tz=VIETNAM_TZ):
+    """Dict ordinal -> tuple Observance cho mọi ngày có sự kiện trong năm dương `year`.
+
+    Ngoài phạm vi bảng âm lịch thì chỉ còn lễ dương lịch và tiết khí.
+    """
+    first = date(year, 1, 1).toordinal()
+    end = date(year + 1, 1, 1).toordinal()
+    index = {}
+
+    for month, day, name, public in SOLAR_RULES:
+        _add(index, date(year, month, day).toordinal(), Observance(name, "solar", public))
+
+    # Năm dương `year` nằm trong năm âm `year - 1` (trước Tết) và năm âm `year`
+    lunar_rules = {}
+    for month, day, name, public in LUNAR_RULES:
+        lunar_rules.setdefault(month, []).append((day, Observance(name, "lunar", public)))
+    monthly = [(day, Observance(name, "monthly", False)) for day, name in MONTHLY_RULES]
+    for lunar_year in (year - 1, year):
+        if not FIRST_LUNAR_YEAR <= lunar_year <= LAST_LUNAR_YEAR:
+            continue
+        months = lunar_months(lunar_year)
+        leap_month = next((month for month, leap, _, _ in months if leap), None)
+        for month, leap, start, length in months:
+            if start + length <= first or start >= end:
+                continue
+            specific = set()
+            # Lễ cuối tháng (Giao thừa) thuộc lần cuối của số tháng đó: tháng nhuận nếu có
+            final = leap or month != leap_month
+            for day, observance in lunar_rules.get(month, ()):
+                if (day == -1 and final) or (day != -1 and not leap):
+                    ordinal = start + (length if day == -1 else day) - 1
+                    if first <= ordinal < end:
+                        _add(index, ordinal, observance)
+                        specific.add(ordinal)
+            for day, observance in monthly:
+                ordinal = start + day - 1
+                # Bỏ "Mùng 1" / "Rằm" khi ngày đó đã có lễ riêng (Tết, Rằm tháng Giêng...)
+                if first <= ordinal < end and ordinal not in specific:
+                    _add(index, ordinal, observance)
+
+    for ordinal, term in solar_terms(year, tz):
+        _add(index, ordinal, Observance(SOLAR_TERMS[term], "term", False))
+    return index
+
+
+def cell_marker(observances):
+    """Kiểu đánh dấu cho ô lịch: "holiday" (nghỉ lễ), "observance" (lễ / tiết khí) hoặc None."""
+    marker = None
+    for observance in observances:
+        if observance.public:
+            return "holiday"
+        if observance.kind != "monthly":
+            marker = "observance"
+    return marker
+
+
+class HolidayCalendar:
+    """LRU các chỉ mục năm; `observances(ordinal)` là một lần tra dict khi năm đã có trong cache.
+
+    Nếu có `days` (DayCache cùng múi giờ), `observances` đọc thẳng từ file cache
+    cho các ngày file phủ tới mà không dựng chỉ mục năm.
+    """
+
+    def __init__(self, maxsize=4, tz=VIETNAM_TZ, days=None):
+        self.maxsize = maxsize
+        self.tz = tz
+        self.days = days if days is not None and days.tz == tz else None
+        self._years = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._years)
+
+    def year_index(self, year):
+        with self._lock:
+            index = self._years.get(year)
+            if index is not None:
+                self.hits += 1
+                self._years.move_to_end(year)
+                return index
+            self.misses += 1
+        # Dựng ngoài khoá để luồng vẽ nền không chặn luồng chính
+        index = build_year_index(year, self.tz)
+        with self._lock:
+            self._years[year] = index
+            if len(self._years) > self.maxsize:
+                self._years.popitem(last=False)
+        return index
+
+    def observances(self, value):
+        """Tuple Observance của một ngày (datetime.date hoặc ordinal)."""
+        ordinal = value.toordinal() if isinstance(value, date) else value
+        if self.days is not None and self.days.covers(ordinal, ordinal):
+            return self.days.observances(ordinal)
+        day = value if isinstance(value, date) else date.fromordinal(value)
+        return self.year_index(day.year).get(day.toordinal(), NO_OBSERVANCES)
+
+    def clear(self):
+        with self._lock:
+            self._years.clear()
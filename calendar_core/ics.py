@@ -0,0 +1,660 @@
+"""Nhập sự kiện từ file .ics để đánh dấu các ngày có sự kiện trên lưới tháng.
+
+- Đọc file qua mmap và một biểu thức chính quy chạy trên toàn bộ vùng nhớ:
+  chỉ các dòng cần thiết (BEGIN/END, DTSTART, DTEND, DURATION, RRULE, EXDATE,
+  RECURRENCE-ID, UID) được đưa lên Python, không giữ cả file trong bộ nhớ.
+- Chỉ quan tâm tới ngày: sự kiện được lưu thành khoảng ordinal [đầu, cuối]
+  (tính cả hai đầu) trong các mảng `array`, không tạo đối tượng cho mỗi sự kiện.
+- `EventIndex` sắp xếp khoảng theo ngày bắt đầu; truy vấn một cửa sổ (ví dụ
+  42 ô của tháng) là một lần bisect rồi quét. Sự kiện lặp lại được khai triển
+  sẵn trong vài năm quanh năm hiện tại; xa hơn mới khai triển theo truy vấn.
+- `EventStore` nhớ mtime / kích thước / hash của từng file và chỉ phân tích
+  lại file đã đổi.
+
+Hỗ trợ một tập con của RRULE: FREQ (DAILY, WEEKLY, MONTHLY, YEARLY), INTERVAL,
+COUNT, UNTIL, BYDAY, BYMONTHDAY, BYMONTH. Giờ có TZID được tính theo giờ ghi
+trong file; giờ UTC (hậu tố Z) được đổi sang giờ máy.
+"""
+import mmap
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+APP_NAME = "MenuCalendar"
+
+# Sự kiện dài hơn ngưỡng này nằm trong danh sách riêng để cửa sổ bisect luôn hẹp
+LONG_SPAN = 31
+
+# Giới hạn an toàn khi khai triển RRULE có COUNT rất lớn
+MAX_COUNT = 100000
+
+# Số năm trước và sau năm hiện tại mà EventIndex khai triển sẵn các luật lặp
+EXPAND_YEARS = 3
+
+# Ordinal lớn nhất dùng làm "vô hạn" khi khai triển hết một luật có COUNT
+_FAR_FUTURE = date(9999, 12, 31).toordinal()
+
+_LINE = re.compile(
+    rb"^(BEGIN:VEVENT|END:VEVENT|BEGIN:VALARM|END:VALARM"
+    rb"|DTSTART|DTEND|DURATION|RRULE|EXDATE|RECURRENCE-ID|UID)([;:][^\r\n]*)?(\r?\n[ \t])?",
+    re.M)
+_CONTINUATION = re.compile(rb"\r?\n[ \t]")
+_DURATION = re.compile(r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+
+
+def user_calendar_dir():
+    """Thư mục chứa file .ics của người dùng (đổi bằng biến môi trường MENU_CALENDAR_ICS_DIR)."""
+    override = os.environ.get("MENU_CALENDAR_ICS_DIR")
+    if override:
+        return override
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~/Library/Application Support"), APP_NAME, "calendars")
+    data = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(data, APP_NAME, "calendars")
+
+
+class IcsError(ValueError):
+    pass
+
+
+def _value(raw):
+    """Phần giá trị (sau dấu ':' phân cách tham số) của một dòng thuộc tính."""
+    text = raw.decode("utf-8", "replace")
+    if text.startswith(":"):
+        return text[1:]
+    # Tham số có thể chứa ':' trong ngoặc kép (TZID="..."), giá trị thì không
+    _, sep, tail = text.rpartition(":")
+    if not sep:
+        raise IcsError(f"Dòng thuộc tính không có giá trị: {text!r}")
+    return tail
+
+
+class _Stamp:
+    """Một giá trị DATE / DATE-TIME đã đổi sang ngày địa phương."""
+
+    __slots__ = ("ordinal", "seconds", "all_day")
+
+    def __init__(self, ordinal, seconds, all_day):
+        self.ordinal = ordinal
+        self.seconds = seconds
+        self.all_day = all_day
+
+
+# Bộ nhớ đệm khi phân tích: ngày "YYYYMMDD" -> ordinal, giờ UTC "YYYYMMDDTHH" -> (ordinal, giây) địa phương
+_DAY_ORDINALS = {}
+_UTC_HOURS = {}
+_CACHE_LIMIT = 65536
+
+
+def _day_ordinal(text):
+    ordinal = _DAY_ORDINALS.get(text)
+    if ordinal is None:
+        if len(_DAY_ORDINALS) >= _CACHE_LIMIT:
+            _DAY_ORDINALS.clear()
+        ordinal = _DAY_ORDINALS[text] = date(int(text[0:4]), int(text[4:6]), int(text[6:8])).toordinal()
+    return ordinal
+
+
+def _utc_hour(text):
+    local = _UTC_HOURS.get(text)
+    if local is None:
+        if len(_UTC_HOURS) >= _CACHE_LIMIT:
+            _UTC_HOURS.clear()
+        moment = datetime(int(text[0:4]), int(text[4:6]), int(text[6:8]), int(text[9:11]), tzinfo=timezone.utc)
+        moment = moment.astimezone()
+        local = _UTC_HOURS[text] = (moment.toordinal(), moment.hour * 3600 + moment.minute * 60)
+    return local
+
+
+def _parse_stamp(value):
+    try:
+        if len(value) == 8:
+            return _Stamp(_day_ordinal(value), 0, True)
+        seconds = int(value[13:15]) + 60 * int(value[11:13])
+        if value.endswith("Z"):
+            # Độ lệch múi giờ không đổi trong một giờ UTC: đổi theo giờ rồi cộng phút, giây
+            ordinal, base = _utc_hour(value[:11])
+            seconds += base
+            if seconds >= 86400:
+                ordinal, seconds = ordinal + 1, seconds - 86400
+        else:
+            ordinal = _day_ordinal(value[:8])
+            seconds += 3600 * int(value[9:11])
+            if value[8] != "T" or not 0 <= seconds < 86400:
+                raise ValueError(value)
+        return _Stamp(ordinal, seconds, False)
+    except (ValueError, IndexError):
+        raise IcsError(f"Ngày giờ không hợp lệ: {value!r}") from None
+
+
+@lru_cache(maxsize=256)
+def parse_duration(value):
+    """Đổi DURATION kiểu RFC 5545 (P1W, P2D, PT1H30M, -P1D...) sang timedelta."""
+    match = _DURATION.match(value.strip())
+    if match is None:
+        raise IcsError(f"DURATION không hợp lệ: {value!r}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                      minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+
+def _end_ordinal(start, dtend, duration):
+    """Ngày cuối cùng (tính cả) mà sự kiện chiếm."""
+    if dtend is not None:
+        end = _parse_stamp(dtend)
+        # DTEND là mốc loại trừ: sự kiện cả ngày / kết thúc đúng 0h không chiếm ngày đó
+        last = end.ordinal - 1 if end.all_day or end.seconds == 0 else end.ordinal
+    elif duration is not None:
+        delta = parse_duration(duration)
+        if start.all_day:
+            last = start.ordinal + max(delta.days, 1) - 1
+        else:
+            total = start.seconds + int(delta.total_seconds())
+            last = start.ordinal + (total - 1) // 86400 if total > 0 else start.ordinal
+    else:
+        last = start.ordinal
+    return max(last, start.ordinal)
+
+
+@lru_cache(maxsize=4096)
+def _month_days(year, month, bymonthday, byday, default_day):
+    """Các ngày (ordinal) trong tháng khớp BYMONTHDAY / BYDAY, mặc định ngày `default_day`.
+
+    Nhiều luật dùng chung một mẫu (ngày cuối tháng, thứ Năm thứ hai...) nên kết quả được nhớ lại.
+    """
+    first = date(year, month, 1).toordinal()
+    length = date(year + month // 12, month % 12 + 1, 1).toordinal() - first
+    days = []
+    if bymonthday:
+        for day in bymonthday:
+            day = day if day > 0 else length + day + 1
+            if 1 <= day <= length:
+                days.append(first + day - 1)
+    elif byday:
+        first_weekday = (first - 1) % 7
+        for nth, weekday in byday:
+            offset = (weekday - first_weekday) % 7
+            matches = range(first + offset, first + length, 7)
+            if nth == 0:
+                days.extend(matches)
+            elif nth and -len(matches) <= nth <= len(matches):
+                days.append(matches[nth - 1] if nth > 0 else matches[nth])
+    elif default_day <= length:
+        days.append(first + default_day - 1)
+    return tuple(sorted(days))
+
+
+class RecurrenceRule:
+    """RRULE của một sự kiện, khai triển theo cửa sổ ngày."""
+
+    __slots__ = ("start", "span", "freq", "interval", "count", "until", "byday", "bymonthday",
+                 "bymonth", "exdates", "uid", "bound", "_fixed", "_weekdays", "_day")
+
+    def __init__(self, start, span, rrule, exdates=(), uid=None):
+        self.start = start
+        self.span = span
+        self.uid = uid
+        self.exdates = set(exdates)
+        self.interval = 1
+        self.count = None
+        self.until = None
+        self.byday = []
+        self.bymonthday = []
+        self.bymonth = []
+        self.freq = None
+        for part in rrule.split(";"):
+            key, _, value = part.partition("=")
+            key = key.strip().upper()
+            value = value.strip().upper()
+            if key == "FREQ":
+                self.freq = value
+            elif key == "INTERVAL":
+                self.interval = max(int(value), 1)
+            elif key == "COUNT":
+                self.count = min(int(value), MAX_COUNT)
+            elif key == "UNTIL":
+                self.until = _parse_stamp(value).ordinal
+            elif key == "BYDAY":
+                for item in value.split(","):
+                    item = item.strip()
+                    self.byday.append((int(item[:-2]) if len(item) > 2 else 0, _WEEKDAYS[item[-2:]]))
+            elif key == "BYMONTHDAY":
+                self.bymonthday = [int(item) for item in value.split(",")]
+            elif key == "BYMONTH":
+                self.bymonth = [int(item) for item in value.split(",")]
+        if self.freq not in _FREQUENCIES:
+            raise IcsError(f"FREQ không được hỗ trợ: {rrule!r}")
+        self.byday = tuple(self.byday)
+        self.bymonthday = tuple(self.bymonthday)
+        self._weekdays = tuple(sorted({weekday for _, weekday in self.byday})) or ((start - 1) % 7,)
+        self._day = date.fromordinal(start).day
+        self._fixed = None
+        self.bound = None
+
+    def prepare(self):
+        """Tính `bound` (ngày cuối cùng có thể bị chiếm, None nếu vô hạn) sau khi đã biết mọi EXDATE.
+
+        Luật có COUNT được khai triển hết một lần thành mảng để các truy vấn sau chỉ cần bisect.
+        Chỉ `parse_buffer` gọi, trước khi luật lọt vào một EventIndex: từ đó luật chỉ
+        được đọc, dù từ luồng nền hay luồng chính.
+        """
+        if self.count is not None:
+            self._fixed = None
+            occurrences = array('l')
+            try:
+                occurrences.extend(self._expand(self.start, _FAR_FUTURE))
+            except (ValueError, OverflowError):
+                # Vượt quá năm 9999: dừng ở lần lặp cuối cùng biểu diễn được
+                pass
+            self._fixed = occurrences
+            self.bound = occurrences[-1] + self.span if occurrences else self.start - 1
+        elif self.until is not None:
+            self.bound = self.until + self.span
+        else:
+            self.bound = None
+
+    def _filter(self, ordinal):
+        if self.bymonth and date.fromordinal(ordinal).month not in self.bymonth:
+            return False
+        if self.freq == "DAILY":
+            if self.byday and (ordinal - 1) % 7 not in [weekday for _, weekday in self.byday]:
+                return False
+            if self.bymonthday and date.fromordinal(ordinal).day not in self.bymonthday:
+                return False
+        return True
+
+    def _first_period(self, first):
+        """Chu kỳ đầu tiên có thể chạm tới ngày `first` (0 nếu phải đếm từ đầu vì COUNT)."""
+        if self.count is not None:
+            return 0
+        begin = first - self.span
+        start = date.fromordinal(self.start)
+        if self.freq == "DAILY":
+            return max(0, (begin - self.start) // self.interval)
+        if self.freq == "WEEKLY":
+            monday = self.start - (self.start - 1) % 7
+            return max(0, (begin - monday) // (7 * self.interval))
+        target = date.fromordinal(max(begin, self.start))
+        if self.freq == "MONTHLY":
+            months = (target.year - start.year) * 12 + target.month - start.month
+            return max(0, months // self.interval - 1)
+        return max(0, (target.year - start.year) // self.interval - 1)
+
+    def _period(self, index):
+        """Các ngày ứng viên (đã sắp xếp) và ngày sớm nhất có thể của chu kỳ `index`."""
+        step = index * self.interval
+        if self.freq == "DAILY":
+            day = self.start + step
+            return [day], day
+        if self.freq == "WEEKLY":
+            monday = self.start - (self.start - 1) % 7 + 7 * step
+            return [monday + weekday for weekday in self._weekdays], monday
+        start = date.fromordinal(self.start)
+        if self.freq == "MONTHLY":
+            year, month = divmod(start.year * 12 + start.month - 1 + step, 12)
+            return (_month_days(year, month + 1, self.bymonthday, self.byday, self._day),
+                    date(year, month + 1, 1).toordinal())
+        year = start.year + step
+        days = []
+        for month in self.bymonth or [start.month]:
+            days.extend(_month_days(year, month, self.bymonthday, self.byday, self._day))
+        return sorted(days), date(year, 1, 1).toordinal()
+
+    def occurrences(self, first, last):
+        """Ordinal bắt đầu của các lần lặp có chiếm ít nhất một ngày trong [first, last]."""
+        if self._fixed is not None:
+            fixed = self._fixed
+            return fixed[bisect_left(fixed, first - self.span):bisect_right(fixed, last)]
+        if self.bymonth or self.bymonthday or self.count is not None:
+            return self._expand(first, last)
+        if self.freq == "WEEKLY":
+            return self._weekly(first, last)
+        if self.freq == "DAILY" and not self.byday:
+            return self._daily(first, last)
+        return self._expand(first, last)
+
+    def _daily(self, first, last):
+        begin = max(first - self.span, self.start)
+        end = last if self.until is None else min(last, self.until)
+        day = self.start + -(-(begin - self.start) // self.interval) * self.interval
+        while day <= end:
+            if day not in self.exdates:
+                yield day
+            day += self.interval
+
+    def _weekly(self, first, last):
+        begin = max(first - self.span, self.start)
+        end = last if self.until is None else min(last, self.until)
+        step = 7 * self.interval
+        monday = self.start - (self.start - 1) % 7
+        monday += max(0, (begin - monday) // step) * step
+        while monday <= end:
+            for weekday in self._weekdays:
+                day = monday + weekday
+                if begin <= day <= end and day not in self.exdates:
+                    yield day
+            monday += step
+
+    def _expand(self, first, last):
+        """Khai triển tổng quát theo từng chu kỳ (đếm từ đầu khi có COUNT)."""
+        if self.until is not None and self.until < first - self.span:
+            return
+        index = self._first_period(first)
+        seen = 0
+        while True:
+            candidates, period_start = self._period(index)
+            if period_start > last or (self.until is not None and period_start > self.until):
+                return
+            for day in candidates:
+                if day < self.start or not self._filter(day):
+                    continue
+                if self.until is not None and day > self.until:
+                    return
+                seen += 1
+                if self.count is not None and seen > self.count:
+                    return
+                if day in self.exdates or day > last or day + self.span < first:
+                    continue
+                yield day
+            index += 1
+
+
+class ParsedCalendar:
+    """Kết quả phân tích một file: các khoảng ngày đơn lẻ và các luật lặp."""
+
+    __slots__ = ("starts", "ends", "rules", "skipped")
+
+    def __init__(self):
+        self.starts = array('l')
+        self.ends = array('l')
+        self.rules = []
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self.starts) + len(self.rules)
+
+
+def _unfold(buffer, match):
+    """Giá trị đầy đủ của một thuộc tính bị gập thành nhiều dòng."""
+    end = match.end(2)
+    while True:
+        continuation = _CONTINUATION.match(buffer, end)
+        if continuation is None:
+            break
+        line_end = buffer.find(b"\n", continuation.end())
+        end = len(buffer) if line_end < 0 else line_end
+    return _CONTINUATION.sub(b"", bytes(buffer[match.start(2):end])).rstrip(b"\r")
+
+
+def parse_buffer(buffer):
+    """Phân tích các VEVENT trong `buffer` (bytes hoặc mmap)."""
+    result = ParsedCalendar()
+    # UID -> các ngày gốc đã bị RECURRENCE-ID thay thế
+    overrides = {}
+    in_event = in_alarm = False
+    props = {}
+    exdates = []
+    for match in _LINE.finditer(buffer):
+        name = match.group(1)
+        if name == b"BEGIN:VEVENT":
+            in_event, in_alarm = True, False
+            props = {}
+            exdates = []
+            continue
+        if not in_event:
+            continue
+        if name == b"BEGIN:VALARM":
+            in_alarm = True
+            continue
+        if name == b"END:VALARM":
+            in_alarm = False
+            continue
+        if in_alarm:
+            continue
+        if name == b"END:VEVENT":
+            in_event = False
+            try:
+                _add_event(result, props, exdates, overrides)
+            except (IcsError, KeyError, ValueError):
+                result.skipped += 1
+            continue
+        raw = _unfold(buffer, match) if match.group(3) else (match.group(2) or b"")
+        if name == b"EXDATE":
+            exdates.append(raw)
+        else:
+            props[name] = raw
+    for rule in result.rules:
+        if rule.uid in overrides:
+            rule.exdates.update(overrides[rule.uid])
+        # Chuẩn bị ngay khi phân tích xong: luật dùng chung giữa các EventIndex
+        # (file không đổi được giữ lại) nên sau đó không bao giờ bị sửa nữa
+        rule.prepare()
+    return result
+
+
+def _add_event(result, props, exdates, overrides):
+    if b"DTSTART" not in props:
+        raise IcsError("VEVENT thiếu DTSTART")
+    start = _parse_stamp(_value(props[b"DTSTART"]))
+    dtend = props.get(b"DTEND")
+    duration = props.get(b"DURATION")
+    last = _end_ordinal(start, _value(dtend) if dtend else None, _value(duration) if duration else None)
+    uid = _value(props[b"UID"]) if b"UID" in props else None
+    if b"RECURRENCE-ID" in props:
+        # Lần lặp bị sửa: bỏ ngày gốc khỏi luật, thêm lần lặp mới như sự kiện đơn
+        original = _parse_stamp(_value(props[b"RECURRENCE-ID"])).ordinal
+        overrides.setdefault(uid, set()).add(original)
+    elif b"RRULE" in props:
+        skipped = [
+            _parse_stamp(value).ordinal
+            for raw in exdates for value in _value(raw).split(",") if value.strip()
+        ]
+        result.rules.append(RecurrenceRule(start.ordinal, last - start.ordinal, _value(props[b"RRULE"]),
+                                           skipped, uid))
+        return
+    result.starts.append(start.ordinal)
+    result.ends.append(last)
+
+
+def parse_file(path):
+    """Phân tích một file .ics qua mmap."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return ParsedCalendar()
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return parse_buffer(buffer)
+
+
+def file_digest(path):
+    """Hash nội dung file (đọc qua mmap)."""
+    # hashlib chỉ cần khi một file thực sự đổi, không nạp lúc khởi động
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                digest.update(buffer)
+    return digest.hexdigest()
+
+
+class EventIndex:
+    """Chỉ mục khoảng ngày của nhiều ParsedCalendar, hỏi theo cửa sổ [first, last].
+
+    Các lần lặp của luật RRULE trong `window` (mặc định EXPAND_YEARS năm quanh năm
+    hiện tại) được khai triển sẵn khi dựng chỉ mục, nên truy vấn trong cửa sổ chỉ
+    tốn vài lần bisect, không phụ thuộc số luật. Ngoài cửa sổ mới khai triển từng
+    luật theo truy vấn. Dựng xong thì chỉ đọc: luồng nền dựng, luồng chính hỏi.
+    """
+
+    def __init__(self, calendars=(), window=None):
+        starts, ends, long_events, rules = [], [], [], []
+        for calendar in calendars:
+            for start, end in zip(calendar.starts, calendar.ends):
+                if end - start > LONG_SPAN:
+                    long_events.append((start, end))
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            rules.extend(calendar.rules)
+        rules.sort(key=lambda rule: rule.start)
+        self.rule_starts = array('l', [rule.start for rule in rules])
+        self.starts, self.ends, self.max_span = _sorted_intervals(starts, ends)
+        self.long_events = long_events
+        self.rules = rules
+
+        self.window = window or default_window()
+        first, last = self.window
+        starts, ends, self.long_occurrences = [], [], []
+        for rule in rules:
+            span = rule.span
+            for start in rule.occurrences(first, last):
+                if span > LONG_SPAN:
+                    self.long_occurrences.append((start, start + span))
+                else:
+                    starts.append(start)
+                    ends.append(start + span)
+        self.occurrence_starts, self.occurrence_ends, self.occurrence_max_span = _sorted_intervals(starts, ends)
+
+    def __len__(self):
+        return len(self.starts) + len(self.long_events) + len(self.rules)
+
+    def counts(self, first, last):
+        """Số sự kiện chiếm mỗi ngày từ `first` đến `last` (ordinal, tính cả hai đầu)."""
+        size = last - first + 1
+        # Mảng hiệu: +1 tại ngày đầu, -1 sau ngày cuối (đã cắt vào cửa sổ), rồi cộng dồn
+        diff = [0] * (size + 1)
+        _add_sorted(diff, self.starts, self.ends, self.max_span, first, last)
+        _add_listed(diff, self.long_events, first, last)
+        window_first, window_last = self.window
+        # Cửa sổ khai triển giữ mọi lần lặp chạm vào nó, kể cả lần bắt đầu trước đó
+        if window_first <= first and last <= window_last:
+            _add_sorted(diff, self.occurrence_starts, self.occurrence_ends, self.occurrence_max_span, first, last)
+            _add_listed(diff, self.long_occurrences, first, last)
+        else:
+            rules = self.rules
+            for i in range(bisect_right(self.rule_starts, last)):
+                rule = rules[i]
+                if rule.bound is not None and rule.bound < first:
+                    continue
+                span = rule.span
+                for start in rule.occurrences(first, last):
+                    diff[max(start - first, 0)] += 1
+                    diff[min(start + span - first, size - 1) + 1] -= 1
+
+        result = []
+        running = 0
+        for delta in diff[:size]:
+            running += delta
+            result.append(running)
+        return result
+
+
+def default_window(today=None):
+    """Cửa sổ khai triển sẵn mặc định: EXPAND_YEARS năm trước và sau năm của `today`."""
+    year = (today or date.today()).year
+    return date(year - EXPAND_YEARS, 1, 1).toordinal(), date(year + EXPAND_YEARS, 12, 31).toordinal()
+
+
+def _sorted_intervals(starts, ends):
+    """Mảng đầu / cuối sắp theo ngày đầu và độ dài lớn nhất (để lùi bisect)."""
+    order = sorted(range(len(starts)), key=starts.__getitem__)
+    sorted_starts = array('l', [starts[i] for i in order])
+    sorted_ends = array('l', [ends[i] for i in order])
+    return sorted_starts, sorted_ends, max((end - start for start, end in zip(starts, ends)), default=0)
+
+
+def _add_sorted(diff, starts, ends, max_span, first, last):
+    last_index = len(diff) - 2
+    for i in range(bisect_left(starts, first - max_span), bisect_right(starts, last)):
+        end = ends[i]
+        if end >= first:
+            diff[max(starts[i] - first, 0)] += 1
+            diff[min(end - first, last_index) + 1] -= 1
+
+
+def _add_listed(diff, intervals, first, last):
+    last_index = len(diff) - 2
+    for start, end in intervals:
+        if end >= first and start <= last:
+            diff[max(start - first, 0)] += 1
+            diff[min(end - first, last_index) + 1] -= 1
+
+
+class EventStore:
+    """Tập các file .ics (một thư mục và/hoặc danh sách đường dẫn), nhập lại theo từng file.
+
+    `refresh()` chỉ stat các file; file đổi mtime / kích thước mới được hash,
+    và chỉ khi hash khác mới phân tích lại. Trả về True nếu chỉ mục thay đổi.
+    """
+
+    def __init__(self, paths=(), directory=None):
+        self.paths = list(paths)
+        self.directory = directory
+        self.index = EventIndex()
+        self._sources = {}
+        self.parsed = 0
+        self.hashed = 0
+        self.errors = 0
+
+    def _discover(self):
+        paths = list(self.paths)
+        if self.directory and os.path.isdir(self.directory):
+            with os.scandir(self.directory) as entries:
+                paths.extend(sorted(entry.path for entry in entries
+                                    if entry.name.lower().endswith(".ics") and entry.is_file()))
+        return paths
+
+    def refresh(self):
+        index = self.scan()
+        if index is None:
+            return False
+        self.index = index
+        return True
+
+    def scan(self):
+        """Như `refresh` nhưng không gắn chỉ mục: trả về EventIndex mới nếu có thay đổi, None nếu không.
+
+        Dùng được ở luồng nền (mỗi lúc chỉ một luồng gọi); luồng chính gán kết quả vào `index`.
+        """
+        changed = False
+        sources = {}
+        for path in self._discover():
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            signature = (info.st_mtime_ns, info.st_size)
+            previous = self._sources.get(path)
+            if previous is not None and previous[0] == signature:
+                sources[path] = previous
+                continue
+            try:
+                self.hashed += 1
+                digest = file_digest(path)
+                if previous is not None and previous[1] == digest:
+                    sources[path] = (signature, digest, previous[2])
+                    continue
+                self.parsed += 1
+                sources[path] = (signature, digest, parse_file(path))
+                changed = True
+            except (OSError, IcsError):
+                self.errors += 1
+                if previous is not None:
+                    sources[path] = previous
+        if set(sources) != set(self._sources):
+            changed = True
+        self._sources = sources
+        if not changed:
+            return None
+        return EventIndex(source[2] for source in sources.values())
+
+    def counts(self, first, last):
+        return self.index.counts(first, last)
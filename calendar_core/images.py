@@ -0,0 +1,169 @@
+"""Bộ nhớ đệm ảnh: hình tròn "hôm nay" và icon ngày trên thanh menu.
+
+Khoá cache là (loại, ngày, đường kính, hệ số backing, giao diện sáng/tối) nên
+mỗi hình chỉ vẽ một lần cho mỗi màn hình. Việc vẽ và cắt ảnh nằm sau giao
+diện `ImageBackend`: AppKit dùng NSImage (menu_calendar.py), còn
+`PillowImageBackend` dùng để đo hit/miss và bộ nhớ khi không có AppKit.
+"""
+from collections import OrderedDict
+import json
+import os
+
+ATLAS_MANIFEST = "calendar_atlas.json"
+
+TODAY_DIAMETER = 19
+
+# Màu hình tròn "hôm nay" (RGBA 0-255) theo giao diện, như systemOrangeColor sáng / tối
+TODAY_COLORS = {"light": (255, 149, 0, 255), "dark": (255, 159, 10, 255)}
+
+
+class ImageBackend:
+    """Giao diện vẽ/nạp ảnh cho DayImages."""
+
+    def render_today_marker(self, day, diameter, scale, appearance):
+        raise NotImplementedError
+
+    def load_file(self, path):
+        """Nạp một file ảnh, trả về None nếu không đọc được."""
+        raise NotImplementedError
+
+    def slice_atlas(self, atlas, frame, scale):
+        """Cắt khung (x, y, w, h) tính theo pixel ra khỏi ảnh atlas."""
+        raise NotImplementedError
+
+    def image_bytes(self, image):
+        """Ước lượng số byte bộ nhớ ảnh chiếm."""
+        raise NotImplementedError
+
+
+class ImageCache:
+    """LRU giới hạn theo cả số ảnh và tổng số byte."""
+
+    def __init__(self, backend, max_entries=96, max_bytes=4 * 1024 * 1024):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._images)
+
+    def get(self, key, factory):
+        entry = self._images.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._images.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        image = factory()
+        if image is None:
+            return None
+        size = self.backend.image_bytes(image)
+        self._images[key] = (image, size)
+        self.bytes += size
+        while len(self._images) > 1 and (len(self._images) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, evicted_size) = self._images.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+        return image
+
+    def clear(self):
+        self._images.clear()
+        self.bytes = 0
+
+
+class DayImages:
+    """Điểm truy cập chung cho các ảnh ngày của ứng dụng."""
+
+    def __init__(self, backend, images_dir, cache=None):
+        self.backend = backend
+        self.images_dir = images_dir
+        self.cache = cache or ImageCache(backend)
+        self._atlas = {}
+        self._manifest = None
+        self._atlas_loaded = False
+
+    def today_marker(self, day, diameter=TODAY_DIAMETER, scale=2.0, appearance="light"):
+        key = ("today", day, diameter, scale, appearance)
+        return self.cache.get(key, lambda: self.backend.render_today_marker(day, diameter, scale, appearance))
+
+    def status_icon(self, day, scale=2.0):
+        key = ("status", day, scale)
+        return self.cache.get(key, lambda: self._load_status_icon(day, scale))
+
+    def _load_status_icon(self, day, scale):
+        sheet = self._sheet_for(scale)
+        if sheet is not None:
+            atlas, frames = sheet
+            frame = frames.get(str(day))
+            if frame is not None:
+                return self.backend.slice_atlas(atlas, frame, scale)
+        # Chưa build atlas: dùng file PNG riêng lẻ như trước
+        return self.backend.load_file(os.path.join(self.images_dir, f"calendar_{day}_icon.png"))
+
+    def _sheet_for(self, scale):
+        # Atlas chỉ được đọc lần đầu cần tới
+        if not self._atlas_loaded:
+            self._atlas_loaded = True
+            try:
+                with open(os.path.join(self.images_dir, ATLAS_MANIFEST), encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = None
+        if not self._manifest:
+            return None
+        sheets = self._manifest.get("sheets", {})
+        # Chọn sheet có hệ số gần nhất nhưng không nhỏ hơn màn hình
+        available = sorted(int(name) for name in sheets)
+        if not available:
+            return None
+        chosen = next((s for s in available if s >= scale), available[-1])
+        if chosen not in self._atlas:
+            self._atlas[chosen] = self.backend.load_file(os.path.join(self.images_dir, sheets[str(chosen)]["file"]))
+        if self._atlas[chosen] is None:
+            return None
+        return self._atlas[chosen], sheets[str(chosen)]["frames"]
+
+
+class PillowImageBackend(ImageBackend):
+    """Backend dùng Pillow, chạy được ở mọi nền tảng."""
+
+    def __init__(self):
+        from PIL import Image, ImageDraw, ImageFont
+        self._Image = Image
+        self._ImageDraw = ImageDraw
+        self._ImageFont = ImageFont
+        self.renders = 0
+        self.loads = 0
+
+    def render_today_marker(self, day, diameter, scale, appearance):
+        self.renders += 1
+        size = int(round(diameter * scale))
+        image = self._Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        draw = self._ImageDraw.Draw(image)
+        draw.ellipse([0, 0, size - 1, size - 1], fill=TODAY_COLORS.get(appearance, TODAY_COLORS["light"]))
+        font = self._ImageFont.load_default()
+        text = str(day)
+        width = draw.textlength(text, font=font)
+        draw.text(((size - width) / 2, size / 4), text, fill="black", font=font)
+        return image
+
+    def load_file(self, path):
+        self.loads += 1
+        try:
+            with self._Image.open(path) as image:
+                image.load()
+                return image.copy()
+        except OSError:
+            return None
+
+    def slice_atlas(self, atlas, frame, scale):
+        x, y, w, h = frame
+        return atlas.crop((x, y, x + w, y + h))
+
+    def image_bytes(self, image):
+        return image.width * image.height * 4
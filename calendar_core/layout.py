@@ -0,0 +1,206 @@
+"""Mô hình bố cục tháng (không phụ thuộc AppKit) và bộ nhớ đệm LRU.
+
+`MonthLayout` chứa mọi thứ cần để vẽ lưới tháng: vị trí ô, số ngày, cờ
+ngoài tháng / hôm nay / cuối tuần và ngày âm lịch. Khi chuyển tháng, view
+chỉ việc đọc bố cục đã tính sẵn. Nếu có `HolidayCalendar`, mỗi ô được gắn
+thêm các ngày lễ / tiết khí của ngày đó; nếu có `EventStore`, thêm số sự kiện
+trong ngày (một truy vấn khoảng cho cả lưới). Nếu có `DayCache` (file mmap) phủ
+cả lưới thì ngày âm và lễ được đọc thẳng từ file, không cần nạp NumPy.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from calendar_core.lunar import MAX_ORDINAL, MIN_ORDINAL, days_in_month, lunar_day_text
+from calendar_core.metrics import span
+
+# Kích thước lưới, khớp với CalendarView
+PADDING = 30
+CELL_WIDTH = 55
+CELL_HEIGHT = 68
+CELL_GAP = 4
+GRID_TOP = 370
+MAX_CELLS = 42
+
+# Tiêu đề cột, bắt đầu từ thứ Hai
+WEEKDAY_LABELS = ["T2", "T3", "T4", "T5", "T6", "T7", "CN"]
+
+
+def shift_month(year, month, delta):
+    """Cộng `delta` tháng vào (năm, tháng)."""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+class DayCell:
+    __slots__ = ("index", "row", "col", "x", "y", "ordinal", "day", "in_month", "is_today",
+                 "is_weekend", "lunar_day", "lunar_month", "lunar_year", "lunar_leap", "lunar_text",
+                 "observances", "events")
+
+    def __init__(self, index, ordinal, solar_day, in_month, is_today, lunar, observances=(), events=0):
+        self.index = index
+        self.row, self.col = divmod(index, 7)
+        self.x = PADDING + self.col * (CELL_WIDTH + CELL_GAP)
+        self.y = GRID_TOP - self.row * CELL_HEIGHT
+        self.ordinal = ordinal
+        # Giống calendar.monthcalendar: ngày ngoài tháng có day = 0
+        self.day = solar_day if in_month else 0
+        self.in_month = in_month
+        self.is_today = is_today
+        self.is_weekend = self.col >= 5
+        if lunar is None:
+            self.lunar_year = self.lunar_month = self.lunar_day = None
+            self.lunar_leap = False
+            self.lunar_text = ""
+        else:
+            self.lunar_year, self.lunar_month, self.lunar_day, self.lunar_leap = lunar
+            self.lunar_text = lunar_day_text(self.lunar_day, self.lunar_month)
+        self.observances = observances
+        self.events = events
+
+    def __repr__(self):
+        return f"DayCell({date.fromordinal(self.ordinal)}, in_month={self.in_month}, today={self.is_today})"
+
+
+class MonthLayout:
+    __slots__ = ("year", "month", "weeks", "cells", "title", "today")
+
+    def __init__(self, year, month, weeks, cells, today):
+        self.year = year
+        self.month = month
+        self.weeks = weeks
+        self.cells = cells
+        self.title = f"Tháng {month}, {year}"
+        self.today = today
+
+    def today_cell(self):
+        for cell in self.cells:
+            if cell.is_today:
+                return cell
+        return None
+
+
+def build_month_layout(year, month, today, holidays=None, events=None, days=None):
+    """Tính bố cục cho (year, month); `today` là datetime.date dùng cho cờ hôm nay (None: không đánh dấu).
+
+    `holidays` (HolidayCalendar, tuỳ chọn) dùng để gắn ngày lễ cho các ô trong tháng,
+    `events` (EventStore, tuỳ chọn) để đếm sự kiện cho mỗi ô, `days` (DayCache, tuỳ
+    chọn) để đọc ngày âm và lễ từ file cache thay vì tính lại.
+    """
+    first_date = date(year, month, 1)
+    month_length = days_in_month(year, month)
+    weeks = (first_date.weekday() + month_length + 6) // 7
+    start = first_date.toordinal() - first_date.weekday()
+    count = weeks * 7
+    if (days is not None and days.covers(start, start + count - 1)
+            and (holidays is None or holidays.tz == days.tz)):
+        with span("layout.lunar"):
+            records = days.records(start, count)
+        ordinals = list(range(start, start + count))
+        lunars = [record[:4] for record in records]
+        observances = {ordinal: record[4] for ordinal, record in zip(ordinals, records)} if holidays is not None else {}
+    else:
+        ordinals, lunars = _compute_lunar(year, month, weeks)
+        observances = holidays.year_index(year) if holidays is not None else {}
+    first = first_date.toordinal()
+    today_ordinal = today.toordinal() if today is not None else None
+    # Các ô của lưới là những ngày liên tiếp nên chỉ cần một truy vấn khoảng
+    with span("layout.events"):
+        event_counts = events.counts(ordinals[0], ordinals[-1]) if events is not None else [0] * len(ordinals)
+    cells = []
+    for index, ordinal in enumerate(ordinals):
+        in_month = first <= ordinal < first + month_length
+        cells.append(DayCell(index, ordinal, ordinal - first + 1, in_month, ordinal == today_ordinal, lunars[index],
+                             observances.get(ordinal, ()) if in_month else (), event_counts[index]))
+    return MonthLayout(year, month, weeks, cells, today)
+
+
+def _compute_lunar(year, month, weeks):
+    """Ordinal của lưới và (năm, tháng, ngày, nhuận) âm lịch của từng ô, tính bằng NumPy."""
+    # NumPy chỉ được nạp khi dựng bố cục đầu tiên (mở popover), không phải lúc khởi động
+    from calendar_core.lunar_np import month_grid_ordinals, ordinals_to_lunar
+
+    ordinals = month_grid_ordinals(year, month, weeks=weeks)
+    # Ngoài phạm vi bảng âm lịch (trước 1899 / sau 2101) thì để trống phần âm lịch
+    in_table = (ordinals >= MIN_ORDINAL) & (ordinals <= MAX_ORDINAL)
+    with span("layout.lunar"):
+        lunar_days, lunar_months, lunar_years, lunar_leaps = ordinals_to_lunar(
+            ordinals.clip(MIN_ORDINAL, MAX_ORDINAL))
+    lunars = [(int(lunar_years[index]), int(lunar_months[index]), int(lunar_days[index]), bool(lunar_leaps[index]))
+              if in_table[index] else None for index in range(len(ordinals))]
+    return ordinals.tolist(), lunars
+
+
+class MonthLayoutCache:
+    """LRU các MonthLayout theo khoá (năm, tháng).
+
+    Dùng được từ luồng vẽ nền lẫn luồng chính: chỉ các thao tác trên dict nằm
+    trong khoá, việc dựng bố cục chạy ngoài khoá.
+    """
+
+    def __init__(self, maxsize=12, today=None, holidays=None, events=None, days=None):
+        self.maxsize = maxsize
+        self.today = today or date.today()
+        self.holidays = holidays
+        self.events = events
+        self.days = days
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def __contains__(self, key):
+        return key in self._layouts
+
+    def get(self, year, month):
+        key = (year, month)
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is not None:
+                self.hits += 1
+                self._layouts.move_to_end(key)
+                return layout
+            self.misses += 1
+            today = self.today
+        return self._store(key, today)
+
+    def prefetch_adjacent(self, year, month):
+        """Tính sẵn tháng trước và tháng sau nếu chưa có trong cache."""
+        with self._lock:
+            missing = [key for key in (shift_month(year, month, -1), shift_month(year, month, 1))
+                       if key not in self._layouts]
+            self.prefetched += len(missing)
+            today = self.today
+        for key in missing:
+            self._store(key, today)
+        # Giữ tháng đang xem ở cuối để không bị đẩy ra trước các tháng prefetch
+        with self._lock:
+            if (year, month) in self._layouts:
+                self._layouts.move_to_end((year, month))
+
+    def _store(self, key, today):
+        layout = build_month_layout(key[0], key[1], today, self.holidays, self.events, self.days)
+        with self._lock:
+            # Ngày đã đổi trong lúc dựng: vẫn trả về nhưng không lưu bố cục cũ
+            if today == self.today:
+                self._layouts[key] = layout
+                if len(self._layouts) > self.maxsize:
+                    self._layouts.popitem(last=False)
+        return layout
+
+    def set_today(self, today):
+        """Cập nhật ngày hiện tại; bỏ toàn bộ cache nếu ngày đã đổi. Trả về True nếu có thay đổi."""
+        with self._lock:
+            if today == self.today:
+                return False
+            self.today = today
+            self._layouts.clear()
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._layouts.clear()
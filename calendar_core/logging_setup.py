@@ -0,0 +1,146 @@
+"""Cấu hình logging không chặn luồng chính.
+
+Luồng chính chỉ đưa LogRecord vào hàng đợi; một luồng nền (QueueListener)
+ghi file có xoay vòng. Các log lặp lại trên đường nóng (vẽ lại lịch, chuyển
+tháng) đăng ký một khoá và bị giới hạn tần suất trước khi vào hàng đợi.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+LOG_NAME = "menu_calendar.log"
+APP_NAME = "MenuCalendar"
+
+
+def user_log_dir():
+    """Thư mục log của người dùng: ~/Library/Logs trên macOS, XDG state ở nơi khác."""
+    override = os.environ.get("MENU_CALENDAR_LOG_DIR")
+    if override:
+        return override
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~/Library/Logs"), APP_NAME)
+    state = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    return os.path.join(state, APP_NAME)
+
+
+def _writable(directory):
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return False
+    return os.access(directory, os.W_OK)
+
+
+def choose_log_dir(preferred=None):
+    """Chọn thư mục ghi được: `preferred` (nếu không phải bundle PyInstaller), thư mục người dùng, rồi thư mục tạm."""
+    candidates = []
+    if preferred and not getattr(sys, 'frozen', False) and "MENU_CALENDAR_LOG_DIR" not in os.environ:
+        candidates.append(preferred)
+    candidates.append(user_log_dir())
+    import tempfile
+    candidates.append(os.path.join(tempfile.gettempdir(), APP_NAME))
+    for directory in candidates:
+        if _writable(directory):
+            return directory
+    return None
+
+
+class RateLimitFilter(logging.Filter):
+    """Giới hạn số log mỗi khoá: tối đa `burst` bản ghi trong mỗi `interval` giây.
+
+    Chỉ áp dụng cho log tự đăng ký bằng `extra={"rate_key": ...}` (các log lặp
+    lại trên đường nóng); log không có khoá, và log từ WARNING trở lên, không
+    bao giờ bị bỏ. Số bản ghi bị bỏ được ghi kèm vào bản
+    ghi kế tiếp được phép đi qua.
+    """
+
+    def __init__(self, interval=60.0, burst=5, clock=time.monotonic):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.clock = clock
+        self._windows = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record):
+        key = getattr(record, "rate_key", None)
+        if key is None or record.levelno >= logging.WARNING:
+            return True
+        now = self.clock()
+        with self._lock:
+            start, count, dropped = self._windows.get(key, (now, 0, 0))
+            if now - start >= self.interval:
+                start, count = now, 0
+            if count >= self.burst:
+                self._windows[key] = (start, count, dropped + 1)
+                self.suppressed += 1
+                return False
+            self._windows[key] = (start, count + 1, 0)
+        if dropped:
+            record.msg = f"{str(record.msg)} (bỏ qua {dropped} log tương tự)"
+        return True
+
+
+def stop_listener(listener):
+    """Dừng QueueListener (ghi hết hàng đợi); gọi nhiều lần không sao."""
+    if listener._thread is not None:
+        listener.stop()
+
+
+class _ThreadQueueHandler(logging.handlers.QueueHandler):
+    # Hàng đợi nằm trong cùng process: không cần định dạng sẵn trên luồng chính
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(log_dir=None, level=None, max_bytes=1024 * 1024, backup_count=3,
+                  rotate_when=None, rate_interval=60.0, rate_burst=5):
+    """Gắn pipeline log vào root logger, trả về (đường dẫn file log, QueueListener).
+
+    `level` mặc định lấy từ biến môi trường MENU_CALENDAR_LOG_LEVEL (INFO); tên
+    mức không hợp lệ không làm app dừng mà rơi về INFO kèm một cảnh báo trong log.
+    `rotate_when` (ví dụ "midnight") chuyển sang xoay vòng theo thời gian thay
+    vì theo kích thước.
+    """
+    level = level or os.environ.get("MENU_CALENDAR_LOG_LEVEL", "INFO")
+    directory = choose_log_dir(log_dir)
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+    if directory is None:
+        file_handler = logging.NullHandler()
+        log_path = None
+    else:
+        log_path = os.path.join(directory, LOG_NAME)
+        if rotate_when:
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                log_path, when=rotate_when, backupCount=backup_count, encoding="utf-8", delay=True)
+        else:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _ThreadQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate_interval, rate_burst))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    resolved = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+    if isinstance(resolved, int):
+        root.setLevel(resolved)
+    else:
+        root.setLevel(logging.INFO)
+        logging.warning(f"Unknown log level {level!r}, using INFO")
+    return log_path, listener
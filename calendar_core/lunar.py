@@ -0,0 +1,289 @@
+"""Tra cứu âm lịch bằng bảng năm đã nén bit.
+
+Mỗi năm âm lịch được mã hoá trong một số nguyên 32 bit:
+
+* bit 0-12: độ dài 13 tháng theo thứ tự xuất hiện (1 = tháng đủ 30 ngày,
+  0 = tháng thiếu 29 ngày);
+* bit 13-16: tháng nhuận (0 nếu năm không nhuận);
+* bit 17-22: số ngày từ 1/1 dương lịch đến mùng 1 Tết.
+
+Bảng được giải nén một lần khi import thành các mảng ordinal phẳng, sau đó
+mọi phép đổi dương -> âm chỉ là vài phép so sánh số nguyên, không tạo đối
+tượng ``Solar``/``Lunar`` nào.
+"""
+from array import array
+from bisect import bisect_right
+from datetime import date
+
+# Năm âm lịch đầu tiên trong bảng
+FIRST_LUNAR_YEAR = 1899
+
+# Sinh bằng `python -m calendar_core.lunar --generate` (dữ liệu lấy từ lunarcalendar)
+YEAR_TABLE = array('I', (
+    0x500ad5, 0x3d16d2, 0x620752, 0x4c0ea5, 0x38b64a, 0x5c064b, 0x440a9b, 0x309556,
+    0x56056a, 0x400b59, 0x2a5752, 0x500752, 0x3adb25, 0x600b25, 0x480a4b, 0x32b4ab,
+    0x5802ad, 0x42056b, 0x2c4b69, 0x520da9, 0x3efd92, 0x640e92, 0x4c0d25, 0x36ba4d,
+    0x5c0a56, 0x4602b6, 0x2e95b5, 0x5606d4, 0x400ea9, 0x2c5e92, 0x500e92, 0x3acd26,
+    0x5e052b, 0x480a57, 0x32b2b6, 0x580b5a, 0x4406d4, 0x2e6ec9, 0x520749, 0x3cf693,
+    0x620a93, 0x4c052b, 0x34ca5b, 0x5a0aad, 0x46056a, 0x309b55, 0x560ba4, 0x400b49,
+    0x2a5a93, 0x500a95, 0x38f52d, 0x5e0536, 0x480aad, 0x34b5aa, 0x5805b2, 0x420da5,
+    0x2e7d4a, 0x540d4a, 0x3d0a95, 0x600a97, 0x4c0556, 0x36cab5, 0x5a0ad5, 0x4606d2,
+    0x308ea5, 0x560ea5, 0x40064a, 0x286c97, 0x4e0a9b, 0x3af55a, 0x5e056a, 0x480b69,
+    0x34b752, 0x5a0b52, 0x420b25, 0x2c964b, 0x520a4b, 0x3d14ab, 0x6002ad, 0x4a056d,
+    0x36cb69, 0x5c0da9, 0x460d92, 0x309d25, 0x560d25, 0x415a4d, 0x640a56, 0x4e02b6,
+    0x38c5b5, 0x5e06d5, 0x480ea9, 0x34be92, 0x5a0e92, 0x440d26, 0x2c6a56, 0x500a57,
+    0x3d14d6, 0x62035a, 0x4a06d5, 0x36b6c9, 0x5c0749, 0x460693, 0x2e952b, 0x54052b,
+    0x3e0a5b, 0x2a555a, 0x4e056a, 0x38fb55, 0x600ba4, 0x4a0b49, 0x32ba93, 0x580a95,
+    0x42052d, 0x2c8aad, 0x500ab5, 0x3d35aa, 0x6205d2, 0x4c0da5, 0x36dd4a, 0x5c0d4a,
+    0x460c95, 0x30952e, 0x540556, 0x3e0ab5, 0x2a55b2, 0x5006d2, 0x38cea5, 0x5e0725,
+    0x48064b, 0x32ac97, 0x560cab, 0x42055a, 0x2c6ad6, 0x520b69, 0x3d7752, 0x620b52,
+    0x4c0b25, 0x36da4b, 0x5a0a4b, 0x4404ab, 0x2ea55b, 0x5405ad, 0x3e0b6a, 0x2a5b52,
+    0x500d92, 0x3afd25, 0x5e0d25, 0x480a55, 0x32b4ad, 0x5804b6, 0x4005b5, 0x2c6daa,
+    0x520ec9, 0x3f1e92, 0x620e92, 0x4c0d26, 0x36ca56, 0x5a0a57, 0x4404d6, 0x2e86d5,
+    0x540755, 0x400749, 0x286e93, 0x4e0693, 0x38f52b, 0x5e052b, 0x460a5b, 0x32b55a,
+    0x58056a, 0x420b65, 0x2c974a, 0x520b4a, 0x3d1a95, 0x620a95, 0x4a052d, 0x34caad,
+    0x5a0ab5, 0x4605aa, 0x2e8ba5, 0x540da5, 0x400d4a, 0x2a7c95, 0x4e0c96, 0x38f94e,
+    0x5e0556, 0x480ab5, 0x32b5b2, 0x5806d2, 0x420ea5, 0x2e8e4a, 0x50064b, 0x3b0c97,
+    0x6004ab, 0x4a055b, 0x34cad6, 0x5a0b6a, 0x460752, 0x309725, 0x540b25, 0x3e0a8b,
+    0x28549b, 0x4e04ab, 0x38e95b,
+))
+
+LAST_LUNAR_YEAR = FIRST_LUNAR_YEAR + len(YEAR_TABLE) - 1
+
+# Mỗi năm chiếm 14 ô trong _MONTH_STARTS: 13 ngày bắt đầu tháng + 1 ô chặn cuối
+_STRIDE = 14
+
+
+def decode_year(word):
+    """Giải mã một ô của YEAR_TABLE thành (độ dài các tháng, tháng nhuận, offset Tết)."""
+    leap = (word >> 13) & 0xF
+    tet_offset = (word >> 17) & 0x3F
+    count = 13 if leap else 12
+    lengths = [30 if word & (1 << k) else 29 for k in range(count)]
+    return lengths, leap, tet_offset
+
+
+def _build_index():
+    month_starts = array('l')
+    leaps = array('b')
+    for i, word in enumerate(YEAR_TABLE):
+        lengths, leap, tet_offset = decode_year(word)
+        ordinal = date(FIRST_LUNAR_YEAR + i, 1, 1).toordinal() + tet_offset
+        for length in lengths:
+            month_starts.append(ordinal)
+            ordinal += length
+        # Năm không nhuận: lặp lại ô chặn để bisect luôn chạy trên 14 ô
+        while len(month_starts) < (i + 1) * _STRIDE:
+            month_starts.append(ordinal)
+        leaps.append(leap)
+    return month_starts, leaps
+
+
+_MONTH_STARTS, _LEAPS = _build_index()
+
+MIN_ORDINAL = _MONTH_STARTS[0]
+MAX_ORDINAL = _MONTH_STARTS[-1] - 1
+
+
+def ordinal_to_lunar(ordinal):
+    """Đổi ordinal dương lịch (date.toordinal()) sang (năm, tháng, ngày, nhuận)."""
+    if ordinal < MIN_ORDINAL or ordinal > MAX_ORDINAL:
+        raise ValueError(f"Ordinal {ordinal} nằm ngoài bảng âm lịch")
+    # Tết luôn rơi vào tháng 1-2 nên năm âm = năm dương hoặc năm dương - 1
+    i = (ordinal - MIN_ORDINAL) // 366 + 1
+    if i >= len(_LEAPS) or _MONTH_STARTS[i * _STRIDE] > ordinal:
+        i -= 1
+        if _MONTH_STARTS[i * _STRIDE] > ordinal:
+            i -= 1
+    base = i * _STRIDE
+    k = bisect_right(_MONTH_STARTS, ordinal, base, base + 13) - 1 - base
+    leap = _LEAPS[i]
+    day = ordinal - _MONTH_STARTS[base + k] + 1
+    if leap and k >= leap:
+        return FIRST_LUNAR_YEAR + i, k, day, k == leap
+    return FIRST_LUNAR_YEAR + i, k + 1, day, False
+
+
+def solar_to_lunar(year, month, day):
+    """Đổi ngày dương lịch sang (năm, tháng, ngày, nhuận) âm lịch."""
+    return ordinal_to_lunar(date(year, month, day).toordinal())
+
+
+def lunar_to_ordinal(year, month, day, leap=False):
+    """Đổi ngày âm lịch sang ordinal dương lịch."""
+    i = year - FIRST_LUNAR_YEAR
+    if i < 0 or i >= len(_LEAPS):
+        raise ValueError(f"Năm âm lịch {year} nằm ngoài bảng")
+    if not 1 <= month <= 12:
+        raise ValueError(f"Tháng âm lịch {month} không hợp lệ")
+    leap_month = _LEAPS[i]
+    if leap:
+        if month != leap_month:
+            raise ValueError(f"Năm {year} không có tháng {month} nhuận")
+        k = month
+    elif leap_month and month > leap_month:
+        k = month
+    else:
+        k = month - 1
+    base = i * _STRIDE + k
+    if not 1 <= day <= _MONTH_STARTS[base + 1] - _MONTH_STARTS[base]:
+        raise ValueError(f"Ngày {day}/{month} âm lịch năm {year} không tồn tại")
+    return _MONTH_STARTS[base] + day - 1
+
+
+def lunar_to_solar(year, month, day, leap=False):
+    """Đổi ngày âm lịch sang datetime.date."""
+    return date.fromordinal(lunar_to_ordinal(year, month, day, leap))
+
+
+def lunar_month_length(year, month, leap=False):
+    """Số ngày (29 hoặc 30) của một tháng âm lịch."""
+    start = lunar_to_ordinal(year, month, 1, leap)
+    i = year - FIRST_LUNAR_YEAR
+    k = bisect_right(_MONTH_STARTS, start, i * _STRIDE, i * _STRIDE + 13) - 1
+    return _MONTH_STARTS[k + 1] - _MONTH_STARTS[k]
+
+
+def leap_month(year):
+    """Tháng nhuận của năm âm lịch, 0 nếu không có."""
+    i = year - FIRST_LUNAR_YEAR
+    if i < 0 or i >= len(_LEAPS):
+        raise ValueError(f"Năm âm lịch {year} nằm ngoài bảng")
+    return _LEAPS[i]
+
+
+def lunar_months(year):
+    """Các tháng của năm âm lịch: danh sách (tháng, nhuận, ordinal ngày mùng 1, số ngày)."""
+    i = year - FIRST_LUNAR_YEAR
+    if i < 0 or i >= len(_LEAPS):
+        raise ValueError(f"Năm âm lịch {year} nằm ngoài bảng")
+    leap = _LEAPS[i]
+    base = i * _STRIDE
+    result = []
+    for j in range(13 if leap else 12):
+        start = _MONTH_STARTS[base + j]
+        if leap and j >= leap:
+            month, is_leap = j, j == leap
+        else:
+            month, is_leap = j + 1, False
+        result.append((month, is_leap, start, _MONTH_STARTS[base + j + 1] - start))
+    return result
+
+
+def days_in_month(year, month):
+    """Số ngày của tháng dương lịch (tương đương calendar.monthrange()[1], không cần import calendar)."""
+    next_first = date(year + month // 12, month % 12 + 1, 1)
+    return next_first.toordinal() - date(year, month, 1).toordinal()
+
+
+def lunar_day_text(day, month):
+    """Chuỗi hiển thị ngày âm trong ô lịch: "1/M" cho mùng 1, còn lại chỉ số ngày."""
+    return f"{day}/{month}" if day == 1 else str(day)
+
+
+def convert_range(first_ordinal, count):
+    """Đổi liên tiếp `count` ngày bắt đầu từ `first_ordinal`.
+
+    Chỉ tra bảng một lần cho ngày đầu, các ngày sau tăng dần theo độ dài
+    tháng nên chi phí mỗi ngày là vài phép cộng.
+    """
+    result = []
+    if count <= 0:
+        return result
+    if first_ordinal + count - 1 > MAX_ORDINAL:
+        raise ValueError(f"Ordinal {first_ordinal + count - 1} nằm ngoài bảng âm lịch")
+    year, month, day, leap = ordinal_to_lunar(first_ordinal)
+    i = year - FIRST_LUNAR_YEAR
+    k = bisect_right(_MONTH_STARTS, first_ordinal, i * _STRIDE, i * _STRIDE + 13) - 1
+    month_end = _MONTH_STARTS[k + 1]
+    for ordinal in range(first_ordinal, first_ordinal + count):
+        if ordinal >= month_end:
+            k += 1
+            if k % _STRIDE == 13 or _MONTH_STARTS[k] == _MONTH_STARTS[k + 1]:
+                # Sang năm âm lịch mới
+                i += 1
+                k = i * _STRIDE
+                year += 1
+            month_end = _MONTH_STARTS[k + 1]
+            j = k - i * _STRIDE
+            leap_m = _LEAPS[i]
+            if leap_m and j >= leap_m:
+                month, leap = j, j == leap_m
+            else:
+                month, leap = j + 1, False
+            day = 1
+        result.append((year, month, day, leap))
+        day += 1
+    return result
+
+
+def month_lunar(year, month):
+    """Danh sách (năm, tháng, ngày, nhuận) âm lịch cho mọi ngày của một tháng dương."""
+    return convert_range(date(year, month, 1).toordinal(), days_in_month(year, month))
+
+
+def year_lunar(year):
+    """Danh sách (năm, tháng, ngày, nhuận) âm lịch cho mọi ngày của một năm dương."""
+    first = date(year, 1, 1).toordinal()
+    return convert_range(first, date(year, 12, 31).toordinal() - first + 1)
+
+
+def encode_years_from_lunarcalendar(first_year=FIRST_LUNAR_YEAR, last_year=LAST_LUNAR_YEAR):
+    """Sinh lại YEAR_TABLE từ thư viện lunarcalendar (chỉ dùng khi phát triển)."""
+    from lunarcalendar import Converter, Lunar, Solar
+
+    words = []
+    for year in range(first_year, last_year + 1):
+        tet = Converter.Lunar2Solar(Lunar(year, 1, 1, check=False)).to_date().toordinal()
+        next_tet = Converter.Lunar2Solar(Lunar(year + 1, 1, 1, check=False)).to_date().toordinal()
+        word = (tet - date(year, 1, 1).toordinal()) << 17
+        k = -1
+        length = 0
+        for ordinal in range(tet, next_tet):
+            d = date.fromordinal(ordinal)
+            lunar = Converter.Solar2Lunar(Solar(d.year, d.month, d.day))
+            if lunar.day == 1:
+                if length == 30:
+                    word |= 1 << k
+                k += 1
+                length = 0
+                if lunar.isleap:
+                    word |= lunar.month << 13
+            length += 1
+        if length == 30:
+            word |= 1 << k
+        words.append(word)
+    return words
+
+
+def verify_against_lunarcalendar(first_ordinal=MIN_ORDINAL, last_ordinal=MAX_ORDINAL):
+    """So sánh từng ngày trong khoảng với lunarcalendar, trả về danh sách ngày lệch."""
+    from lunarcalendar import Converter, Solar
+
+    mismatches = []
+    bulk = convert_range(first_ordinal, last_ordinal - first_ordinal + 1)
+    for ordinal, fast in zip(range(first_ordinal, last_ordinal + 1), bulk):
+        d = date.fromordinal(ordinal)
+        ref = Converter.Solar2Lunar(Solar(d.year, d.month, d.day))
+        expected = (ref.year, ref.month, ref.day, bool(ref.isleap))
+        if ordinal_to_lunar(ordinal) != expected or fast != expected:
+            mismatches.append((d, expected, ordinal_to_lunar(ordinal), fast))
+        elif lunar_to_ordinal(*expected) != ordinal:
+            mismatches.append((d, expected, "lunar_to_ordinal", lunar_to_ordinal(*expected)))
+    return mismatches
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--generate" in sys.argv:
+        words = encode_years_from_lunarcalendar()
+        for start in range(0, len(words), 8):
+            print("    " + ", ".join(f"0x{w:06x}" for w in words[start:start + 8]) + ",")
+    else:
+        errors = verify_against_lunarcalendar()
+        total = MAX_ORDINAL - MIN_ORDINAL + 1
+        print(f"Đã kiểm tra {total} ngày ({date.fromordinal(MIN_ORDINAL)} - {date.fromordinal(MAX_ORDINAL)}), lệch {len(errors)}")
+        for item in errors[:20]:
+            print(item)
+        sys.exit(1 if errors else 0)
@@ -0,0 +1,84 @@
+"""Đổi dương <-> âm lịch hàng loạt bằng NumPy.
+
+Dùng chung bảng năm của `calendar_core.lunar`; mỗi lô ordinal chỉ tốn một
+lần `searchsorted` trên mảng ngày bắt đầu tháng.
+"""
+from datetime import date
+
+import numpy as np
+
+from calendar_core import lunar
+
+_STRIDE = lunar._STRIDE
+
+# Mảng 14 ô/năm giống lunar._MONTH_STARTS (dùng cho chiều âm -> dương)
+_PADDED_STARTS = np.array(lunar._MONTH_STARTS, dtype=np.int64)
+_LEAPS = np.array(lunar._LEAPS, dtype=np.int64)
+
+
+def _build_month_table():
+    starts, years, months, leaps = [], [], [], []
+    for i, leap in enumerate(lunar._LEAPS):
+        count = 13 if leap else 12
+        for k in range(count):
+            starts.append(lunar._MONTH_STARTS[i * _STRIDE + k])
+            years.append(lunar.FIRST_LUNAR_YEAR + i)
+            if leap and k >= leap:
+                months.append(k)
+                leaps.append(k == leap)
+            else:
+                months.append(k + 1)
+                leaps.append(False)
+    return (np.array(starts, dtype=np.int64), np.array(years, dtype=np.int32),
+            np.array(months, dtype=np.int8), np.array(leaps, dtype=bool))
+
+
+# Một phần tử cho mỗi tháng âm lịch trong bảng, sắp xếp theo ngày bắt đầu
+_STARTS, _YEARS, _MONTHS, _IS_LEAP = _build_month_table()
+
+
+def ordinals_to_lunar(ordinals):
+    """Đổi mảng ordinal dương lịch sang bốn mảng (ngày, tháng, năm, nhuận) âm lịch."""
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if ordinals.size and (ordinals.min() < lunar.MIN_ORDINAL or ordinals.max() > lunar.MAX_ORDINAL):
+        raise ValueError("Có ordinal nằm ngoài bảng âm lịch")
+    idx = np.searchsorted(_STARTS, ordinals, side='right') - 1
+    days = (ordinals - _STARTS[idx] + 1).astype(np.int8)
+    return days, _MONTHS[idx], _YEARS[idx], _IS_LEAP[idx]
+
+
+def lunar_to_ordinals(years, months, days, leaps=False):
+    """Đổi các mảng âm lịch (năm, tháng, ngày, nhuận) sang mảng ordinal dương lịch."""
+    years, months, days, leaps = np.broadcast_arrays(
+        np.asarray(years, dtype=np.int64), np.asarray(months, dtype=np.int64),
+        np.asarray(days, dtype=np.int64), np.asarray(leaps, dtype=bool))
+    i = years - lunar.FIRST_LUNAR_YEAR
+    if i.size and (i.min() < 0 or i.max() >= _LEAPS.size):
+        raise ValueError("Có năm âm lịch nằm ngoài bảng")
+    # Kiểm tra trước khi tra bảng: tháng ngoài 1-12 sẽ trỏ sang năm khác hoặc ra ngoài mảng
+    if np.any((months < 1) | (months > 12)) or np.any(days < 1):
+        raise ValueError("Có ngày âm lịch không tồn tại")
+    leap_month = _LEAPS[i]
+    if np.any(leaps & (months != leap_month)):
+        raise ValueError("Có tháng nhuận không tồn tại")
+    k = np.where(leaps | ((leap_month > 0) & (months > leap_month)), months, months - 1)
+    base = i * _STRIDE + k
+    lengths = _PADDED_STARTS[base + 1] - _PADDED_STARTS[base]
+    if np.any(days > lengths):
+        raise ValueError("Có ngày âm lịch không tồn tại")
+    return _PADDED_STARTS[base] + days - 1
+
+
+def dates_to_ordinals(first, last):
+    """Mảng ordinal liên tiếp từ `first` đến `last` (datetime.date, tính cả hai đầu)."""
+    return np.arange(first.toordinal(), last.toordinal() + 1, dtype=np.int64)
+
+
+def month_grid_ordinals(year, month, weeks=None):
+    """Ordinal của lưới tháng bắt đầu từ thứ Hai (5-6 tuần, hoặc `weeks` tuần)."""
+    first = date(year, month, 1)
+    start = first.toordinal() - first.weekday()
+    if weeks is None:
+        last = date(year + month // 12, month % 12 + 1, 1).toordinal() - 1
+        weeks = (last - start) // 7 + 1
+    return np.arange(start, start + weeks * 7, dtype=np.int64)
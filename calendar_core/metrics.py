@@ -0,0 +1,287 @@
+"""Đo thời gian các đoạn code nóng: span, bộ đếm và histogram.
+
+Mặc định tắt: `span(name)` trả về một context manager rỗng dùng chung và
+`incr()` chỉ kiểm tra một biến, nên chi phí khi tắt gần như bằng không
+(benchmarks/bench_metrics.py kiểm tra điều này).
+
+Bật bằng cờ `--profile` khi chạy app hoặc biến môi trường
+MENU_CALENDAR_PROFILE. Giá trị là danh sách phân cách bằng dấu phẩy:
+  summary   ghi bảng tổng hợp vào log theo chu kỳ (mặc định)
+  trace     lưu các span thành file JSON trace-event (mở bằng chrome://tracing / Perfetto)
+  cprofile  chạy cProfile trên luồng chính và lưu file .prof khi thoát
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+
+PROFILE_ENV = "MENU_CALENDAR_PROFILE"
+INTERVAL_ENV = "MENU_CALENDAR_PROFILE_INTERVAL"
+DEFAULT_INTERVAL = 60.0
+# Chu kỳ tổng hợp ngắn nhất được chấp nhận (giây), tránh timer chạy liên tục
+MIN_INTERVAL = 1.0
+PROFILE_MODES = ("summary", "trace", "cprofile")
+
+# Số sự kiện trace giữ lại tối đa (cũ nhất bị bỏ trước)
+TRACE_LIMIT = 100000
+
+# Histogram theo lũy thừa 2 của micro giây: bucket k chứa [2^(k-1), 2^k) µs
+BUCKETS = 32
+
+_perf_counter = time.perf_counter
+_enabled = False
+
+
+class Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * BUCKETS
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, fraction):
+        """Cận trên (giây) của bucket chứa phân vị `fraction`, không vượt quá max."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for k, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min((1 << k) / 1e6, self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class Registry:
+    """Tập histogram (theo tên span) và bộ đếm, an toàn khi ghi từ nhiều luồng."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.trace = None
+        self.origin = _perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, name, start, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.record(seconds)
+            if self.trace is not None:
+                self.trace.append((name, start, seconds, threading.get_ident()))
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            if self.trace is not None:
+                self.trace.clear()
+
+    def summary(self):
+        """Bảng tổng hợp nhiều dòng: số lần, trung bình, p50/p99 (theo bucket) và max mỗi span."""
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+        lines = [f"{'span':<32}{'lần':>8}{'tb µs':>10}{'p50 µs':>10}{'p99 µs':>10}{'max µs':>10}"]
+        for name, h in histograms:
+            lines.append(f"{name:<32}{h.count:>8}{h.mean * 1e6:>10.1f}{h.percentile(0.5) * 1e6:>10.0f}"
+                         f"{h.percentile(0.99) * 1e6:>10.0f}{h.max * 1e6:>10.0f}")
+        for name, value in counters:
+            lines.append(f"{name:<32}{value:>8}")
+        return "\n".join(lines)
+
+    def trace_events(self):
+        """Các span đã ghi theo định dạng trace-event của Chrome (đơn vị µs)."""
+        pid = os.getpid()
+        with self._lock:
+            records = list(self.trace or ())
+        return [
+            {"name": name, "ph": "X", "ts": (start - self.origin) * 1e6, "dur": seconds * 1e6,
+             "pid": pid, "tid": tid}
+            for name, start, seconds, tid in records
+        ]
+
+    def write_trace(self, path):
+        import json
+
+        temp = path + ".tmp"
+        with open(temp, "w") as handle:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, handle)
+        os.replace(temp, path)
+        return path
+
+
+REGISTRY = Registry()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = _perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.record(self.name, self.start, _perf_counter() - self.start)
+        return False
+
+
+def span(name):
+    """`with span("tên"):` đo một đoạn code; không làm gì khi đang tắt."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def incr(name, amount=1):
+    if _enabled:
+        REGISTRY.incr(name, amount)
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(trace=False):
+    global _enabled
+    if trace and REGISTRY.trace is None:
+        REGISTRY.trace = deque(maxlen=TRACE_LIMIT)
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def profile_interval(environ=os.environ):
+    """Chu kỳ tổng hợp (giây) từ MENU_CALENDAR_PROFILE_INTERVAL; ValueError nếu không hợp lệ."""
+    value = environ.get(INTERVAL_ENV)
+    if value is None:
+        return DEFAULT_INTERVAL
+    try:
+        interval = float(value)
+    except ValueError:
+        raise ValueError(f"{INTERVAL_ENV} không phải số: {value!r}") from None
+    if not math.isfinite(interval) or interval < MIN_INTERVAL:
+        raise ValueError(f"{INTERVAL_ENV} phải từ {MIN_INTERVAL:.0f} giây trở lên: {value!r}")
+    return interval
+
+
+def profile_modes(argv, environ=os.environ):
+    """Tập chế độ profile từ `--profile[=a,b]` trong argv hoặc biến môi trường; rỗng nếu tắt.
+
+    Khi profile bật, MENU_CALENDAR_PROFILE_INTERVAL cũng được kiểm tra (ValueError nếu sai).
+    """
+    value = None
+    for arg in argv[1:]:
+        if arg == "--profile":
+            value = "summary"
+        elif arg.startswith("--profile="):
+            value = arg.split("=", 1)[1]
+    if value is None:
+        value = environ.get(PROFILE_ENV, "")
+        if value.lower() in ("", "0", "false", "no", "off"):
+            return frozenset()
+        if value.lower() in ("1", "true", "yes", "on"):
+            value = "summary"
+    modes = {mode.strip().lower() for mode in value.split(",") if mode.strip()}
+    unknown = modes - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(f"Chế độ profile không hợp lệ: {', '.join(sorted(unknown))}")
+    profile_interval(environ)
+    return frozenset(modes | {"summary"})
+
+
+class ProfileSession:
+    """Bật đo đạc theo `modes`, ghi tổng hợp định kỳ qua `emit` và lưu file khi dừng.
+
+    `timers` là một TimerBackend (NSTimer trong app, FakeTimers trong benchmark).
+    """
+
+    def __init__(self, modes, output_dir, timers, emit, interval=None):
+        self.modes = frozenset(modes)
+        self.output_dir = output_dir
+        self.timers = timers
+        self.emit = emit
+        self.interval = interval or profile_interval()
+        self.profiler = None
+        self._timer = None
+        self.summaries = 0
+
+    def start(self):
+        enable(trace="trace" in self.modes)
+        if "cprofile" in self.modes:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self._arm()
+
+    def _arm(self):
+        self._timer = self.timers.arm(self.interval, self._tick)
+
+    def _tick(self):
+        self._timer = None
+        self.report()
+        self._arm()
+
+    def report(self):
+        self.summaries += 1
+        self.emit("Profile summary:\n" + REGISTRY.summary())
+
+    def stop(self):
+        """Dừng đo, ghi tổng hợp cuối cùng; trả về danh sách file đã lưu."""
+        if self._timer is not None:
+            self.timers.cancel(self._timer)
+            self._timer = None
+        written = []
+        if self.profiler is not None:
+            self.profiler.disable()
+            path = os.path.join(self.output_dir, "menu_calendar.prof")
+            self.profiler.dump_stats(path)
+            written.append(path)
+            self.profiler = None
+        if "trace" in self.modes:
+            written.append(REGISTRY.write_trace(os.path.join(self.output_dir, "menu_calendar_trace.json")))
+        self.report()
+        disable()
+        return written
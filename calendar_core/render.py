@@ -0,0 +1,179 @@
+"""Lập lịch vẽ lưới tháng: gộp yêu cầu, tính ở luồng nền, chỉ áp dụng kết quả mới nhất.
+
+Khi bấm → mười lần liên tiếp, mỗi lần chỉ ghi đè "tháng cần vẽ". Luồng nền
+luôn lấy yêu cầu mới nhất để tính bố cục; kết quả được đưa về luồng chính
+qua `dispatcher` và bị bỏ nếu trong lúc đó đã có yêu cầu mới hơn. Kết quả là
+chỉ tháng cuối cùng được vẽ.
+
+`RenderScheduler` không biết gì về AppKit: executor (nơi chạy `compute`) và
+dispatcher (cách quay về luồng chính) đều cắm được. Bản AppKit của dispatcher
+nằm trong menu_calendar.py.
+"""
+import logging
+import queue
+import threading
+import time
+
+from calendar_core.metrics import REGISTRY, is_enabled
+
+
+class Executor:
+    """Nơi chạy các việc tính toán nền."""
+
+    def submit(self, func):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class InlineExecutor(Executor):
+    """Chạy ngay trên luồng gọi (benchmark, chạy không đồng bộ hoá)."""
+
+    def submit(self, func):
+        func()
+
+
+class ThreadExecutor(Executor):
+    """Một luồng nền duy nhất, các việc chạy tuần tự theo thứ tự gửi."""
+
+    _STOP = object()
+
+    def __init__(self, name="calendar-render"):
+        self.name = name
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, func):
+        with self._lock:
+            if self._thread is None:
+                # Luồng chỉ được tạo khi có việc đầu tiên
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        self._queue.put(func)
+
+    def _run(self):
+        while True:
+            func = self._queue.get()
+            if func is self._STOP:
+                return
+            try:
+                func()
+            except Exception as e:
+                logging.error(f"Error in {self.name} worker: {str(e)}")
+
+    def shutdown(self, timeout=1.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+
+
+class Dispatcher:
+    """Cách đưa một lời gọi về luồng chính."""
+
+    def call_soon(self, func):
+        raise NotImplementedError
+
+
+class InlineDispatcher(Dispatcher):
+    def call_soon(self, func):
+        func()
+
+
+class QueueDispatcher(Dispatcher):
+    """Gom lời gọi vào hàng đợi; luồng chính gọi `drain()` (dùng cho benchmark / chạy không giao diện)."""
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def call_soon(self, func):
+        self._queue.put(func)
+
+    def drain(self, timeout=None):
+        """Chạy các lời gọi đang chờ; nếu có `timeout`, chờ tối đa chừng đó cho lời gọi đầu tiên."""
+        ran = 0
+        try:
+            if timeout is not None:
+                self._queue.get(timeout=timeout)()
+                ran += 1
+            while True:
+                self._queue.get_nowait()()
+                ran += 1
+        except queue.Empty:
+            return ran
+
+
+class RenderScheduler:
+    """Gộp các yêu cầu vẽ thành một: `compute(target)` chạy trên executor, `apply(target, result)` trên luồng chính.
+
+    `request()` và `invalidate()` chỉ được gọi từ luồng chính.
+    """
+
+    def __init__(self, compute, apply, executor, dispatcher):
+        self.compute = compute
+        self.apply = apply
+        self.executor = executor
+        self.dispatcher = dispatcher
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = None
+        self._busy = False
+        self.requests = 0
+        self.computed = 0
+        self.paints = 0
+        self.stale = 0
+        self.last_latency = None
+
+    @property
+    def idle(self):
+        with self._lock:
+            return not self._busy and self._pending is None
+
+    def request(self, target):
+        """Yêu cầu vẽ `target`; ghi đè yêu cầu cũ chưa được tính."""
+        self.requests += 1
+        self._generation += 1
+        with self._lock:
+            self._pending = (self._generation, target, time.perf_counter())
+            if self._busy:
+                return
+            self._busy = True
+        self.executor.submit(self._work)
+
+    def invalidate(self):
+        """Bỏ mọi yêu cầu đang chờ / đang tính (ví dụ trước khi vẽ đồng bộ)."""
+        self._generation += 1
+        with self._lock:
+            self._pending = None
+
+    def _work(self):
+        while True:
+            with self._lock:
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    self._busy = False
+                    return
+            generation, target, requested_at = pending
+            try:
+                result = self.compute(target)
+            except Exception as e:
+                logging.error(f"Error computing render for {target}: {str(e)}")
+                continue
+            self.computed += 1
+            # Gắn giá trị ngay: vòng lặp sau sẽ gán lại các biến này trước khi luồng chính chạy
+            self.dispatcher.call_soon(
+                lambda g=generation, t=target, r=result, at=requested_at: self._deliver(g, t, r, at))
+
+    def _deliver(self, generation, target, result, requested_at):
+        if generation != self._generation:
+            # Đã có yêu cầu mới hơn: kết quả này không còn cần
+            self.stale += 1
+            return
+        self.apply(target, result)
+        self.paints += 1
+        self.last_latency = time.perf_counter() - requested_at
+        if is_enabled():
+            REGISTRY.record("render.latency", requested_at, self.last_latency)
@@ -0,0 +1,126 @@
+"""Bộ lập lịch làm mới theo hạn chót duy nhất.
+
+Thay cho timer 60 giây + timer nửa đêm: luôn chỉ có đúng một hạn chót được
+hẹn (nửa đêm địa phương kế tiếp). Các sự kiện đánh thức, mở khoá màn hình,
+đổi giờ hệ thống hay đổi múi giờ gọi `poke()`; nhiều lần poke liên tiếp được
+gộp thành một lần kiểm tra. Đồng hồ và timer được truyền vào nên có thể mô
+phỏng nhiều tuần trong vài mili giây (xem benchmarks/sim_scheduler.py).
+"""
+from datetime import datetime, timedelta
+import logging
+import time
+
+from calendar_core.metrics import span
+
+
+class SystemClock:
+    """Đồng hồ thật: monotonic cho timer, giờ hệ thống cho ngày địa phương."""
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def time(self):
+        return time.time()
+
+    def local_datetime(self, timestamp=None):
+        """datetime địa phương (naive) tại `timestamp`, mặc định là bây giờ."""
+        return datetime.fromtimestamp(self.time() if timestamp is None else timestamp)
+
+    def local_timestamp(self, naive):
+        """Epoch của một datetime địa phương naive (tính đúng giờ mùa hè)."""
+        return naive.timestamp()
+
+
+class TimerBackend:
+    """Giao diện timer một lần cho RefreshScheduler."""
+
+    def arm(self, delay, callback):
+        """Hẹn gọi `callback()` sau `delay` giây, trả về handle để huỷ."""
+        raise NotImplementedError
+
+    def cancel(self, handle):
+        raise NotImplementedError
+
+
+class RefreshScheduler:
+    def __init__(self, clock, timers, on_refresh, margin=1.0, max_delay=6 * 3600):
+        self.clock = clock
+        self.timers = timers
+        self.on_refresh = on_refresh
+        # Hẹn trễ hơn nửa đêm một chút để chắc chắn đã sang ngày mới
+        self.margin = margin
+        # Lưới an toàn nếu bỏ lỡ thông báo đổi giờ: không hẹn quá xa
+        self.max_delay = max_delay
+        self.last_date = None
+        self.deadline = None
+        self._handle = None
+        self._poke_pending = False
+        self.wakeups = 0
+        self.refreshes = 0
+        self.coalesced = 0
+
+    @property
+    def armed(self):
+        return self._handle is not None
+
+    def start(self):
+        self.last_date = self.clock.local_datetime().date()
+        self._arm()
+
+    def stop(self):
+        if self._handle is not None:
+            self.timers.cancel(self._handle)
+            self._handle = None
+        self.deadline = None
+        self._poke_pending = False
+
+    def poke(self, reason=""):
+        """Yêu cầu kiểm tra lại ngay (wake, unlock, đổi giờ, đổi múi giờ)."""
+        if self._poke_pending:
+            self.coalesced += 1
+            return
+        logging.info(f"Refresh requested ({reason}), re-arming scheduler")
+        self._poke_pending = True
+        self._replace_timer(0.0)
+
+    def check_now(self):
+        """Kiểm tra ngày đồng bộ rồi hẹn lại hạn chót."""
+        self._check()
+        self._arm()
+
+    def seconds_until_midnight(self):
+        now_ts = self.clock.time()
+        now = self.clock.local_datetime(now_ts)
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return max(0.0, self.clock.local_timestamp(next_midnight) - now_ts)
+
+    def _arm(self):
+        self._poke_pending = False
+        delay = self.seconds_until_midnight() + self.margin
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        logging.info(f"Scheduled refresh in {delay:.0f} seconds", extra={"rate_key": "scheduler.arm"})
+        self._replace_timer(delay)
+
+    def _replace_timer(self, delay):
+        if self._handle is not None:
+            self.timers.cancel(self._handle)
+        self.deadline = self.clock.monotonic() + delay
+        self._handle = self.timers.arm(delay, self._fire)
+
+    def _fire(self):
+        self._handle = None
+        self.wakeups += 1
+        with span("scheduler.tick"):
+            try:
+                self._check()
+            finally:
+                self._arm()
+
+    def _check(self):
+        today = self.clock.local_datetime().date()
+        if today != self.last_date:
+            logging.info(f"Date changed from {self.last_date} to {today}")
+            self.last_date = today
+            self.refreshes += 1
+            self.on_refresh(today)
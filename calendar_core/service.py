@@ -0,0 +1,247 @@
+"""Dịch vụ tra cứu âm lịch qua Unix socket cho script, prompt shell và các tool khác.
+
+App đang chạy sẵn nên bảng âm lịch, chỉ mục ngày lễ và cache bố cục đều đã
+"nóng"; client chỉ cần mở socket thay vì tự import lunarcalendar mỗi lần.
+
+Giao thức: mỗi yêu cầu là một dòng `lệnh tham số...`, mỗi phản hồi là một dòng
+JSON `{"ok": ...}` hoặc `{"error": "..."}`, đúng thứ tự yêu cầu. Client được
+gửi nhiều dòng liền nhau không cần chờ (pipelining); server xử lý mọi dòng đã
+nhận đủ rồi trả lời bằng một lần ghi.
+
+  ping                               "pong"
+  lunar [YYYY-MM-DD]                 [năm, tháng, ngày, nhuận] (mặc định hôm nay)
+  batch YYYY-MM-DD ...               danh sách như trên, tối đa MAX_BATCH ngày
+  range YYYY-MM-DD N                 N ngày liên tiếp từ ngày đầu
+  month YYYY MM                      lưới tháng như `export_calendar.py -f json`
+  holidays YYYY-MM-DD [YYYY-MM-DD]   [[ngày, tên, loại, nghỉ lễ], ...] trong khoảng
+
+Server chạy trên luồng nền (mỗi kết nối một luồng), không đụng tới AppKit.
+Đường dẫn socket (`socket_path`, `default_socket_path`) nằm trong
+calendar_core/client.py để client không phải import module này.
+Thử nhanh: printf 'lunar\\n' | nc -U <socket>
+"""
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from datetime import date
+
+from calendar_core.metrics import incr, span
+
+# Đủ cho một lệnh batch MAX_BATCH ngày
+MAX_LINE = 256 * 1024
+MAX_BATCH = 10000
+MAX_RANGE_DAYS = 36600
+RECV_SIZE = 64 * 1024
+
+
+class QueryError(ValueError):
+    pass
+
+
+# Dùng chung một encoder: json.dumps với tham số riêng tạo encoder mới mỗi lần gọi
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode(response):
+    return _ENCODER.encode(response).encode("utf-8") + b"\n"
+
+
+def _parse_date(text):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise QueryError(f"Ngày không hợp lệ: {text}")
+
+
+def _parse_int(text, name):
+    try:
+        return int(text)
+    except ValueError:
+        raise QueryError(f"{name} không hợp lệ: {text}")
+
+
+class QueryService:
+    """Xử lý các dòng yêu cầu; an toàn khi gọi từ nhiều luồng.
+
+    `days` là DayCache của app (nếu có; chỉ đọc nên dùng chung được). `holidays`
+    mặc định là một HolidayCalendar riêng: một truy vấn `holidays` dài nhiều năm
+    không được đẩy các năm popover đang hiện ra khỏi LRU nhỏ của app. `today`
+    trả về ngày hiện tại (đổi được trong benchmark).
+    """
+
+    def __init__(self, holidays=None, today=date.today, month_cache_size=24, days=None):
+        # Import ở đây để app chỉ trả giá khi bật dịch vụ
+        from calendar_core import lunar
+        from calendar_core.holidays import HolidayCalendar
+        from calendar_core.layout import MonthLayoutCache
+
+        self.lunar = lunar
+        self.holidays = holidays if holidays is not None else HolidayCalendar(days=days)
+        self.today = today
+        # Cache riêng để truy vấn từ ngoài không đẩy các tháng của popover ra khỏi LRU
+        self.layouts = MonthLayoutCache(maxsize=month_cache_size, today=today(), holidays=self.holidays,
+                                        days=days)
+        self.handlers = {
+            "ping": self._ping,
+            "lunar": self._lunar,
+            "batch": self._batch,
+            "range": self._range,
+            "month": self._month,
+            "holidays": self._holidays,
+        }
+
+    def handle_line(self, line):
+        """Một dòng yêu cầu (bytes, không có \\n) -> một dòng phản hồi (bytes, có \\n)."""
+        parts = line.decode("utf-8", "replace").split()
+        try:
+            if not parts:
+                raise QueryError("Yêu cầu rỗng")
+            handler = self.handlers.get(parts[0].lower())
+            if handler is None:
+                raise QueryError(f"Lệnh không hợp lệ: {parts[0]}")
+            response = {"ok": handler(parts[1:])}
+        except ValueError as e:
+            response = {"error": str(e)}
+        return _encode(response)
+
+    def _convert(self, day):
+        return list(self.lunar.ordinal_to_lunar(day.toordinal()))
+
+    def _ping(self, args):
+        return "pong"
+
+    def _lunar(self, args):
+        if len(args) > 1:
+            raise QueryError("lunar nhận tối đa một ngày")
+        return self._convert(_parse_date(args[0]) if args else self.today())
+
+    def _batch(self, args):
+        if len(args) > MAX_BATCH:
+            raise QueryError(f"batch tối đa {MAX_BATCH} ngày")
+        return [self._convert(_parse_date(arg)) for arg in args]
+
+    def _range(self, args):
+        if len(args) != 2:
+            raise QueryError("range cần ngày đầu và số ngày")
+        first = _parse_date(args[0])
+        count = _parse_int(args[1], "Số ngày")
+        if not 0 <= count <= MAX_RANGE_DAYS:
+            raise QueryError(f"Số ngày phải trong 0..{MAX_RANGE_DAYS}")
+        return [list(item) for item in self.lunar.convert_range(first.toordinal(), count)]
+
+    def _month(self, args):
+        from calendar_core.export import month_dict
+
+        if len(args) != 2:
+            raise QueryError("month cần năm và tháng")
+        year, month = _parse_int(args[0], "Năm"), _parse_int(args[1], "Tháng")
+        if not 1 <= month <= 12 or not 1 <= year <= 9999:
+            raise QueryError(f"Tháng không hợp lệ: {year}-{month}")
+        self.layouts.set_today(self.today())
+        return month_dict(self.layouts.get(year, month))
+
+    def _holidays(self, args):
+        if not 1 <= len(args) <= 2:
+            raise QueryError("holidays cần ngày đầu và (tuỳ chọn) ngày cuối")
+        first = _parse_date(args[0])
+        last = _parse_date(args[1]) if len(args) == 2 else first
+        if not 0 <= (last - first).days <= MAX_RANGE_DAYS:
+            raise QueryError(f"Khoảng ngày phải trong 0..{MAX_RANGE_DAYS} ngày")
+        result = []
+        for year in range(first.year, last.year + 1):
+            index = self.holidays.year_index(year)
+            for ordinal in sorted(index):
+                if first.toordinal() <= ordinal <= last.toordinal():
+                    day = date.fromordinal(ordinal).isoformat()
+                    result.extend([day, o.name, o.kind, o.public] for o in index[ordinal])
+        return result
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        service = self.server.service
+        buffer = b""
+        while True:
+            try:
+                chunk = self.request.recv(RECV_SIZE)
+            except OSError:
+                return
+            if not chunk:
+                return
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            if len(buffer) > MAX_LINE:
+                self.request.sendall(_encode({"error": "Dòng yêu cầu quá dài"}))
+                return
+            if not lines:
+                continue
+            # Mọi yêu cầu đã nhận đủ được trả lời trong một lần ghi
+            with span("service.batch"):
+                responses = b"".join(service.handle_line(line.rstrip(b"\r")) for line in lines)
+            incr("service.requests", len(lines))
+            try:
+                self.request.sendall(responses)
+            except OSError:
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    block_on_close = False
+
+
+class QueryServer:
+    """Lắng nghe trên Unix socket `path` ở một luồng nền; `stop()` đóng và xoá socket."""
+
+    def __init__(self, path, service):
+        self.path = path
+        self.service = service
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._remove_stale()
+        self._server = _Server(self.path, _Handler, bind_and_activate=False)
+        self._server.service = self.service
+        # Chỉ người dùng hiện tại được kết nối
+        old_umask = os.umask(0o177)
+        try:
+            self._server.server_bind()
+        finally:
+            os.umask(old_umask)
+        self._server.server_activate()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="query-service", daemon=True)
+        self._thread.start()
+        return self
+
+    def _remove_stale(self):
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            # Socket còn sót lại từ lần chạy trước
+            os.unlink(self.path)
+        else:
+            raise OSError(f"Another instance is already serving {self.path}")
+        finally:
+            probe.close()
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(1.0)
+        self._server = self._thread = None
+        try:
+            os.unlink(self.path)
+        except OSError as e:
+            logging.error(f"Error removing query socket: {str(e)}")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Xuất lịch tháng / năm ra PNG, văn bản hoặc JSON (không cần giao diện).
+
+Ví dụ:
+  python export_calendar.py 2026                          # 12 tháng của 2026, cả ba định dạng
+  python export_calendar.py 2025-11 2026-02 -f text -o -  # in ra màn hình
+  python export_calendar.py 2000 2099 -f json --workers 8
+  python export_calendar.py 2026 -f png --year-sheets     # thêm trang lịch năm 2026.png
+
+Mỗi tháng được ghi ra file ngay khi vẽ xong; cuối cùng in số tháng / giây.
+"""
+import argparse
+import sys
+from datetime import date
+
+from calendar_core.export import FORMATS, export_months, month_range
+
+
+def parse_month(value, end=False):
+    """'2026' -> (2026, 1) hoặc (2026, 12) nếu là đầu cuối; '2026-03' -> (2026, 3)."""
+    try:
+        if "-" in value:
+            year, month = (int(part) for part in value.split("-", 1))
+        else:
+            year, month = int(value), 12 if end else 1
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Tháng không hợp lệ: {value} (dùng YYYY hoặc YYYY-MM)")
+    if not 1 <= month <= 12 or not 1 <= year <= 9999:
+        raise argparse.ArgumentTypeError(f"Tháng không hợp lệ: {value}")
+    return year, month
+
+
+def parse_today(value):
+    if value.lower() == "none":
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ngày không hợp lệ: {value} (dùng YYYY-MM-DD hoặc none)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Xuất lịch tháng ra PNG, văn bản hoặc JSON")
+    parser.add_argument("start", help="Tháng đầu: YYYY hoặc YYYY-MM")
+    parser.add_argument("end", nargs="?", help="Tháng cuối (mặc định: như tháng đầu; YYYY là hết tháng 12)")
+    parser.add_argument("-f", "--format", default=",".join(FORMATS),
+                        help=f"Các định dạng, phân cách bằng dấu phẩy ({', '.join(FORMATS)})")
+    parser.add_argument("-o", "--out-dir", default="calendar_export",
+                        help="Thư mục đầu ra; '-' in text/JSON ra stdout theo thứ tự tháng")
+    parser.add_argument("--workers", type=int, help="Số process vẽ (mặc định: số CPU; 1 là không dùng pool)")
+    parser.add_argument("--today", type=parse_today, default=date.today(),
+                        help="Ngày được đánh dấu hôm nay (YYYY-MM-DD, 'none' để bỏ)")
+    parser.add_argument("--scale", type=int, default=2, help="Hệ số pixel / point của ảnh PNG (mặc định 2)")
+    parser.add_argument("--font", help="Đường dẫn font TrueType cho PNG (mặc định: Arial)")
+    parser.add_argument("--year-sheets", action="store_true", help="Ghép thêm trang lịch năm cho mỗi năm đủ 12 tháng")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Không in từng tháng")
+    args = parser.parse_args(argv)
+
+    try:
+        start = parse_month(args.start)
+        end = parse_month(args.end or args.start, end=True)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    months = month_range(start, end)
+    if not months:
+        parser.error("Tháng cuối đứng trước tháng đầu")
+    formats = [fmt.strip() for fmt in args.format.split(",") if fmt.strip()]
+
+    to_stdout = args.out_dir == "-"
+    # Khi in ra stdout, thông tin tiến độ chuyển sang stderr
+    report = sys.stderr if to_stdout else sys.stdout
+
+    def on_month(year, month, outputs):
+        if to_stdout:
+            for fmt in formats:
+                sys.stdout.write(outputs[fmt].decode("utf-8"))
+                sys.stdout.write("\n")
+            sys.stdout.flush()
+        elif not args.quiet:
+            print(f"{year:04d}-{month:02d}: " + ", ".join(path for path, _ in outputs.values()), file=report)
+
+    try:
+        stats = export_months(months, formats, None if to_stdout else args.out_dir, today=args.today,
+                              workers=args.workers, scale=args.scale, font=args.font,
+                              year_sheets=args.year_sheets, on_month=on_month)
+    except ValueError as e:
+        parser.error(str(e))
+    for path in stats["sheets"]:
+        print(f"Trang lịch năm: {path}", file=report)
+    print(f"Đã xuất {stats['months']} tháng ({', '.join(stats['formats'])}), {stats['bytes'] / 1024:.0f} KiB "
+          f"trong {stats['seconds']:.2f} s: {stats['months_per_second']:.1f} tháng/giây", file=report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,60 +1,240 @@
+#!/usr/bin/env python3
+"""Build icon ngày cho Menu Calendar.
+
+Vẽ 31 icon song song bằng process pool, bỏ qua file đã có và không đổi (so
+hash của tham số mẫu, font, kích thước), xuất:
+
+* calendar_{day}_icon.png: bản 256px như trước (fallback của ứng dụng);
+* menubar/calendar_{day}_icon@1x.png, @2x.png: đúng cỡ thanh menu (20pt);
+* calendar_atlas@1x.png, calendar_atlas@2x.png + calendar_atlas.json: sprite
+  sheet để ứng dụng cắt icon mà không phải giải mã 31 file.
+
+Chạy: python images/generate_calendar_day_png.py [--force] [--workers N] [--font PATH]
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+import json
+import math
+import os
+import time
+
 from PIL import Image, ImageDraw, ImageFont
 
-# Kích thước ảnh
-icon_size = 256
+IMAGES_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Tạo các file từ 1 đến 31
-for day in range(1, 32):
-    # Tạo ảnh mới với nền trong suốt
-    image = Image.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(image)
+# Tăng khi đổi cách vẽ để buộc build lại toàn bộ
+GENERATOR_VERSION = 2
 
-    # Tính chiều cao phần màu đỏ (1/6 tổng chiều cao)
-    red_height = icon_size // 6
+LEGACY_SIZE = 256
+MENUBAR_POINTS = 20
+SCALES = (1, 2)
+ATLAS_COLUMNS = 8
 
-    # Tạo nền trắng với góc bo tròn
-    radius = 20
-    draw.rounded_rectangle(
-        [0, 0, icon_size, icon_size],
-        radius=radius,
-        fill='white'
-    )
+# Mẫu thiết kế, tính theo icon 256px
+TEMPLATE = {
+    "radius": 20,
+    "header_ratio": 6,
+    "font_size": 180,
+    "text_offset": 10,
+    "header_color": "red",
+    "body_color": "white",
+    "text_color": "black",
+}
+
+FONT_CANDIDATES = (
+    "Arial.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+)
+
+STAMP_FILE = ".icon_build_cache.json"
+ATLAS_MANIFEST = "calendar_atlas.json"
 
-    # Vẽ phần màu đỏ ở phía trên với góc bo tròn ở trên
+
+def find_font(path=None):
+    """Đường dẫn font TrueType dùng để vẽ, hoặc None nếu phải dùng font mặc định."""
+    for candidate in ((path,) if path else FONT_CANDIDATES):
+        try:
+            ImageFont.truetype(candidate, 10)
+            return candidate
+        except OSError:
+            continue
+    return None
+
+
+def font_digest(font_path):
+    if font_path is None:
+        return "default"
+    try:
+        with open(font_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        # Font nạp được qua tên hệ thống nhưng không đọc trực tiếp được
+        return font_path
+
+
+def job_hash(day, size, font_hash):
+    payload = json.dumps([GENERATOR_VERSION, TEMPLATE, font_hash, size, day], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def load_font(font_path, font_size):
+    # Mỗi process chỉ nạp font một lần cho mỗi cỡ chữ
+    if font_path is None:
+        return ImageFont.load_default(), True
+    return ImageFont.truetype(font_path, font_size), False
+
+
+def render_day_icon(day, icon_size, font_path=None):
+    """Vẽ icon lịch cho ngày `day` với cạnh `icon_size` pixel."""
+    scale = icon_size / LEGACY_SIZE
+    image = Image.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+
+    # Phần màu đỏ chiếm 1/6 chiều cao
+    red_height = icon_size // TEMPLATE["header_ratio"]
+    radius = max(1, round(TEMPLATE["radius"] * scale))
+    draw.rounded_rectangle([0, 0, icon_size, icon_size], radius=radius, fill=TEMPLATE["body_color"])
     draw.rounded_rectangle(
         [0, 0, icon_size, red_height],
         radius=radius,
-        fill='red',
+        fill=TEMPLATE["header_color"],
         corners=(True, True, False, False)
     )
 
-    # Tải font
-    font_size = 180  # Font size đã chỉnh thành 200
-    try:
-        font = ImageFont.truetype("Arial.ttf", font_size)
-    except:
-        font = ImageFont.load_default()
-        font_size = 50  # Giảm kích thước nếu dùng font mặc định
+    font_size = max(1, round(TEMPLATE["font_size"] * scale))
+    font, is_default = load_font(font_path, font_size)
+    if is_default:
+        font_size = max(1, round(50 * scale))  # Giảm kích thước nếu dùng font mặc định
 
-    # Văn bản là số ngày
     text = str(day)
-
-    # Tính kích thước văn bản
     text_width, text_height = draw.textlength(text, font=font), font_size
+    x = (icon_size - text_width) // 2
+    white_height = icon_size - red_height
+    y = red_height + (white_height - text_height) // 2 - round(TEMPLATE["text_offset"] * scale)
+    draw.text((x, y), text, fill=TEMPLATE["text_color"], font=font)
+    return image
+
+
+def output_path(out_dir, day, size):
+    if size == LEGACY_SIZE:
+        return os.path.join(out_dir, f"calendar_{day}_icon.png")
+    scale = size // MENUBAR_POINTS
+    return os.path.join(out_dir, "menubar", f"calendar_{day}_icon@{scale}x.png")
+
+
+def _render_job(job):
+    day, size, font_path, path = job
+    render_day_icon(day, size, font_path).save(path, 'PNG')
+    return path
+
+
+def build_atlas(out_dir, scale, days=range(1, 32)):
+    """Ghép các icon @{scale}x thành một sprite sheet, trả về mục manifest."""
+    size = MENUBAR_POINTS * scale
+    rows = math.ceil(len(days) / ATLAS_COLUMNS)
+    atlas = Image.new('RGBA', (ATLAS_COLUMNS * size, rows * size), (0, 0, 0, 0))
+    frames = {}
+    for index, day in enumerate(days):
+        x, y = (index % ATLAS_COLUMNS) * size, (index // ATLAS_COLUMNS) * size
+        with Image.open(output_path(out_dir, day, size)) as icon:
+            atlas.paste(icon, (x, y))
+        frames[str(day)] = [x, y, size, size]
+    name = f"calendar_atlas@{scale}x.png"
+    atlas.save(os.path.join(out_dir, name), 'PNG')
+    return {"file": name, "frames": frames}
+
+
+def load_stamps(out_dir):
+    try:
+        with open(os.path.join(out_dir, STAMP_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_json_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, path)
+
+
+def build(out_dir=IMAGES_DIR, font=None, workers=None, force=False, legacy=True):
+    """Build toàn bộ icon; trả về dict thống kê thời gian."""
+    started = time.perf_counter()
+    os.makedirs(os.path.join(out_dir, "menubar"), exist_ok=True)
+    font_path = find_font(font)
+    font_hash = font_digest(font_path)
+    stamps = {} if force else load_stamps(out_dir)
+
+    sizes = [MENUBAR_POINTS * scale for scale in SCALES] + ([LEGACY_SIZE] if legacy else [])
+    jobs, new_stamps = [], {}
+    for size in sizes:
+        for day in range(1, 32):
+            path = output_path(out_dir, day, size)
+            key = os.path.relpath(path, out_dir)
+            digest = job_hash(day, size, font_hash)
+            new_stamps[key] = digest
+            if stamps.get(key) != digest or not os.path.exists(path):
+                jobs.append((day, size, font_path, path))
+    planned = time.perf_counter()
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_render_job, jobs, chunksize=4):
+                pass
+    rendered = time.perf_counter()
+
+    # Atlas chỉ ghép lại khi một icon thành phần thay đổi
+    manifest_path = os.path.join(out_dir, ATLAS_MANIFEST)
+    atlas_digest = hashlib.sha256(json.dumps(
+        sorted((k, v) for k, v in new_stamps.items() if k.startswith("menubar"))).encode("utf-8")).hexdigest()
+    atlas_built = False
+    if stamps.get(ATLAS_MANIFEST) != atlas_digest or not os.path.exists(manifest_path) or any(
+            not os.path.exists(os.path.join(out_dir, f"calendar_atlas@{scale}x.png")) for scale in SCALES):
+        manifest = {
+            "version": GENERATOR_VERSION,
+            "icon_size": MENUBAR_POINTS,
+            "sheets": {str(scale): build_atlas(out_dir, scale) for scale in SCALES},
+        }
+        write_json_atomic(manifest_path, manifest)
+        atlas_built = True
+    new_stamps[ATLAS_MANIFEST] = atlas_digest
+    write_json_atomic(os.path.join(out_dir, STAMP_FILE), new_stamps)
+    finished = time.perf_counter()
+
+    return {
+        "font": font_path or "default",
+        "rendered": len(jobs),
+        "skipped": len(new_stamps) - 1 - len(jobs),
+        "atlas_built": atlas_built,
+        "plan_ms": (planned - started) * 1000,
+        "render_ms": (rendered - planned) * 1000,
+        "atlas_ms": (finished - rendered) * 1000,
+        "total_ms": (finished - started) * 1000,
+    }
 
-    # Tính vị trí để canh giữa văn bản
-    x = (icon_size - text_width) // 2  # Canh giữa trái-phải
-    white_height = icon_size - red_height  # Chiều cao phần trắng
-    offset = 10
-    y = red_height + (white_height - text_height) // 2 - offset  # Canh giữa và nhích lên
 
-    # Vẽ số ngày màu đen
-    draw.text((x, y), text, fill='black', font=font)
+def main():
+    parser = argparse.ArgumentParser(description="Build icon ngày cho Menu Calendar")
+    parser.add_argument("--out-dir", default=IMAGES_DIR)
+    parser.add_argument("--font", help="Đường dẫn font TrueType (mặc định: Arial)")
+    parser.add_argument("--workers", type=int, help="Số process vẽ (mặc định: số CPU)")
+    parser.add_argument("--force", action="store_true", help="Vẽ lại toàn bộ, bỏ qua cache hash")
+    parser.add_argument("--no-legacy", action="store_true", help="Không xuất bản 256px")
+    args = parser.parse_args()
 
-    # Lưu ảnh với tên file tương ứng
-    filename = f'calendar_{day}_icon.png'
-    image.save(filename, 'PNG')
+    stats = build(args.out_dir, font=args.font, workers=args.workers, force=args.force, legacy=not args.no_legacy)
+    print(f"Font: {stats['font']}")
+    print(f"Đã vẽ {stats['rendered']} icon, bỏ qua {stats['skipped']} icon không đổi"
+          f"{', đã ghép lại atlas' if stats['atlas_built'] else ''}")
+    print(f"Thời gian: lập kế hoạch {stats['plan_ms']:.1f} ms, vẽ {stats['render_ms']:.1f} ms, "
+          f"atlas {stats['atlas_ms']:.1f} ms, tổng {stats['total_ms']:.1f} ms")
 
-    print(f"Icon {filename} đã được tạo và lưu")
 
-print("Đã tạo xong tất cả 31 icon!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
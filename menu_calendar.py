@@ -4,14 +4,26 @@ from AppKit import (
     NSApplication, NSStatusBar, NSPopover, NSView, NSTextField, NSMakeRect, 
     NSColor, NSSize, NSButton, NSRoundedBezelStyle, NSCenterTextAlignment, 
     NSFont, NSImage, NSMutableAttributedString, NSMenu, 
-    NSMenuItem, NSMakePoint, NSTimer, NSTextAttachment
+    NSMenuItem, NSMakePoint, NSTimer, NSTextAttachment, NSMutableParagraphStyle,
+    NSScreen, NSCompositingOperationCopy, NSWorkspace, NSWorkspaceDidWakeNotification
 )
 from Foundation import (
-    NSObject, NSAttributedString, NSDictionary, NSNotificationCenter, NSDistributedNotificationCenter
+    NSObject, NSAttributedString, NSDictionary, NSNotificationCenter, NSDistributedNotificationCenter,
+    NSSystemClockDidChangeNotification, NSSystemTimeZoneDidChangeNotification
 )
-from datetime import datetime, timedelta
-import calendar
-from lunarcalendar import Converter, Solar
+from datetime import datetime
+from calendar_core.lunar import solar_to_lunar
+from calendar_core.layout import MonthLayoutCache, CELL_WIDTH, CELL_HEIGHT, WEEKDAY_LABELS
+from calendar_core.cells import CellBackend, CellPool
+from calendar_core.holidays import HolidayCalendar
+from calendar_core.daycache import DayCache
+from calendar_core.ics import EventStore, user_calendar_dir
+from calendar_core.images import TODAY_COLORS, DayImages, ImageBackend
+from calendar_core.scheduler import RefreshScheduler, SystemClock, TimerBackend
+from calendar_core.logging_setup import setup_logging
+from calendar_core.metrics import ProfileSession, incr, profile_modes, span
+from calendar_core.render import Dispatcher, RenderScheduler, ThreadExecutor
+from calendar_core.client import socket_path
 import sys, os
 import logging
         
@@ -23,18 +35,10 @@ def resource_path(relative_path):
         base_path = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(base_path, relative_path)
 
-# Thiết lập logging
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-LOG_FILE = os.path.join(SCRIPT_DIR, "menu_calendar.log")
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-
-# Biến toàn cục cho ngày cập nhật cuối cùng
-last_update_date = None
+# Thiết lập logging: ghi file ở luồng nền, xoay vòng, giới hạn log lặp lại.
+# Khi chạy từ bundle PyInstaller (chỉ đọc) log chuyển sang ~/Library/Logs/MenuCalendar
+SCRIPT_DIR = os.path.dirname(resource_path(""))
+LOG_FILE, LOG_LISTENER = setup_logging(log_dir=SCRIPT_DIR)
 
 # Lớp WakeupObserver để lắng nghe sự kiện đánh thức
 class WakeupObserver(NSObject):
@@ -46,30 +50,61 @@ class WakeupObserver(NSObject):
 
     def onWakeup_(self, notification):
         try:
-            logging.info("System wakeup event detected, triggering calendar update check")
-            self.callback()
+            logging.info(f"System event {notification.name()} detected, triggering calendar update check")
+            self.callback(str(notification.name()))
         except Exception as e:
             logging.error(f"Error handling wakeup event: {str(e)}")
 
-# Hàm lên lịch cập nhật vào nửa đêm
-def schedule_midnight_update(target, selector):
-    try:
-        now = datetime.now()
-        next_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        interval = (next_midnight - now).total_seconds()
-        
+# Timer một lần của AppKit cho RefreshScheduler
+class TimerTarget(NSObject):
+    def initWithCallback_(self, callback):
+        self = objc.super(TimerTarget, self).init()
+        if self:
+            self.callback = callback
+        return self
+
+    def fire_(self, timer):
+        try:
+            self.callback()
+        except Exception as e:
+            logging.error(f"Error in scheduled refresh: {str(e)}")
+
+class MainThreadCall(NSObject):
+    def initWithCallback_(self, callback):
+        self = objc.super(MainThreadCall, self).init()
+        if self:
+            self.callback = callback
+        return self
+
+    def run_(self, argument):
+        try:
+            self.callback()
+        except Exception as e:
+            logging.error(f"Error in main thread call: {str(e)}")
+
+class AppKitDispatcher(Dispatcher):
+    def call_soon(self, func):
+        call = MainThreadCall.alloc().initWithCallback_(func)
+        call.performSelectorOnMainThread_withObject_waitUntilDone_("run:", None, False)
+
+def make_render_executor():
+    # Luồng nền tính bố cục tháng; benchmark có thể thay bằng InlineExecutor
+    return ThreadExecutor(name="calendar-render")
+
+class NSTimerBackend(TimerBackend):
+    def arm(self, delay, callback):
+        target = TimerTarget.alloc().initWithCallback_(callback)
         timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            interval,
+            delay,
             target,
-            selector,
+            "fire:",
             None,
             False
         )
-        logging.info(f"Scheduled midnight update in {interval} seconds")
         return timer
-    except Exception as e:
-        logging.error(f"Error scheduling midnight update: {str(e)}")
-        return None
+
+    def cancel(self, timer):
+        timer.invalidate()
 
           
 class ClickableTextField(NSTextField):
@@ -99,8 +134,107 @@ class ClickableDayLabel(NSTextField):
     def rightMouseDown_(self, event):
         pass  # Không có chức năng nào cho right-click
 
+class AppKitImageBackend(ImageBackend):
+    def render_today_marker(self, day, diameter, scale, appearance):
+        # Vẽ vào bitmap diameter * scale pixel (khoá cache có scale) với màu của giao diện sáng / tối
+        pixels = int(round(diameter * scale))
+        rep = objc.lookUpClass("NSBitmapImageRep").alloc().initWithBitmapDataPlanes_pixelsWide_pixelsHigh_bitsPerSample_samplesPerPixel_hasAlpha_isPlanar_colorSpaceName_bytesPerRow_bitsPerPixel_(
+            None, pixels, pixels, 8, 4, True, False, "NSDeviceRGBColorSpace", 0, 0
+        )
+        rep.setSize_(NSSize(diameter, diameter))
+        graphics_context = objc.lookUpClass("NSGraphicsContext")
+        graphics_context.saveGraphicsState()
+        graphics_context.setCurrentContext_(graphics_context.graphicsContextWithBitmapImageRep_(rep))
+        try:
+            circle_path = objc.lookUpClass("NSBezierPath").bezierPathWithOvalInRect_(
+                NSMakeRect(0, 0, diameter, diameter)
+            )
+            red, green, blue, alpha = TODAY_COLORS.get(appearance, TODAY_COLORS["light"])
+            NSColor.colorWithSRGBRed_green_blue_alpha_(red / 255, green / 255, blue / 255, alpha / 255).setFill()
+            circle_path.fill()
+            day_attributes = {
+                "NSFont": NSFont.systemFontOfSize_(12),
+                "NSColor": NSColor.blackColor(),
+            }
+            day_attr_string = NSAttributedString.alloc().initWithString_attributes_(str(day), day_attributes)
+            text_size = day_attr_string.size()
+            day_attr_string.drawAtPoint_(NSMakePoint((diameter - text_size.width) / 2, (diameter - text_size.height) / 2))
+        finally:
+            graphics_context.restoreGraphicsState()
+        image = NSImage.alloc().initWithSize_(NSSize(diameter, diameter))
+        image.addRepresentation_(rep)
+        return image
+
+    def load_file(self, path):
+        return NSImage.alloc().initWithContentsOfFile_(path)
+
+    def slice_atlas(self, atlas, frame, scale):
+        x, y, w, h = frame
+        # Toạ độ AppKit tính từ góc dưới bên trái
+        atlas_height = atlas.size().height
+        icon = NSImage.alloc().initWithSize_(NSSize(w / scale, h / scale))
+        icon.lockFocus()
+        atlas.drawInRect_fromRect_operation_fraction_(
+            NSMakeRect(0, 0, w / scale, h / scale),
+            NSMakeRect(x, atlas_height - y - h, w, h),
+            NSCompositingOperationCopy,
+            1.0
+        )
+        icon.unlockFocus()
+        return icon
+
+    def image_bytes(self, image):
+        size = image.size()
+        scale = current_backing_scale()
+        return int(size.width * scale * size.height * scale * 4)
+
+# Cache ảnh dùng chung cho thanh menu và popover
+_day_images = None
+
+def get_day_images():
+    global _day_images
+    if _day_images is None:
+        _day_images = DayImages(AppKitImageBackend(), resource_path("images"))
+    return _day_images
+
+def current_backing_scale():
+    screen = NSScreen.mainScreen()
+    return float(screen.backingScaleFactor()) if screen else 1.0
+
+def current_appearance():
+    appearance = NSApplication.sharedApplication().effectiveAppearance()
+    name = appearance.bestMatchFromAppearancesWithNames_(["NSAppearanceNameAqua", "NSAppearanceNameDarkAqua"])
+    return "dark" if name == "NSAppearanceNameDarkAqua" else "light"
+
+class DayCellBackend(CellBackend):
+    def __init__(self, view):
+        self.view = view
+
+    def create_cell(self, index):
+        day_label = ClickableDayLabel.alloc().init()
+        day_label.initWithFrame_(NSMakeRect(0, 0, CELL_WIDTH, CELL_HEIGHT))
+        day_label.setBezeled_(False)
+        day_label.setDrawsBackground_(False)
+        day_label.setEditable_(False)
+        day_label.setAlignment_(NSCenterTextAlignment)
+        day_label.setHidden_(True)
+        day_label.target = self.view
+        self.view.addSubview_(day_label)
+        return day_label
+
+    def update(self, day_label, state, changed):
+        if "origin" in changed:
+            day_label.setFrameOrigin_(NSMakePoint(*state.origin))
+        if "hidden" in changed:
+            day_label.setHidden_(state.hidden)
+        if "text" in changed or "lunar_text" in changed or "today" in changed or "marker" in changed or "events" in changed:
+            day_label.setAttributedStringValue_(self.view.dayCellContent(state))
+        if "tooltip" in changed:
+            day_label.setToolTip_(state.tooltip or None)
+
 class CalendarView(NSView):
-    def initWithFrame_(self, frame):
+    def initWithFrame_holidays_dayCache_(self, frame, holidays, day_cache):
+        # holidays / day_cache thuộc về app delegate, dùng chung với dịch vụ tra cứu
         self = objc.super(CalendarView, self).initWithFrame_(frame)
         if self:
             self.current_date = datetime.now()
@@ -111,6 +245,16 @@ class CalendarView(NSView):
             self.date_labels = []
             self.lunar_label = None
             self.timer = None
+            self.event_store = EventStore(directory=user_calendar_dir())
+            self.day_cache = day_cache
+            self.layout_cache = MonthLayoutCache(holidays=holidays, events=self.event_store, days=self.day_cache)
+            self.render_executor = make_render_executor()
+            self.dispatcher = AppKitDispatcher()
+            # .ics được nhập ở luồng nền; chấm sự kiện hiện ra khi chỉ mục về tới luồng chính
+            self.reloadEvents()
+            if self.day_cache is None:
+                self.render_executor.submit(self.buildDayCache)
+            self.render_scheduler = RenderScheduler(self.computeLayout, self.applyLayout, self.render_executor, self.dispatcher)
             self.setupUI()
         return self
 
@@ -175,13 +319,15 @@ class CalendarView(NSView):
 
         self.updateButtonStates()
         self.createDayLabels()
+        # 42 ô ngày được tạo một lần rồi tái sử dụng cho mọi tháng
+        self.cell_pool = CellPool(DayCellBackend(self))
+        self.date_labels = self.cell_pool.handles
         self.updateCalendar()
         self.setNeedsDisplay_(True)
 
     def createDayLabels(self):
-        days = ["T2", "T3", "T4", "T5", "T6", "T7", "CN"]
         offset = 30
-        for i, day in enumerate(days):
+        for i, day in enumerate(WEEKDAY_LABELS):
             label = NSTextField.alloc().init()
             label.initWithFrame_(NSMakeRect(self.padding + i * (55 + 4), 400 + offset + 10, 55, 30))
             label.setStringValue_(day)
@@ -201,75 +347,145 @@ class CalendarView(NSView):
     def updateCalendar(self):
         self.updateCalendarUI()
 
-    def updateCalendarUI(self):
-        logging.info(f"Updating UI with month: {self.current_month}, year: {self.current_year}")
-        for label in self.date_labels:
-            label.removeFromSuperview()
-        self.date_labels = []
-
-        offset = 30
-        first_weekday, days_in_month = calendar.monthrange(self.current_year, self.current_month)
-        prev_month = self.current_month - 1 if self.current_month > 1 else 12
-        prev_year = self.current_year if self.current_month > 1 else self.current_year - 1
-        _, days_in_prev_month = calendar.monthrange(prev_year, prev_month)
+    @objc.python_method
+    def buildDayCache(self):
+        # Luồng nền: ghi file cache cho các lần khởi động sau rồi dùng luôn cho lần này
+        try:
+            day_cache = DayCache.load()
+        except Exception as e:
+            logging.error(f"Error building day cache: {str(e)}")
+            return
+        if day_cache is not None:
+            self.day_cache = day_cache
+            self.layout_cache.holidays.days = day_cache
+            self.layout_cache.days = day_cache
+            logging.info("Day cache ready")
 
-        cal = calendar.monthcalendar(self.current_year, self.current_month)
+    def updateCalendarUI(self):
+        # Vẽ đồng bộ: bỏ các lần vẽ nền đang chờ để kết quả cũ không đè lên
+        self.render_scheduler.invalidate()
+        with span("updateCalendarUI"):
+            logging.info(f"Updating UI with month: {self.current_month}, year: {self.current_year}", extra={"rate_key": "updateCalendarUI"})
+            with span("updateCalendarUI.layout"):
+                self.layout_cache.set_today(datetime.now().date())
+                layout = self.layout_cache.get(self.current_year, self.current_month)
+            self.paintLayout(layout)
+
+    @objc.python_method
+    def paintLayout(self, layout):
+        with span("paint"):
+            with span("paint.cells"):
+                incr("cells.writes", self.cell_pool.apply(layout))
+
+            with span("paint.lunar_label"):
+                today = datetime.now()
+                lunar_year, lunar_month, lunar_day, _ = solar_to_lunar(today.year, today.month, today.day)
+                lunar_text = f"Âm lịch: {lunar_day:02d}/{lunar_month:02d}, {lunar_year}"
+                observances = self.layout_cache.holidays.observances(today.date())
+                if observances:
+                    lunar_text += " · " + ", ".join(observance.name for observance in observances)
+                self.lunar_label.setStringValue_(lunar_text)
+            self.subviews()[1].setStringValue_(layout.title)
+
+    @objc.python_method
+    def dayCellContent(self, state):
+        if state.today:
+            attachment = NSTextAttachment.alloc().init()
+            with span("cell.today_marker"):
+                attachment.setImage_(get_day_images().today_marker(int(state.text), scale=current_backing_scale(), appearance=current_appearance()))
+            head = NSAttributedString.attributedStringWithAttachment_(attachment)
+        else:
+            if state.marker == "holiday":
+                day_color = NSColor.systemRedColor()
+            else:
+                day_color = NSColor.labelColor()
+            day_attributes = {
+                "NSFont": NSFont.systemFontOfSize_(12),
+                "NSColor": day_color,
+            }
+            head = NSAttributedString.alloc().initWithString_attributes_(state.text, day_attributes)
+        return self.dayCellString(head, state.lunar_text, state.marker, state.events)
+
+    def viewDidChangeEffectiveAppearance(self):
+        # Đổi giao diện sáng/tối: màu và hình tròn "hôm nay" của mọi ô phải vẽ lại
+        self.redrawAllCells()
+
+    def viewDidChangeBackingProperties(self):
+        # Chuyển sang màn hình có hệ số backing khác: ảnh trong ô theo hệ số mới
+        self.redrawAllCells()
+
+    def redrawAllCells(self):
+        # CellPool chỉ ghi thuộc tính đã đổi, nên phải quên trạng thái cũ trước khi vẽ lại
+        self.cell_pool.invalidate()
+        self.updateCalendar()
 
-        start_date = datetime(self.current_year, self.current_month, 1) - timedelta(days=first_weekday)
-        day_offset = 0
+    def reloadEvents(self):
+        # Mỗi lần mở popover: stat các file .ics (phân tích lại file nào đã đổi) trên luồng nền
+        self.render_executor.submit(self.scanEvents)
 
-        for row, week in enumerate(cal):
-            for col, day in enumerate(week):
-                day_label = ClickableDayLabel.alloc().init()
-                day_label.initWithFrame_(NSMakeRect(self.padding + col * (55 + 4), 340 + offset - row * 68, 55, 68))
-                day_label.setBezeled_(False)
-                day_label.setDrawsBackground_(False)
-                day_label.setEditable_(False)
-                day_label.setAlignment_(NSCenterTextAlignment)
+    @objc.python_method
+    def scanEvents(self):
+        # Luồng nền: chỉ EventStore.scan, chỉ mục mới được gắn trên luồng chính
+        try:
+            index = self.event_store.scan()
+        except Exception as e:
+            logging.error(f"Error reloading events: {str(e)}")
+            return
+        if index is not None:
+            self.dispatcher.call_soon(lambda: self.applyEvents(index))
+
+    @objc.python_method
+    def applyEvents(self, index):
+        self.event_store.index = index
+        logging.info(f"Reloaded events: {len(index)} entries")
+        self.layout_cache.clear()
+        self.updateCalendar()
 
-                current_date = datetime.now()
-                day_offset += 1
-
-                if day == current_date.day and self.current_month == current_date.month and self.current_year == current_date.year:
-                    circle_diameter = 19
-                    image = NSImage.alloc().initWithSize_(NSSize(circle_diameter, circle_diameter))
-                    image.lockFocus()
-                    circle_path = objc.lookUpClass("NSBezierPath").bezierPathWithOvalInRect_(
-                        NSMakeRect(0, 0, circle_diameter, circle_diameter)
-                    )
-                    NSColor.systemOrangeColor().setFill()
-                    circle_path.fill()
-                    day_str = str(day)
-                    day_attributes = {
-                        "NSFont": NSFont.systemFontOfSize_(12),
-                        "NSColor": NSColor.blackColor(),
-                    }
-                    day_attr_string = NSAttributedString.alloc().initWithString_attributes_(day_str, day_attributes)
-                    text_size = day_attr_string.size()
-                    day_attr_string.drawAtPoint_(NSMakePoint((circle_diameter - text_size.width) / 2, (circle_diameter - text_size.height) / 2))
-                    image.unlockFocus()
-                    
-                    attachment = NSTextAttachment.alloc().init()
-                    attachment.setImage_(image)                    
-                    day_label.setFrameOrigin_(NSMakePoint(self.padding + col * (55 + 4) + 14, 340 + offset - row * 68 + 2))
-                    day_label.setAttributedStringValue_(NSAttributedString.attributedStringWithAttachment_(attachment))                    
-                else:
-                    if day == 0:
-                        day_label.setTextColor_(NSColor.grayColor())
-                    else:
-                        day_label.setTextColor_(NSColor.labelColor())
-                    day_label.setFont_(NSFont.systemFontOfSize_(12))
-                    day_label.setStringValue_(str(day) if day != 0 else "")
-
-                day_label.target = self
-                self.addSubview_(day_label)
-                self.date_labels.append(day_label)
-
-        today = datetime.now()
-        solar_today = Solar(today.year, today.month, today.day)
-        lunar_today = Converter.Solar2Lunar(solar_today)
-        self.lunar_label.setStringValue_(f"Âm lịch: {lunar_today.day:02d}/{lunar_today.month:02d}, {lunar_today.year}")
-        self.subviews()[1].setStringValue_(f"Tháng {self.current_month}, {self.current_year}")
+    def requestRender(self):
+        # Chỉ ghi nhận tháng cần vẽ; bố cục được tính ở luồng nền và lần bấm sau ghi đè lần trước
+        self.layout_cache.set_today(datetime.now().date())
+        self.render_scheduler.request((self.current_year, self.current_month))
+
+    @objc.python_method
+    def computeLayout(self, target):
+        # Luồng nền: chỉ đụng tới cache bố cục (có khoá), không gọi AppKit
+        with span("render.compute"):
+            return self.layout_cache.get(*target)
+
+    @objc.python_method
+    def applyLayout(self, target, layout):
+        # Luồng chính, chỉ với kết quả của yêu cầu mới nhất
+        logging.info(f"Rendering month: {target[1]}, year: {target[0]}", extra={"rate_key": "applyLayout"})
+        self.paintLayout(layout)
+        self.updateButtonStates()
+        self.schedulePrefetch()
+
+    def schedulePrefetch(self):
+        # Tính sẵn hai tháng kề trên luồng nền, sau khi tháng hiện tại đã được vẽ
+        year, month = self.current_year, self.current_month
+        self.render_executor.submit(lambda: self.layout_cache.prefetch_adjacent(year, month))
+
+    @objc.python_method
+    def dayCellString(self, head, lunar_text, marker=None, events=False):
+        # Dòng trên: ngày dương (chữ hoặc hình tròn hôm nay), dòng dưới: ngày âm
+        # Ngày lễ / tiết khí: ngày âm tô màu cam, tên hiện ở tooltip
+        # Ngày có sự kiện (.ics): thêm chấm xanh sau ngày âm
+        paragraph = NSMutableParagraphStyle.alloc().init()
+        paragraph.setAlignment_(NSCenterTextAlignment)
+        lunar_attributes = {
+            "NSFont": NSFont.systemFontOfSize_(9),
+            "NSColor": NSColor.systemOrangeColor() if marker else NSColor.systemGrayColor(),
+        }
+        result = NSMutableAttributedString.alloc().initWithAttributedString_(head)
+        result.appendAttributedString_(NSAttributedString.alloc().initWithString_attributes_("\n" + lunar_text, lunar_attributes))
+        if events:
+            dot_attributes = {
+                "NSFont": NSFont.systemFontOfSize_(9),
+                "NSColor": NSColor.systemBlueColor(),
+            }
+            result.appendAttributedString_(NSAttributedString.alloc().initWithString_attributes_(" •", dot_attributes))
+        result.addAttribute_value_range_("NSParagraphStyle", paragraph, (0, result.length()))
+        return result
 
     def updateButtonStates(self):
         current_date = datetime.now()
@@ -281,23 +497,20 @@ class CalendarView(NSView):
         if self.current_month == 0:
             self.current_month = 12
             self.current_year -= 1
-        self.updateCalendar()
-        self.updateButtonStates()
+        self.requestRender()
 
     def nextMonth_(self, sender):
         self.current_month += 1
         if self.current_month == 13:
             self.current_month = 1
             self.current_year += 1
-        self.updateCalendar()
-        self.updateButtonStates()
+        self.requestRender()
 
     def currentMonth_(self, sender):
         self.current_date = datetime.now()
         self.current_month = self.current_date.month
         self.current_year = self.current_date.year
-        self.updateCalendar()
-        self.updateButtonStates()
+        self.requestRender()
 
 class CalendarAppDelegate(NSObject):
     def init(self):
@@ -307,132 +520,129 @@ class CalendarAppDelegate(NSObject):
             self.status_item = NSStatusBar.systemStatusBar().statusItemWithLength_(-1)
             self.updateStatusBar()
 
+            # CalendarView chỉ được dựng khi mở popover lần đầu (ensureCalendarView)
             self.popover = NSPopover.alloc().init()
-            self.calendar_view = CalendarView.alloc().initWithFrame_(NSMakeRect(0, 0, 469, 450))
-            if self.calendar_view:
-                self.popover.setContentSize_(NSSize(469, 580))
-                self.popover.setContentViewController_(objc.lookUpClass("NSViewController").alloc().initWithNibName_bundle_(None, None))
-                self.popover.contentViewController().setView_(self.calendar_view)
-                self.calendar_view.setFrameOrigin_(NSMakePoint(0, 580 - 450))
-            else:
-                logging.error("Failed to initialize CalendarView")
+            self.popover.setContentSize_(NSSize(469, 580))
+            self.popover.setContentViewController_(objc.lookUpClass("NSViewController").alloc().initWithNibName_bundle_(None, None))
+            self.calendar_view = None
+            # File cache mmap (nếu đã có): ngày âm và lễ đọc thẳng từ đĩa, không cần NumPy cho lần vẽ đầu.
+            # Popover và dịch vụ tra cứu (--serve) dùng chung cache này và HolidayCalendar
+            self.day_cache = DayCache.open()
+            self.holidays = HolidayCalendar(days=self.day_cache)
 
             self.status_item.button().setAction_("togglePopover:")
             self.status_item.button().setTarget_(self)
             self.popover.setAnimates_(False)
             self.popover.setBehavior_(1)
 
-            # Khởi tạo ngày cập nhật cuối cùng
-            global last_update_date
-            last_update_date = datetime.now().date()
-            logging.info(f"Initialized last_update_date to {last_update_date}")
-
-            # Thiết lập bộ quan sát sự kiện đánh thức
-            self.setup_wakeup_listener()
-
-            # Lên lịch cập nhật vào nửa đêm
-            self.schedule_midnight_update()
+            # Gán từ __main__ khi chạy với --profile / --serve
+            self.profile_session = None
+            self.query_server = None
 
+            # Một hạn chót duy nhất (nửa đêm kế tiếp) thay cho timer 60 giây + timer nửa đêm
+            self.refresh_scheduler = RefreshScheduler(SystemClock(), NSTimerBackend(), self.date_did_change)
+            self.refresh_scheduler.start()
 
-            # Thêm timer định kỳ để đảm bảo cập nhật
-            NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-                60.0,  # Kiểm tra mỗi phút
-                self,
-                "check_and_update_date",
-                None,
-                True
-            )
-            logging.info("Scheduled periodic date check every 60 seconds")
+            # Thiết lập bộ quan sát sự kiện đánh thức, đổi giờ, đổi múi giờ
+            self.setup_wakeup_listener()
 
         return self
 
     def setup_wakeup_listener(self):
         try:
-            observer = WakeupObserver.alloc().initWithCallback_(self.check_and_update_date)
-            center = NSDistributedNotificationCenter.defaultCenter()
-            center.addObserver_selector_name_object_(
-                observer,
-                objc.selector(observer.onWakeup_, signature=b"v@:@"),
-                "com.apple.screenIsUnlocked",
-                None
+            observer = WakeupObserver.alloc().initWithCallback_(self.refresh_scheduler.poke)
+            selector = objc.selector(observer.onWakeup_, signature=b"v@:@")
+            NSDistributedNotificationCenter.defaultCenter().addObserver_selector_name_object_(
+                observer, selector, "com.apple.screenIsUnlocked", None
             )
-            logging.info("Wakeup listener setup successfully using NSDistributedNotificationCenter")
+            NSWorkspace.sharedWorkspace().notificationCenter().addObserver_selector_name_object_(
+                observer, selector, NSWorkspaceDidWakeNotification, None
+            )
+            center = NSNotificationCenter.defaultCenter()
+            for name in (NSSystemClockDidChangeNotification, NSSystemTimeZoneDidChangeNotification):
+                center.addObserver_selector_name_object_(observer, selector, name, None)
+            logging.info("Wakeup, clock and time zone listeners set up successfully")
             self.wakeup_observer = observer  # Lưu tham chiếu để tránh bị thu hồi
         except Exception as e:
             logging.error(f"Error setting up wakeup listener: {str(e)}")
 
-    def check_and_update_date(self):
-        global last_update_date
-        try:
-            current_date = datetime.now().date()
-            logging.info(f"check_and_update_date called, current_date: {current_date}, last_update_date: {last_update_date}")
-            
-            if current_date != last_update_date:
-                self.updateCalendar_(None)
-                last_update_date = current_date
-                self.schedule_midnight_update()
-                logging.info(f"Date updated to {current_date}")
-            else:
-                logging.info("No date update needed (same as last update)")
-        except Exception as e:
-            logging.error(f"Error in check_and_update_date: {str(e)}")
-
-    def schedule_midnight_update(self):
-        schedule_midnight_update(self, "check_and_update_date")
+    @objc.python_method
+    def date_did_change(self, current_date):
+        with span("date_did_change"):
+            # Cờ "hôm nay" đã dời sang ô khác, bố cục cũ không còn đúng
+            if self.calendar_view is not None:
+                self.calendar_view.layout_cache.set_today(current_date)
+            self.updateCalendar_(None)
+            logging.info(f"Date updated to {current_date}")
 
     def updateStatusBar(self):
-        try:
-            current_date = datetime.now()
-            weekday = current_date.weekday()
-            day = current_date.day
-            days_vn = ["T2", "T3", "T4", "T5", "T6", "T7", "CN"]
-            weekday_str = days_vn[weekday] if weekday != 6 else "CN"
-            
-            icon_name = resource_path(f"images/calendar_{day}_icon.png")
-            icon = NSImage.alloc().initWithContentsOfFile_(icon_name)
+        with span("updateStatusBar"):
+            try:
+                current_date = datetime.now()
+                weekday = current_date.weekday()
+                day = current_date.day
+                weekday_str = WEEKDAY_LABELS[weekday]
             
-            date_str = f" {weekday_str}"
-            mutable_attr_string = NSMutableAttributedString.alloc().initWithString_(date_str)
-            if icon:
-                attachment = NSTextAttachment.alloc().init()
-                attachment.setImage_(icon)
-                attachment.setBounds_(NSMakeRect(0, -4, 20, 20))
-                attachment_string = NSAttributedString.attributedStringWithAttachment_(attachment)
-                final_string = NSMutableAttributedString.alloc().initWithAttributedString_(attachment_string)
-                final_string.appendAttributedString_(mutable_attr_string)
-                self.status_item.button().setAttributedTitle_(final_string)
-            else:
-                logging.warning(f"Icon file {icon_name} not found, using text-only title")
-                self.status_item.button().setAttributedTitle_(mutable_attr_string)
-            logging.info(f"Updated status bar to day {day}, weekday {weekday_str}")
-        except Exception as e:
-            logging.error(f"Error updating status bar: {str(e)}")
+                icon = get_day_images().status_icon(day, scale=current_backing_scale())
+
+                date_str = f" {weekday_str}"
+                mutable_attr_string = NSMutableAttributedString.alloc().initWithString_(date_str)
+                if icon:
+                    attachment = NSTextAttachment.alloc().init()
+                    attachment.setImage_(icon)
+                    attachment.setBounds_(NSMakeRect(0, -4, 20, 20))
+                    attachment_string = NSAttributedString.attributedStringWithAttachment_(attachment)
+                    final_string = NSMutableAttributedString.alloc().initWithAttributedString_(attachment_string)
+                    final_string.appendAttributedString_(mutable_attr_string)
+                    self.status_item.button().setAttributedTitle_(final_string)
+                else:
+                    logging.warning(f"Icon for day {day} not found, using text-only title")
+                    self.status_item.button().setAttributedTitle_(mutable_attr_string)
+                logging.info(f"Updated status bar to day {day}, weekday {weekday_str}", extra={"rate_key": "updateStatusBar"})
+            except Exception as e:
+                logging.error(f"Error updating status bar: {str(e)}")
 
     def updateCalendar_(self, notification):
         try:
             current_date = datetime.now()
             logging.info(f"Updating calendar at {current_date}, setting to {current_date.date()}")
-            self.calendar_view.current_date = current_date
-            self.calendar_view.current_month = current_date.month
-            self.calendar_view.current_year = current_date.year
             self.updateStatusBar()
-            self.calendar_view.updateCalendar()
+            if self.calendar_view is not None:
+                self.calendar_view.current_date = current_date
+                self.calendar_view.current_month = current_date.month
+                self.calendar_view.current_year = current_date.year
+                self.calendar_view.updateCalendar()
         except TimeoutError as e:
             logging.error(f"Timeout error during calendar update: {str(e)}")
         except Exception as e:
             logging.error(f"Error updating calendar: {str(e)}")
 
-    def togglePopover_(self, sender):
-        try:
-            if self.popover.isShown():
-                self.popover.close()
-                logging.info("Closed popover")
+    def ensureCalendarView(self):
+        if self.calendar_view is None:
+            logging.info("Building CalendarView on first popover open")
+            self.calendar_view = CalendarView.alloc().initWithFrame_holidays_dayCache_(
+                NSMakeRect(0, 0, 469, 450), self.holidays, self.day_cache)
+            if self.calendar_view:
+                self.popover.contentViewController().setView_(self.calendar_view)
+                self.calendar_view.setFrameOrigin_(NSMakePoint(0, 580 - 450))
             else:
-                self.popover.showRelativeToRect_ofView_preferredEdge_(sender.bounds(), sender, 3)
-                self.popover.contentViewController().view().window().makeKeyAndOrderFront_(None)
-                logging.info("Opened popover")
-        except Exception as e:
-            logging.error(f"Error toggling popover: {str(e)}")
+                logging.error("Failed to initialize CalendarView")
+        return self.calendar_view
+
+    def togglePopover_(self, sender):
+        with span("togglePopover_"):
+            try:
+                if not self.popover.isShown() and self.ensureCalendarView() is not None:
+                    self.calendar_view.reloadEvents()
+                if self.popover.isShown():
+                    self.popover.close()
+                    logging.info("Closed popover")
+                else:
+                    self.popover.showRelativeToRect_ofView_preferredEdge_(sender.bounds(), sender, 3)
+                    self.popover.contentViewController().view().window().makeKeyAndOrderFront_(None)
+                    logging.info("Opened popover")
+            except Exception as e:
+                logging.error(f"Error toggling popover: {str(e)}")
 
     def applicationDidFinishLaunching_(self, notification):
         NSApplication.sharedApplication().setActivationPolicy_(1)
@@ -442,16 +652,65 @@ class CalendarAppDelegate(NSObject):
         return False
 
     def applicationWillTerminate_(self, notification):
+        self.refresh_scheduler.stop()
+        if self.calendar_view is not None:
+            self.calendar_view.render_executor.shutdown()
+        if self.profile_session is not None:
+            for path in self.profile_session.stop():
+                logging.info(f"Wrote profile output to {path}")
+        if self.query_server is not None:
+            self.query_server.stop()
         NSNotificationCenter.defaultCenter().removeObserver_(self.wakeup_observer)
         NSDistributedNotificationCenter.defaultCenter().removeObserver_(self.wakeup_observer)
+        NSWorkspace.sharedWorkspace().notificationCenter().removeObserver_(self.wakeup_observer)
         logging.info("Application terminated, cleaned up observers")
 
+def start_profiling():
+    # --profile[=summary,trace,cprofile] hoặc MENU_CALENDAR_PROFILE; file kết quả nằm cạnh file log
+    try:
+        modes = profile_modes(sys.argv)
+    except ValueError as e:
+        logging.warning(f"Ignoring profile settings: {str(e)}")
+        return None
+    if not modes:
+        return None
+    if LOG_FILE is not None:
+        output_dir = os.path.dirname(LOG_FILE)
+    else:
+        # Không có thư mục log ghi được: file profile vào thư mục tạm
+        import tempfile
+        output_dir = tempfile.gettempdir()
+    session = ProfileSession(modes, output_dir, NSTimerBackend(), logging.info)
+    session.start()
+    logging.info(f"Profiling enabled: {', '.join(sorted(modes))}, summary every {session.interval:.0f}s")
+    return session
+
+def start_query_service(day_cache=None):
+    # --serve[=đường dẫn] hoặc MENU_CALENDAR_SOCKET; phục vụ trên luồng nền, không chặn run loop.
+    # Dùng chung DayCache của app (chỉ đọc); HolidayCalendar riêng để truy vấn dài
+    # không đẩy các năm của popover ra khỏi cache
+    path = socket_path(sys.argv)
+    if path is None:
+        return None
+    # Chỉ nạp phần server khi được bật
+    from calendar_core.service import QueryServer, QueryService
+    try:
+        server = QueryServer(path, QueryService(days=day_cache)).start()
+    except OSError as e:
+        logging.error(f"Error starting query service: {str(e)}")
+        return None
+    logging.info(f"Query service listening on {path}")
+    return server
+
 if __name__ == "__main__":
     try:
         logging.info("Starting menu calendar application")
+        profile_session = start_profiling()
         app = NSApplication.sharedApplication()
         app.setActivationPolicy_(1)
         delegate = CalendarAppDelegate.alloc().init()
+        delegate.profile_session = profile_session
+        delegate.query_server = start_query_service(delegate.day_cache)
         app.setDelegate_(delegate)
         app.run()
     except Exception as e: